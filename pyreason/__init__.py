@@ -24,16 +24,7 @@ with open(cache_status_path) as file:
 
 if not cache_status['initialized']:
     print('Imported PyReason for the first time. Initializing caches for faster runtimes ... this will take a minute')
-    graph_path = os.path.join(package_path, 'examples', 'hello-world', 'friends_graph.graphml')
-
-    settings.verbose = False
-    load_graphml(graph_path)
-    add_rule(Rule('popular(x) <-1 popular(y), Friends(x,y), owns(y,z), owns(x,z)', 'popular_rule'))
-    add_fact(Fact('popular(Mary)', 'popular_fact', 0, 2))
-    reason(timesteps=2)
-
-    reset()
-    reset_rules()
+    initialize_cache()
     print('PyReason initialized!')
     print()
 
@@ -1,6 +1,7 @@
 # This is the file that will be imported when "import pyreason" is called. All content will be run automatically
 # ruff: noqa: F401 (Ignore Pyreason import * for public api)
 import importlib
+import os
 import networkx as nx
 import numba
 import time
@@ -58,6 +59,8 @@ class _Settings:
         self.__update_mode = None
         self.__allow_ground_rules = None
         self.__fp_version = None
+        self.__rule_trace_spill_threshold = None
+        self.__rule_trace_spill_folder = None
         self.reset()
 
     def reset(self):
@@ -79,6 +82,8 @@ class _Settings:
         self.__update_mode = 'intersection'
         self.__allow_ground_rules = False
         self.__fp_version = False
+        self.__rule_trace_spill_threshold = 0
+        self.__rule_trace_spill_folder = None
 
     @property
     def verbose(self) -> bool:
@@ -199,8 +204,8 @@ class _Settings:
 
     @property
     def parallel_computing(self) -> bool:
-        """Returns whether to use multiple CPU cores for inference. This will disable cacheing and pyreason will have
-        to be re-compiled at each run - but after compilation it will be faster. Default is False
+        """Returns whether to use multiple CPU cores for inference. The parallel reasoner is compiled separately the first
+        time it is used and then loaded from the cache, see `initialize_cache`. Default is False
 
         :return: bool
         """
@@ -230,6 +235,24 @@ class _Settings:
         """
         return self.__fp_version
 
+    @property
+    def rule_trace_spill_threshold(self) -> int:
+        """Returns the number of rule trace rows kept in memory while reasoning before they are written to disk. 0 keeps the
+        whole rule trace in memory. Default is 0
+
+        :return: int
+        """
+        return self.__rule_trace_spill_threshold
+
+    @property
+    def rule_trace_spill_folder(self) -> Optional[str]:
+        """Returns the folder the rule trace is spilled to, see `rule_trace_spill_threshold`. None uses the system temporary
+        directory. Default is None
+
+        :return: str or None
+        """
+        return self.__rule_trace_spill_folder
+
     @verbose.setter
     def verbose(self, value: bool) -> None:
         """Set verbose mode. Default is True
@@ -405,8 +428,8 @@ class _Settings:
 
     @parallel_computing.setter
     def parallel_computing(self, value: bool) -> None:
-        """Whether to use multiple CPU cores for inference. This will disable cacheing and pyreason will have
-        to be re-compiled at each run - but after compilation it will be faster. Default is False
+        """Whether to use multiple CPU cores for inference. The parallel reasoner is compiled separately the first
+        time it is used and then loaded from the cache, see `initialize_cache`. Default is False
 
         :param value: Whether to make inference run on parallel hardware (multiple CPU cores)
         :raises TypeError: If not bool raise error
@@ -453,6 +476,37 @@ class _Settings:
         else:
             self.__fp_version = value
 
+    @rule_trace_spill_threshold.setter
+    def rule_trace_spill_threshold(self, value: int) -> None:
+        """Write the rule trace to segments on disk whenever it holds this many rows in memory (checked after each timestep), to
+        keep memory bounded on long runs. The atom trace is spilled with it. `save_rule_trace` reads the segments back one at a
+        time, while `get_rule_trace`, the filters and the interpretation's `get_dict` and `query` read them all back into memory. Not supported by the
+        fixed point version. Default is 0 (never)
+
+        :param value: Number of rows, 0 to keep the whole rule trace in memory
+        :raises TypeError: If not int raise error
+        :raises ValueError: If negative raise error
+        """
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError('value has to be an int')
+        elif value < 0:
+            raise ValueError('value has to be 0 or more')
+        else:
+            self.__rule_trace_spill_threshold = value
+
+    @rule_trace_spill_folder.setter
+    def rule_trace_spill_folder(self, value: Optional[str]) -> None:
+        """Folder to spill the rule trace to. A temporary directory is created inside it for each run and removed with the
+        interpretation. Default is None (system temporary directory)
+
+        :param value: Path of the folder, or None
+        :raises TypeError: If not str or None raise error
+        """
+        if value is not None and not isinstance(value, str):
+            raise TypeError('value has to be a str or None')
+        else:
+            self.__rule_trace_spill_folder = value
+
 
 # VARIABLES
 __graph: Optional[nx.DiGraph] = None
@@ -524,6 +578,36 @@ def reset_settings():
     settings.reset()
 
 
+def initialize_cache(parallel_computing: bool = False) -> None:
+    """Compiles the reasoner on a small example so that it is stored in PyReason's on-disk numba cache. This is done for the
+    sequential reasoner the first time PyReason is imported. Use ``parallel_computing=True`` to do the same for the parallel
+    reasoner (for example when building an image for workers), so that processes load it from the cache instead of recompiling it.
+    It has to be called before a graph, rules or facts are loaded, because the example replaces them
+
+    :param parallel_computing: Whether to compile the parallel reasoner instead of the sequential one, defaults to False
+    :raises Exception: If a graph, rules or facts are already loaded
+    """
+    global __program, __annotation_functions
+    if __graph is not None or __rules is not None or __node_facts is not None or __edge_facts is not None:
+        raise Exception('initialize_cache has to be called before a graph, rules or facts are loaded, use `reset` first')
+
+    verbose, parallel = settings.verbose, settings.parallel_computing
+    program, annotation_functions = __program, __annotation_functions
+    settings.verbose = False
+    settings.parallel_computing = parallel_computing
+    try:
+        graph_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'examples', 'hello-world', 'friends_graph.graphml')
+        load_graphml(graph_path)
+        add_rule(Rule('popular(x) <-1 popular(y), Friends(x,y), owns(y,z), owns(x,z)', 'popular_rule'))
+        add_fact(Fact('popular(Mary)', 'popular_fact', 0, 2))
+        reason(timesteps=2)
+    finally:
+        reset()
+        # The program of the last reasoning run is kept so that `reason(again=True)` still continues it
+        __program, __annotation_functions = program, annotation_functions
+        settings.verbose, settings.parallel_computing = verbose, parallel
+
+
 # FUNCTIONS
 def load_graphml(path: str) -> None:
     """Loads graph from GraphMl file path into program
@@ -770,10 +854,22 @@ def _reason(timesteps, convergence_threshold, convergence_bound_threshold, queri
             r, __clause_maps[r.get_rule_name()] = reorder_clauses(r)
             __rules.append(r)
 
+    # Resolve the annotation function of each rule to its index in the annotation functions, so that it can be called natively while reasoning
+    annotation_function_ids = {f.__name__: i for i, f in enumerate(annotation_functions)}
+    for i, r in enumerate(__rules):
+        ann_fn = r.get_annotation_function()
+        if ann_fn != '':
+            if ann_fn not in annotation_function_ids:
+                raise ValueError(f'Annotation function "{ann_fn}" used in rule "{r.get_rule_name()}" has not been added. Use `add_annotation_function` to add it')
+            r.set_annotation_function_id(annotation_function_ids[ann_fn])
+            __rules[i] = r
+
     # Setup logical program
     __program = Program(__graph, all_node_facts, all_edge_facts, __rules, __ipl, annotation_functions, settings.reverse_digraph, settings.atom_trace, settings.save_graph_attributes_to_trace, settings.persistent, settings.inconsistency_check, settings.store_interpretation_changes, settings.parallel_computing, settings.update_mode, settings.allow_ground_rules, settings.fp_version)
     __program.specific_node_labels = __specific_node_labels
     __program.specific_edge_labels = __specific_edge_labels
+    __program.rule_trace_spill_threshold = settings.rule_trace_spill_threshold
+    __program.rule_trace_spill_folder = settings.rule_trace_spill_folder
 
     # Run Program and get final interpretation
     interpretation = __program.reason(timesteps, convergence_threshold, convergence_bound_threshold, settings.verbose)
@@ -801,34 +897,36 @@ def _reason_again(timesteps, restart, convergence_threshold, convergence_bound_t
     return interpretation
 
 
-def save_rule_trace(interpretation, folder: str='./'):
+def save_rule_trace(interpretation, folder: str='./', include_clauses: bool=True):
     """Saves the trace of the program. This includes every change that has occurred to the interpretation. If `atom_trace` was set to true
     this gives us full explainability of why interpretations changed
 
     :param interpretation: the output of `pyreason.reason()`, the final interpretation
     :param folder: the folder in which to save the result, defaults to './'
+    :param include_clauses: whether to add the groundings of each clause (Clause-num columns) when `atom_trace` is on, defaults to True
     """
     assert settings.store_interpretation_changes, 'store interpretation changes setting is off, turn on to save rule trace'
 
     output = Output(__timestamp, __clause_maps)
-    output.save_rule_trace(interpretation, folder)
+    output.save_rule_trace(interpretation, folder, include_clauses)
 
 
-def get_rule_trace(interpretation) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def get_rule_trace(interpretation, include_clauses: bool=True) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Returns the trace of the program as 2 pandas dataframes (one for nodes, one for edges).
     This includes every change that has occurred to the interpretation. If `atom_trace` was set to true
     this gives us full explainability of why interpretations changed
 
     :param interpretation: the output of `pyreason.reason()`, the final interpretation
+    :param include_clauses: whether to add the groundings of each clause (Clause-num columns) when `atom_trace` is on, defaults to True
     :returns two pandas dataframes (nodes, edges) representing the changes that occurred during reasoning
     """
     assert settings.store_interpretation_changes, 'store interpretation changes setting is off, turn on to save rule trace'
 
     output = Output(__timestamp, __clause_maps)
-    return output.get_rule_trace(interpretation)
+    return output.get_rule_trace(interpretation, include_clauses)
 
 
-def filter_and_sort_nodes(interpretation, labels: List[str], bound: interval.Interval=interval.closed(0,1), sort_by: str='lower', descending: bool=True):
+def filter_and_sort_nodes(interpretation, labels: List[str], bound: interval.Interval=interval.closed(0,1), sort_by: str='lower', descending: bool=True, long_form: bool=False):
     """Filters and sorts the node changes in the interpretation and returns as a list of Pandas dataframes that are easy to access
 
     :param interpretation: the output of `pyreason.reason()`, the final interpretation
@@ -836,15 +934,18 @@ def filter_and_sort_nodes(interpretation, labels: List[str], bound: interval.Int
     :param bound: The bound that will filter any interpretation that is not in it. the default does not filter anything, defaults to interval.closed(0,1)
     :param sort_by: String that is either 'lower' or 'upper', sorts by the lower/upper bound, defaults to 'lower'
     :param descending: A bool that sorts by descending/ascending order, defaults to True
-    :return: A list of Pandas dataframes that contain the filtered and sorted interpretations that are easy to access
+    :param long_form: Return a single dataframe with a (time, component, label, lower, upper) row per filtered change instead of one dataframe per timestep, defaults to False
+    :return: A list of Pandas dataframes that contain the filtered and sorted interpretations that are easy to access, or a single dataframe if `long_form`
     """
     assert settings.store_interpretation_changes, 'store interpretation changes setting is off, turn on to filter and sort nodes'
     filterer = Filter(interpretation.time)
+    if long_form:
+        return filterer.filter_and_sort(interpretation, 'node', labels, bound, sort_by, descending)
     filtered_df = filterer.filter_and_sort_nodes(interpretation, labels, bound, sort_by, descending)
     return filtered_df
 
 
-def filter_and_sort_edges(interpretation, labels: List[str], bound: interval.Interval=interval.closed(0,1), sort_by: str='lower', descending: bool=True):
+def filter_and_sort_edges(interpretation, labels: List[str], bound: interval.Interval=interval.closed(0,1), sort_by: str='lower', descending: bool=True, long_form: bool=False):
     """Filters and sorts the edge changes in the interpretation and returns as a list of Pandas dataframes that are easy to access
 
     :param interpretation: the output of `pyreason.reason()`, the final interpretation
@@ -852,9 +953,12 @@ def filter_and_sort_edges(interpretation, labels: List[str], bound: interval.Int
     :param bound: The bound that will filter any interpretation that is not in it. the default does not filter anything, defaults to interval.closed(0,1)
     :param sort_by: String that is either 'lower' or 'upper', sorts by the lower/upper bound, defaults to 'lower'
     :param descending: A bool that sorts by descending/ascending order, defaults to True
-    :return: A list of Pandas dataframes that contain the filtered and sorted interpretations that are easy to access
+    :param long_form: Return a single dataframe with a (time, component, label, lower, upper) row per filtered change instead of one dataframe per timestep, defaults to False
+    :return: A list of Pandas dataframes that contain the filtered and sorted interpretations that are easy to access, or a single dataframe if `long_form`
     """
     assert settings.store_interpretation_changes, 'store interpretation changes setting is off, turn on to filter and sort edges'
     filterer = Filter(interpretation.time)
+    if long_form:
+        return filterer.filter_and_sort(interpretation, 'edge', labels, bound, sort_by, descending)
     filtered_df = filterer.filter_and_sort_edges(interpretation, labels, bound, sort_by, descending)
     return filtered_df
@@ -1,3 +1,6 @@
+from collections.abc import Mapping
+
+
 class InterpretationDict(dict):
     """
     This class is specific for the interpretation for a specific timestep.
@@ -56,3 +59,103 @@ class InterpretationDict(dict):
 
     def __iter__(self):
         return iter(self.__dict__)
+
+
+class InterpretationView(Mapping):
+    """
+    Read only view of the interpretation at every timestep, time -> component -> label -> bound. The bounds are looked up in
+    the rule trace when a component is accessed, see InterpretationAtTime.
+    """
+    def __init__(self, node_index, edge_index, nodes, edges, tmax):
+        self._indexes = (node_index, edge_index)
+        self._nodes = nodes
+        self._edges = edges
+        self._tmax = tmax
+        self._components = None
+        self._timesteps = {}
+
+    def __getitem__(self, t):
+        if t not in range(self._tmax + 1):
+            raise KeyError(t)
+        if t not in self._timesteps:
+            self._timesteps[t] = InterpretationAtTime(self, t)
+        return self._timesteps[t]
+
+    def __iter__(self):
+        return iter(range(self._tmax + 1))
+
+    def __len__(self):
+        return self._tmax + 1
+
+    def __repr__(self):
+        return '{' + ', '.join(f'{t}: {InterpretationAtTime(self, t)!r}' for t in self) + '}'
+
+    def components(self):
+        """
+        Returns the nodes and edges of the graph as the keys of a dict, built once and shared by every timestep
+        """
+        if self._components is None:
+            self._components = dict.fromkeys(self._nodes)
+            self._components.update(dict.fromkeys(self._edges))
+        return self._components
+
+    def iter_changes(self, t):
+        """
+        Yields (component, label, bound) for every label that has a bound at timestep t, without building the whole timestep
+        """
+        for index in self._indexes:
+            yield from index.changed(t)
+
+    def changed_components(self, t):
+        """
+        Returns the components that have at least one label with a bound at timestep t
+        """
+        return list(dict.fromkeys(component for component, _, _ in self.iter_changes(t)))
+
+
+class InterpretationAtTime(Mapping):
+    """
+    Read only view of the interpretation at timestep t, component -> InterpretationDict. The keys are the nodes and edges of the
+    graph and the components with a bound at t that are not in it. The InterpretationDict of a component is built from the rule
+    trace when it is first accessed.
+    """
+    def __init__(self, view, t):
+        self._view = view
+        self._t = t
+        self._extra = None
+        self._interpretations = {}
+
+    def __getitem__(self, component):
+        if component not in self._interpretations:
+            if component not in self._view.components() and component not in self._extra_components():
+                raise KeyError(component)
+            interpretation = InterpretationDict()
+            for index in self._view._indexes:
+                for label, bnd in index.get_component(component, self._t):
+                    interpretation[label] = bnd
+            self._interpretations[component] = interpretation
+        return self._interpretations[component]
+
+    def __contains__(self, component):
+        return component in self._view.components() or component in self._extra_components()
+
+    def __iter__(self):
+        yield from self._view.components()
+        yield from self._extra_components()
+
+    def __len__(self):
+        return len(self._view.components()) + len(self._extra_components())
+
+    def __repr__(self):
+        # Only the components with a bound at t, so that printing does not go through the whole graph
+        changes = {}
+        for component, label, bnd in self._view.iter_changes(self._t):
+            changes.setdefault(component, {})[label] = bnd
+        return repr(changes)
+
+    def _extra_components(self):
+        # Components with a bound at t that are not nodes or edges of the graph (e.g. removed while reasoning)
+        if self._extra is None:
+            components = self._view.components()
+            self._extra = [component for component in self._view.changed_components(self._t) if component not in components]
+        return self._extra
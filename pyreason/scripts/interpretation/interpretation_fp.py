@@ -6,6 +6,7 @@ import pyreason.scripts.numba_wrapper.numba_types.interval_type as interval
 from pyreason.scripts.interpretation.interpretation_dict import InterpretationDict
 
 import numba
+import numpy as np
 from numba import objmode, prange
 
 
@@ -833,6 +834,85 @@ class Interpretation:
 
 		return interpretations
 
+	def get_rule_trace_columns(self, component_type='node'):
+		"""
+		This function returns the node or edge rule trace as parallel NumPy arrays, in the same layout as the default interpretation.
+		`component`, `label` and `origin` hold ids into the `components`, `labels` and `origins` arrays, an origin of -1 was not tracked (atom_trace off)
+		:param component_type: 'node' or 'edge'
+		:return: dict: Column name to NumPy array
+		"""
+		rule_trace = self.rule_trace_node if component_type == 'node' else self.rule_trace_edge
+		rule_trace_atoms = self.rule_trace_node_atoms if component_type == 'node' else self.rule_trace_edge_atoms
+		n = len(rule_trace)
+		columns = {
+			'time': np.empty(n, dtype=np.uint16),
+			'fp': np.empty(n, dtype=np.uint16),
+			'component': np.empty(n, dtype=np.int32),
+			'label': np.empty(n, dtype=np.int32),
+			'origin': np.full(n, -1, dtype=np.int32),
+			'lower': np.empty(n, dtype=np.float64),
+			'upper': np.empty(n, dtype=np.float64),
+		}
+		component_ids, label_ids, origin_ids = {}, {}, {}
+		for i, (t, fp, comp, l, bnd) in enumerate(rule_trace):
+			columns['time'][i] = t
+			columns['fp'][i] = fp
+			columns['component'][i] = component_ids.setdefault(comp, len(component_ids))
+			columns['label'][i] = label_ids.setdefault(l.get_value(), len(label_ids))
+			columns['lower'][i] = bnd.lower
+			columns['upper'][i] = bnd.upper
+			if self.atom_trace:
+				columns['origin'][i] = origin_ids.setdefault(rule_trace_atoms[i][3], len(origin_ids))
+
+		for name, ids in (('components', component_ids), ('labels', label_ids), ('origins', origin_ids)):
+			columns[name] = np.empty(len(ids), dtype=object)
+			for value, i in ids.items():
+				columns[name][i] = value
+		return columns
+
+	def iter_rule_trace_columns(self, component_type='node'):
+		"""
+		This function yields the node or edge rule trace in chunks, with the same columns as `get_rule_trace_columns`. The trace of the fixed
+		point version is always kept in memory, so it is a single chunk
+		:param component_type: 'node' or 'edge'
+		:return: Generator of dicts: Column name to NumPy array
+		"""
+		yield self.get_rule_trace_columns(component_type)
+
+	def set_rule_trace_spill(self, threshold, folder=None):
+		"""
+		Spilling the rule trace to disk is not supported by the fixed point version, the trace is kept in memory
+		:param threshold: Ignored
+		:param folder: Ignored
+		"""
+		pass
+
+	def get_rule_trace_atoms(self, component_type='node'):
+		"""
+		This function returns the node or edge atom trace, one (qualified nodes, qualified edges, old bound, name) row per rule trace change
+		:param component_type: 'node' or 'edge'
+		:return: list: Atom trace rows
+		"""
+		rule_trace_atoms = self.rule_trace_node_atoms if component_type == 'node' else self.rule_trace_edge_atoms
+		return [([list(g) for g in qn], [list(g) for g in qe], prev_bnd, name) for qn, qe, prev_bnd, name in rule_trace_atoms]
+
+	def iter_rule_trace_atoms(self, component_type='node'):
+		"""
+		This function yields the node or edge atom trace in chunks, one chunk per chunk of `iter_rule_trace_columns`, so a single chunk
+		:param component_type: 'node' or 'edge'
+		:return: Generator of lists: Atom trace rows
+		"""
+		yield self.get_rule_trace_atoms(component_type)
+
+	def get_rule_trace_num_clauses(self, component_type='node'):
+		"""
+		This function returns the largest number of clauses of a row in the node or edge atom trace
+		:param component_type: 'node' or 'edge'
+		:return: int: Number of clauses
+		"""
+		rule_trace_atoms = self.rule_trace_node_atoms if component_type == 'node' else self.rule_trace_edge_atoms
+		return max((len(qn) for qn, _, _, _ in rule_trace_atoms), default=0)
+
 	def get_final_num_ground_atoms(self):
 		"""
 		This function returns the number of ground atoms after the reasoning process, for the final timestep
@@ -900,6 +980,20 @@ class Interpretation:
 			else:
 				return False if return_bool else (0, 0)
 
+	def query_many(self, queries, t=None, return_bool=True):
+		"""
+		Answers a list of queries at once, like calling query on each of them
+		:param queries: A list of PyReason query objects
+		:param t: The timestep to query at, defaults to the last timestep
+		:param return_bool: If True, returns a boolean array, else an (n, 2) array of the bounds associated with each query
+		:return: np.ndarray in the order of the queries
+		"""
+		t = -1 if t is None else t
+		answers = [self.query(query, t, return_bool) for query in queries]
+		if return_bool:
+			return np.array(answers, dtype=np.bool_)
+		return np.array(answers, dtype=np.float64).reshape(len(answers), 2)
+
 
 @numba.njit(cache=True)
 def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, atom_trace, allow_ground_rules, t):
@@ -1604,7 +1698,7 @@ def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 					else:
 						predicate_map[p2] = numba.typed.List([comp])
 				if atom_trace:
-					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2], f'IPL: {l.get_value()}')
+					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2].copy(), f'IPL: {l.get_value()}')
 				lower = max(world.world[p2].lower, 1 - world.world[p1].upper)
 				upper = min(world.world[p2].upper, 1 - world.world[p1].lower)
 				world.world[p2].set_lower_upper(lower, upper)
@@ -1621,7 +1715,7 @@ def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 					else:
 						predicate_map[p1] = numba.typed.List([comp])
 				if atom_trace:
-					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1], f'IPL: {l.get_value()}')
+					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1].copy(), f'IPL: {l.get_value()}')
 				lower = max(world.world[p1].lower, 1 - world.world[p2].upper)
 				upper = min(world.world[p1].upper, 1 - world.world[p2].lower)
 				world.world[p1].set_lower_upper(lower, upper)
@@ -1704,7 +1798,7 @@ def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 					else:
 						predicate_map[p2] = numba.typed.List([comp])
 				if atom_trace:
-					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2], f'IPL: {l.get_value()}')
+					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2].copy(), f'IPL: {l.get_value()}')
 				lower = max(world.world[p2].lower, 1 - world.world[p1].upper)
 				upper = min(world.world[p2].upper, 1 - world.world[p1].lower)
 				world.world[p2].set_lower_upper(lower, upper)
@@ -1721,7 +1815,7 @@ def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 					else:
 						predicate_map[p1] = numba.typed.List([comp])
 				if atom_trace:
-					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1], f'IPL: {l.get_value()}')
+					_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1].copy(), f'IPL: {l.get_value()}')
 				lower = max(world.world[p1].lower, 1 - world.world[p2].upper)
 				upper = min(world.world[p1].upper, 1 - world.world[p2].lower)
 				world.world[p1].set_lower_upper(lower, upper)
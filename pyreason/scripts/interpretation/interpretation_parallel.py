@@ -1,12 +1,20 @@
+import os
+import shutil
+import tempfile
+import weakref
 from typing import Union, Tuple
 
 import pyreason.scripts.numba_wrapper.numba_types.world_type as world
 import pyreason.scripts.numba_wrapper.numba_types.label_type as label
 import pyreason.scripts.numba_wrapper.numba_types.interval_type as interval
-from pyreason.scripts.interpretation.interpretation_dict import InterpretationDict
+from pyreason.scripts.interpretation.interpretation_dict import InterpretationView
+from pyreason.scripts.interpretation.rule_trace_index import RuleTraceIndex
+from pyreason.scripts.utils.number_parsing import is_number
 
 import numba
-from numba import objmode, prange
+import numpy as np
+from numba import objmode, prange, literal_unroll
+from numba.extending import overload
 
 
 # Types for the dictionaries
@@ -17,9 +25,15 @@ edge_type = numba.types.UniTuple(numba.types.string, 2)
 list_of_nodes = numba.types.ListType(node_type)
 list_of_edges = numba.types.ListType(edge_type)
 
+# Type for edge groundings grouped by one of their endpoints
+edges_by_node_type = numba.types.DictType(node_type, list_of_edges)
+
 # Type for storing clause data
 clause_data = numba.types.Tuple((numba.types.string, label.label_type, numba.types.ListType(numba.types.string)))
 
+# Type for storing rule/fact indices
+list_of_idx = numba.types.ListType(numba.types.int64)
+
 # Type for storing refine clause data
 refine_data = numba.types.Tuple((numba.types.string, numba.types.string, numba.types.int8))
 
@@ -50,6 +64,53 @@ rules_to_be_applied_edge_type = numba.types.Tuple((numba.types.uint16, edge_type
 rules_to_be_applied_trace_type = numba.types.Tuple((numba.types.ListType(numba.types.ListType(node_type)), numba.types.ListType(numba.types.ListType(edge_type)), numba.types.string))
 edges_to_be_added_type = numba.types.Tuple((numba.types.ListType(node_type), numba.types.ListType(node_type), label.label_type))
 
+# Type for storing list of labels/floats
+list_of_labels = numba.types.ListType(label.label_type)
+list_of_floats = numba.types.ListType(numba.types.float64)
+
+# Types for the rule trace. It is stored as parallel columns that double their capacity when full:
+# time and fp operation, component id, label id and origin id, lower and upper bound, and the number of rows in use.
+# Components, labels and origins (name of the fact/rule that made the change) are interned, the ids index into their tables
+uint16_column_type = numba.types.uint16[::1]
+int32_column_type = numba.types.int32[::1]
+float64_column_type = numba.types.float64[::1]
+rule_trace_columns_type = numba.types.Tuple((numba.types.ListType(uint16_column_type), numba.types.ListType(int32_column_type), numba.types.ListType(float64_column_type), numba.types.int64[::1]))
+rule_trace_labels_type = numba.types.Tuple((list_of_labels, numba.types.DictType(label.label_type, numba.types.int64)))
+rule_trace_origins_type = numba.types.Tuple((numba.types.ListType(numba.types.string), numba.types.DictType(numba.types.string, numba.types.int64)))
+rule_trace_node_type = numba.types.Tuple((rule_trace_columns_type, numba.types.Tuple((list_of_nodes, numba.types.DictType(node_type, numba.types.int64))), rule_trace_labels_type, rule_trace_origins_type))
+rule_trace_edge_type = numba.types.Tuple((rule_trace_columns_type, numba.types.Tuple((list_of_edges, numba.types.DictType(edge_type, numba.types.int64))), rule_trace_labels_type, rule_trace_origins_type))
+# Number of rows a new rule trace has room for
+rule_trace_capacity = 64
+rule_trace_column_names = ('time', 'fp', 'component', 'label', 'origin', 'lower', 'upper')
+rule_trace_atoms_column_names = ('qn_offsets', 'qn_ids', 'qe_offsets', 'qe_ids', 'old_lower', 'old_upper', 'name')
+
+# Types for the atom trace. The grounding sets that fired a rule are hash-consed into shared, immutable blocks (one table for nodes, one
+# for edges, with the block ids by hash of their content). The rows point at the block of each clause instead of holding their own copy
+node_blocks_type = numba.types.Tuple((numba.types.ListType(list_of_nodes), numba.types.DictType(numba.types.int64, list_of_idx)))
+edge_blocks_type = numba.types.Tuple((numba.types.ListType(list_of_edges), numba.types.DictType(numba.types.int64, list_of_idx)))
+provenance_type = numba.types.Tuple((node_blocks_type, edge_blocks_type))
+interned_rule_trace_atoms_type = numba.types.Tuple((list_of_idx, list_of_idx, interval.interval_type, numba.types.string))
+rule_trace_atoms_store_type = numba.types.Tuple((numba.types.ListType(interned_rule_trace_atoms_type), provenance_type))
+
+# Type for the numeric attribute index: the values of an attribute's labels in sorted order, and the labels in the same order
+numeric_column_type = numba.types.Tuple((numba.types.float64[::1], list_of_labels))
+
+# Type for a unit of grounding work: rule index, chunk of its head groundings, number of chunks, and the index of the rule's
+# grounded body when it is split into chunks (-1 otherwise)
+grounding_work_type = numba.types.UniTuple(numba.types.int64, 4)
+
+# Type for a grounded rule body: satisfaction, groundings, edge groundings, the dependency graph of the body variables, and the
+# head groundings prepared from them: the valid edge groundings of an edge rule, its clauses' edge groundings grouped by head
+# endpoint, and whether the head nodes / edge of a ground rule have to be added to the graph
+rule_body_type = numba.types.Tuple((numba.types.boolean, numba.types.DictType(numba.types.string, list_of_nodes), numba.types.DictType(edge_type, list_of_edges), numba.types.DictType(node_type, list_of_nodes), numba.types.DictType(node_type, list_of_nodes), list_of_edges, numba.types.DictType(edge_type, edges_by_node_type), numba.types.UniTuple(numba.types.boolean, 3)))
+
+# The parallel copy of this file also splits heavy rules and large batches of updates across threads
+parallel_reasoning = __name__.endswith('_parallel')
+# Smallest number of head groundings worth giving to a separate thread
+min_grounding_chunk = 256
+# Smallest number of rule updates worth applying in parallel
+min_parallel_updates = 1024
+
 
 class Interpretation:
 	specific_node_labels = numba.typed.Dict.empty(key_type=label.label_type, value_type=numba.types.ListType(node_type))
@@ -89,10 +150,19 @@ class Interpretation:
 		self.edges_to_be_added_edge_rule = numba.typed.List.empty_list(numba.types.Tuple((numba.types.ListType(node_type), numba.types.ListType(node_type), label.label_type)))
 
 		# Keep track of all the rules that have affected each node/edge at each timestep/fp operation, and all ground atoms that have affected the rules as well. Keep track of previous bounds and name of the rule/fact here
-		self.rule_trace_node_atoms = numba.typed.List.empty_list(numba.types.Tuple((numba.types.ListType(numba.types.ListType(node_type)), numba.types.ListType(numba.types.ListType(edge_type)), interval.interval_type, numba.types.string)))
-		self.rule_trace_edge_atoms = numba.typed.List.empty_list(numba.types.Tuple((numba.types.ListType(numba.types.ListType(node_type)), numba.types.ListType(numba.types.ListType(edge_type)), interval.interval_type, numba.types.string)))
-		self.rule_trace_node = numba.typed.List.empty_list(numba.types.Tuple((numba.types.uint16, numba.types.uint16, node_type, label.label_type, interval.interval_type)))
-		self.rule_trace_edge = numba.typed.List.empty_list(numba.types.Tuple((numba.types.uint16, numba.types.uint16, edge_type, label.label_type, interval.interval_type)))
+		# The node and edge atom traces share their grounding blocks, see get_rule_trace_atoms
+		self.provenance = _new_provenance()
+		self.rule_trace_node_atoms = (numba.typed.List.empty_list(interned_rule_trace_atoms_type), self.provenance)
+		self.rule_trace_edge_atoms = (numba.typed.List.empty_list(interned_rule_trace_atoms_type), self.provenance)
+		# The rule trace itself is kept in columns, see get_rule_trace_columns
+		self.rule_trace_node = _new_rule_trace_node()
+		self.rule_trace_edge = _new_rule_trace_edge()
+		# Rows of the rule trace can be moved to segments on disk while reasoning, see set_rule_trace_spill
+		self.rule_trace_spill_threshold = 0
+		self.rule_trace_spill_folder = ''
+		# Temporal index over the rule trace for get_dict and past queries, see _get_rule_trace_index
+		self.rule_trace_index = {}
+		self.rule_trace_index_version = None
 
 		# Nodes and edges of the graph
 		self.nodes = numba.typed.List.empty_list(node_type)
@@ -103,30 +173,32 @@ class Interpretation:
 		self.interpretations_node, self.predicate_map_node = self._init_interpretations_node(self.nodes, self.specific_node_labels, self.num_ga)
 		self.interpretations_edge, self.predicate_map_edge = self._init_interpretations_edge(self.edges, self.specific_edge_labels, self.num_ga)
 
-		# Setup graph neighbors and reverse neighbors
-		self.neighbors = numba.typed.Dict.empty(key_type=node_type, value_type=numba.types.ListType(node_type))
-		for n in self.graph.nodes():
-			l = numba.typed.List.empty_list(node_type)
-			[l.append(neigh) for neigh in self.graph.neighbors(n)]
-			self.neighbors[n] = l
-
-		self.reverse_neighbors = self._init_reverse_neighbors(self.neighbors)
+		# Setup graph neighbors and reverse neighbors from a CSR view of the adjacency (indptr/indices into self.nodes)
+		node_idx = {n: i for i, n in enumerate(self.graph.nodes())}
+		indptr = np.zeros(len(node_idx)+1, dtype=np.int64)
+		indptr[1:] = np.cumsum(np.fromiter((len(self.graph.adj[n]) for n in self.graph.nodes()), dtype=np.int64, count=len(node_idx)))
+		indices = np.fromiter((node_idx[neigh] for n in self.graph.nodes() for neigh in self.graph.adj[n]), dtype=np.int64, count=indptr[-1])
+		self.neighbors, self.reverse_neighbors = self._init_neighbors(self.nodes, indptr, indices)
 
 	@staticmethod
 	@numba.njit(cache=True)
-	def _init_reverse_neighbors(neighbors):
+	def _init_neighbors(nodes, indptr, indices):
+		# The CSR arrays are only used to build the adjacency. The typed lists stay the working representation so that
+		# _add_edge/_delete_edge can still modify the graph during reasoning
+		neighbors = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_nodes)
 		reverse_neighbors = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_nodes)
-		for n, neighbor_nodes in neighbors.items():
-			for neighbor_node in neighbor_nodes:
-				if neighbor_node in reverse_neighbors and n not in reverse_neighbors[neighbor_node]:
-					reverse_neighbors[neighbor_node].append(n)
-				else:
-					reverse_neighbors[neighbor_node] = numba.typed.List([n])
-			# This makes sure each node has a value
-			if n not in reverse_neighbors:
-				reverse_neighbors[n] = numba.typed.List.empty_list(node_type)
-
-		return reverse_neighbors
+		for n in nodes:
+			neighbors[n] = numba.typed.List.empty_list(node_type)
+			reverse_neighbors[n] = numba.typed.List.empty_list(node_type)
+		for i in range(len(nodes)):
+			n = nodes[i]
+			neighbor_nodes = neighbors[n]
+			for j in range(indptr[i], indptr[i+1]):
+				neighbor_node = nodes[indices[j]]
+				neighbor_nodes.append(neighbor_node)
+				reverse_neighbors[neighbor_node].append(n)
+
+		return neighbors, reverse_neighbors
 
 	@staticmethod
 	@numba.njit(cache=True)
@@ -214,7 +286,7 @@ class Interpretation:
 			if restart:
 				self.time = 0
 				self.prev_reasoning_data[0] = 0
-		fp_cnt, t = self.reason(self.interpretations_node, self.interpretations_edge, self.predicate_map_node, self.predicate_map_edge, self.tmax, self.prev_reasoning_data, rules, self.nodes, self.edges, self.neighbors, self.reverse_neighbors, self.rules_to_be_applied_node, self.rules_to_be_applied_edge, self.edges_to_be_added_node_rule, self.edges_to_be_added_edge_rule, self.rules_to_be_applied_node_trace, self.rules_to_be_applied_edge_trace, self.facts_to_be_applied_node, self.facts_to_be_applied_edge, self.facts_to_be_applied_node_trace, self.facts_to_be_applied_edge_trace, self.ipl, self.rule_trace_node, self.rule_trace_edge, self.rule_trace_node_atoms, self.rule_trace_edge_atoms, self.reverse_graph, self.atom_trace, self.save_graph_attributes_to_rule_trace, self.persistent, self.inconsistency_check, self.store_interpretation_changes, self.update_mode, self.allow_ground_rules, max_facts_time, self.annotation_functions, self._convergence_mode, self._convergence_delta, self.num_ga, verbose, again)
+		fp_cnt, t = self.reason(self.interpretations_node, self.interpretations_edge, self.predicate_map_node, self.predicate_map_edge, self.tmax, self.prev_reasoning_data, rules, self.nodes, self.edges, self.neighbors, self.reverse_neighbors, self.rules_to_be_applied_node, self.rules_to_be_applied_edge, self.edges_to_be_added_node_rule, self.edges_to_be_added_edge_rule, self.rules_to_be_applied_node_trace, self.rules_to_be_applied_edge_trace, self.facts_to_be_applied_node, self.facts_to_be_applied_edge, self.facts_to_be_applied_node_trace, self.facts_to_be_applied_edge_trace, self.ipl, self.rule_trace_node, self.rule_trace_edge, self.rule_trace_node_atoms, self.rule_trace_edge_atoms, self.reverse_graph, self.atom_trace, self.save_graph_attributes_to_rule_trace, self.persistent, self.inconsistency_check, self.store_interpretation_changes, self.update_mode, self.allow_ground_rules, max_facts_time, self.annotation_functions, self._convergence_mode, self._convergence_delta, self.num_ga, verbose, again, self.rule_trace_spill_threshold, self.rule_trace_spill_folder)
 		self.time = t - 1
 		# If we need to reason again, store the next timestep to start from
 		self.prev_reasoning_data[0] = t
@@ -224,17 +296,54 @@ class Interpretation:
 
 	@staticmethod
 	@numba.njit(cache=True, parallel=True)
-	def reason(interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, tmax, prev_reasoning_data, rules, nodes, edges, neighbors, reverse_neighbors, rules_to_be_applied_node, rules_to_be_applied_edge, edges_to_be_added_node_rule, edges_to_be_added_edge_rule, rules_to_be_applied_node_trace, rules_to_be_applied_edge_trace, facts_to_be_applied_node, facts_to_be_applied_edge, facts_to_be_applied_node_trace, facts_to_be_applied_edge_trace, ipl, rule_trace_node, rule_trace_edge, rule_trace_node_atoms, rule_trace_edge_atoms, reverse_graph, atom_trace, save_graph_attributes_to_rule_trace, persistent, inconsistency_check, store_interpretation_changes, update_mode, allow_ground_rules, max_facts_time, annotation_functions, convergence_mode, convergence_delta, num_ga, verbose, again):
+	def reason(interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, tmax, prev_reasoning_data, rules, nodes, edges, neighbors, reverse_neighbors, rules_to_be_applied_node, rules_to_be_applied_edge, edges_to_be_added_node_rule, edges_to_be_added_edge_rule, rules_to_be_applied_node_trace, rules_to_be_applied_edge_trace, facts_to_be_applied_node, facts_to_be_applied_edge, facts_to_be_applied_node_trace, facts_to_be_applied_edge_trace, ipl, rule_trace_node, rule_trace_edge, rule_trace_node_atoms, rule_trace_edge_atoms, reverse_graph, atom_trace, save_graph_attributes_to_rule_trace, persistent, inconsistency_check, store_interpretation_changes, update_mode, allow_ground_rules, max_facts_time, annotation_functions, convergence_mode, convergence_delta, num_ga, verbose, again, rule_trace_spill_threshold=0, rule_trace_spill_folder=''):
 		t = prev_reasoning_data[0]
 		fp_cnt = prev_reasoning_data[1]
 		max_rules_time = 0
 		timestep_loop = True
-		facts_to_be_applied_node_new = numba.typed.List.empty_list(facts_to_be_applied_node_type)
-		facts_to_be_applied_edge_new = numba.typed.List.empty_list(facts_to_be_applied_edge_type)
-		facts_to_be_applied_node_trace_new = numba.typed.List.empty_list(numba.types.string)
-		facts_to_be_applied_edge_trace_new = numba.typed.List.empty_list(numba.types.string)
-		rules_to_remove_idx = set()
-		rules_to_remove_idx.add(-1)
+		# Facts are bucketed by the timestep they are applied at, so each timestep only visits its own facts. Static facts
+		# that have been applied stay in a standing list and are applied again at every following timestep
+		facts_node_by_t = numba.typed.Dict.empty(key_type=numba.types.int64, value_type=list_of_idx)
+		facts_edge_by_t = numba.typed.Dict.empty(key_type=numba.types.int64, value_type=list_of_idx)
+		_schedule_by_time(facts_to_be_applied_node, facts_node_by_t, 0, t)
+		_schedule_by_time(facts_to_be_applied_edge, facts_edge_by_t, 0, t)
+		facts_node_standing = numba.typed.List.empty_list(numba.types.int64)
+		facts_edge_standing = numba.typed.List.empty_list(numba.types.int64)
+		# Same for the rules that are waiting to be applied. Applied rules are removed from the queue in bulk, once they make up
+		# half of it, instead of copying the queue after every pass
+		rules_node_by_t = numba.typed.Dict.empty(key_type=numba.types.int64, value_type=list_of_idx)
+		rules_edge_by_t = numba.typed.Dict.empty(key_type=numba.types.int64, value_type=list_of_idx)
+		_schedule_by_time(rules_to_be_applied_node, rules_node_by_t, 0, t)
+		_schedule_by_time(rules_to_be_applied_edge, rules_edge_by_t, 0, t)
+		rules_node_applied_cnt = 0
+		rules_edge_applied_cnt = 0
+		t_start = t
+
+		# Atoms that changed since the last grounding pass (semi-naive evaluation), keyed by label
+		delta_node = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_nodes)
+		delta_edge = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_edges)
+		# Index from body labels to the rules that mention them, used to find the rules affected by the delta. Built when first needed
+		rules_by_label_node = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_idx)
+		rules_by_label_edge = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_idx)
+		rule_index_built = False
+		all_rules_idx = numba.typed.List.empty_list(numba.types.int64)
+		for i in range(len(rules)):
+			all_rules_idx.append(i)
+		num_nodes_grounded = len(nodes)
+		num_edges_grounded = len(edges)
+		# Estimated number of head groundings of each rule, used to split heavy rules across threads
+		rule_costs = np.zeros(len(rules), dtype=np.int64)
+		# Atoms that changed since the last reset, so that a non-persistent reset only touches those. When continuing from a
+		# previous run its changes were not tracked, so the first reset goes over every atom
+		dirty_node = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_nodes)
+		dirty_edge = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_edges)
+		dirty_tracked = t == 0 and not again
+		# Labels made from numeric attributes ('age-35') indexed by attribute and value, for comparison clauses like age(x) > 30
+		# Labels are parsed once, the first time they show up in the predicate map
+		numeric_index_node = numba.typed.Dict.empty(key_type=label.label_type, value_type=numeric_column_type)
+		numeric_index_edge = numba.typed.Dict.empty(key_type=label.label_type, value_type=numeric_column_type)
+		numeric_labels_seen_node = numba.typed.Dict.empty(key_type=label.label_type, value_type=numba.types.boolean)
+		numeric_labels_seen_edge = numba.typed.Dict.empty(key_type=label.label_type, value_type=numba.types.boolean)
 		while timestep_loop:
 			if t==tmax:
 				timestep_loop = False
@@ -243,62 +352,82 @@ class Interpretation:
 					print('Timestep:', t, flush=True)
 			# Reset Interpretation at beginning of timestep if non-persistent
 			if t>0 and not persistent:
-				# Reset nodes (only if not static)
-				for n in nodes:
-					w = interpretations_node[n].world
-					for l in w:
-						if not w[l].is_static():
-							w[l].reset()
-
-				# Reset edges (only if not static)
-				for e in edges:
-					w = interpretations_edge[e].world
-					for l in w:
-						if not w[l].is_static():
-							w[l].reset()
+				if not dirty_tracked:
+					for n in nodes:
+						for l in interpretations_node[n].world:
+							_record_delta(dirty_node, n, l)
+					for e in edges:
+						for l in interpretations_edge[e].world:
+							_record_delta(dirty_edge, e, l)
+					dirty_tracked = True
+
+				# Changes since the last grounding pass have not been collected yet. The first pass of a timestep grounds all rules so the delta can be dropped
+				_merge_delta(dirty_node, delta_node)
+				_merge_delta(dirty_edge, delta_edge)
+				delta_node.clear()
+				delta_edge.clear()
+
+				# Reset nodes and edges (only if not static)
+				dirty_node = _reset_interpretations(interpretations_node, dirty_node)
+				dirty_edge = _reset_interpretations(interpretations_edge, dirty_edge)
 
 			# Convergence parameters
 			changes_cnt = 0
 			bound_delta = 0
 			update = False
 
+			# The first fixed point pass of a timestep grounds all rules, the following ones only the rules whose body changed
+			ground_all_rules = True
+
 			# Start by applying facts
 			# Nodes
-			facts_to_be_applied_node_new.clear()
-			facts_to_be_applied_node_trace_new.clear()
-			nodes_set = set(nodes)
-			for i in range(len(facts_to_be_applied_node)):
-				if facts_to_be_applied_node[i][0] == t:
-					comp, l, bnd, static, graph_attribute = facts_to_be_applied_node[i][1], facts_to_be_applied_node[i][2], facts_to_be_applied_node[i][3], facts_to_be_applied_node[i][4], facts_to_be_applied_node[i][5]
-					# If the component is not in the graph, add it
-					if comp not in nodes_set:
-						_add_node(comp, neighbors, reverse_neighbors, nodes, interpretations_node)
-						nodes_set.add(comp)
-
-					# Check if bnd is static. Then no need to update, just add to rule trace, check if graph attribute and add ipl complement to rule trace as well
-					if l in interpretations_node[comp].world and interpretations_node[comp].world[l].is_static():
-						# Check if we should even store any of the changes to the rule trace etc.
-						# Inverse of this is: if not save_graph_attributes_to_rule_trace and graph_attribute
-						if (save_graph_attributes_to_rule_trace or not graph_attribute) and store_interpretation_changes:
-							rule_trace_node.append((numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, l, bnd))
-							if atom_trace:
-								_update_rule_trace(rule_trace_node_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), bnd, facts_to_be_applied_node_trace[i])
-							for p1, p2 in ipl:
-								if p1==l:
-									rule_trace_node.append((numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p2, interpretations_node[comp].world[p2]))
-									if atom_trace:
-										_update_rule_trace(rule_trace_node_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_node[comp].world[p2], facts_to_be_applied_node_trace[i])
-								elif p2==l:
-									rule_trace_node.append((numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p1, interpretations_node[comp].world[p1]))
-									if atom_trace:
-										_update_rule_trace(rule_trace_node_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_node[comp].world[p1], facts_to_be_applied_node_trace[i])
+			facts_node_due = _get_due_facts(facts_node_by_t, facts_node_standing, t)
+			facts_node_standing.clear()
+			for i in facts_node_due:
+				comp, l, bnd, static, graph_attribute = facts_to_be_applied_node[i][1], facts_to_be_applied_node[i][2], facts_to_be_applied_node[i][3], facts_to_be_applied_node[i][4], facts_to_be_applied_node[i][5]
+				# If the component is not in the graph, add it
+				if comp not in interpretations_node:
+					_add_node(comp, neighbors, reverse_neighbors, nodes, interpretations_node)
+
+				# Check if bnd is static. Then no need to update, just add to rule trace, check if graph attribute and add ipl complement to rule trace as well
+				if l in interpretations_node[comp].world and interpretations_node[comp].world[l].is_static():
+					# Check if we should even store any of the changes to the rule trace etc.
+					# Inverse of this is: if not save_graph_attributes_to_rule_trace and graph_attribute
+					if (save_graph_attributes_to_rule_trace or not graph_attribute) and store_interpretation_changes:
+						origin = facts_to_be_applied_node_trace[i] if atom_trace else ''
+						_append_rule_trace(rule_trace_node, numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, l, bnd, origin)
+						if atom_trace:
+							_update_rule_trace(rule_trace_node_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), bnd, facts_to_be_applied_node_trace[i])
+						for p1, p2 in ipl:
+							if p1==l:
+								_append_rule_trace(rule_trace_node, numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p2, interpretations_node[comp].world[p2], origin)
+								if atom_trace:
+									_update_rule_trace(rule_trace_node_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_node[comp].world[p2], facts_to_be_applied_node_trace[i])
+							elif p2==l:
+								_append_rule_trace(rule_trace_node, numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p1, interpretations_node[comp].world[p1], origin)
+								if atom_trace:
+									_update_rule_trace(rule_trace_node_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_node[comp].world[p1], facts_to_be_applied_node_trace[i])
 
+				else:
+					# Check for inconsistencies (multiple facts)
+					if check_consistent_node(interpretations_node, comp, (l, bnd)):
+						mode = 'graph-attribute-fact' if graph_attribute else 'fact'
+						override = True if update_mode == 'override' else False
+						u, changes = _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, i, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode=mode, override=override, delta=delta_node)
+
+						update = u or update
+						# Update convergence params
+						if convergence_mode=='delta_bound':
+							bound_delta = max(bound_delta, changes)
+						else:
+							changes_cnt += changes
+					# Resolve inconsistency if necessary otherwise override bounds
 					else:
-						# Check for inconsistencies (multiple facts)
-						if check_consistent_node(interpretations_node, comp, (l, bnd)):
-							mode = 'graph-attribute-fact' if graph_attribute else 'fact'
-							override = True if update_mode == 'override' else False
-							u, changes = _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, i, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode=mode, override=override)
+						mode = 'graph-attribute-fact' if graph_attribute else 'fact'
+						if inconsistency_check:
+							resolve_inconsistency_node(interpretations_node, comp, (l, bnd), ipl, t, fp_cnt, i, atom_trace, rule_trace_node, rule_trace_node_atoms, rules_to_be_applied_node_trace, facts_to_be_applied_node_trace, store_interpretation_changes, mode=mode, delta=delta_node)
+						else:
+							u, changes = _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, i, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode=mode, override=True, delta=delta_node)
 
 							update = u or update
 							# Update convergence params
@@ -306,73 +435,57 @@ class Interpretation:
 								bound_delta = max(bound_delta, changes)
 							else:
 								changes_cnt += changes
-						# Resolve inconsistency if necessary otherwise override bounds
-						else:
-							mode = 'graph-attribute-fact' if graph_attribute else 'fact'
-							if inconsistency_check:
-								resolve_inconsistency_node(interpretations_node, comp, (l, bnd), ipl, t, fp_cnt, i, atom_trace, rule_trace_node, rule_trace_node_atoms, rules_to_be_applied_node_trace, facts_to_be_applied_node_trace, store_interpretation_changes, mode=mode)
-							else:
-								u, changes = _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, i, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode=mode, override=True)
 
-								update = u or update
-								# Update convergence params
-								if convergence_mode=='delta_bound':
-									bound_delta = max(bound_delta, changes)
-								else:
-									changes_cnt += changes
+				# Static facts stay scheduled for every following timestep
+				if static:
+					facts_node_standing.append(i)
 
-					if static:
-						facts_to_be_applied_node_new.append((numba.types.uint16(facts_to_be_applied_node[i][0]+1), comp, l, bnd, static, graph_attribute))
+			# Edges
+			facts_edge_due = _get_due_facts(facts_edge_by_t, facts_edge_standing, t)
+			facts_edge_standing.clear()
+			for i in facts_edge_due:
+				comp, l, bnd, static, graph_attribute = facts_to_be_applied_edge[i][1], facts_to_be_applied_edge[i][2], facts_to_be_applied_edge[i][3], facts_to_be_applied_edge[i][4], facts_to_be_applied_edge[i][5]
+				# If the component is not in the graph, add it
+				if comp not in interpretations_edge:
+					_add_edge(comp[0], comp[1], neighbors, reverse_neighbors, nodes, edges, label.Label(''), interpretations_node, interpretations_edge, predicate_map_edge, num_ga, t)
+
+				# Check if bnd is static. Then no need to update, just add to rule trace, check if graph attribute, and add ipl complement to rule trace as well
+				if l in interpretations_edge[comp].world and interpretations_edge[comp].world[l].is_static():
+					# Inverse of this is: if not save_graph_attributes_to_rule_trace and graph_attribute
+					if (save_graph_attributes_to_rule_trace or not graph_attribute) and store_interpretation_changes:
+						origin = facts_to_be_applied_edge_trace[i] if atom_trace else ''
+						_append_rule_trace(rule_trace_edge, numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, l, interpretations_edge[comp].world[l], origin)
 						if atom_trace:
-							facts_to_be_applied_node_trace_new.append(facts_to_be_applied_node_trace[i])
-
-				# If time doesn't match, fact to be applied later
+							_update_rule_trace(rule_trace_edge_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), bnd, facts_to_be_applied_edge_trace[i])
+						for p1, p2 in ipl:
+							if p1==l:
+								_append_rule_trace(rule_trace_edge, numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p2, interpretations_edge[comp].world[p2], origin)
+								if atom_trace:
+									_update_rule_trace(rule_trace_edge_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_edge[comp].world[p2], facts_to_be_applied_edge_trace[i])
+							elif p2==l:
+								_append_rule_trace(rule_trace_edge, numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p1, interpretations_edge[comp].world[p1], origin)
+								if atom_trace:
+									_update_rule_trace(rule_trace_edge_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_edge[comp].world[p1], facts_to_be_applied_edge_trace[i])
 				else:
-					facts_to_be_applied_node_new.append(facts_to_be_applied_node[i])
-					if atom_trace:
-						facts_to_be_applied_node_trace_new.append(facts_to_be_applied_node_trace[i])
-
-			# Update list of facts with ones that have not been applied yet (delete applied facts)
-			facts_to_be_applied_node[:] = facts_to_be_applied_node_new.copy()
-			if atom_trace:
-				facts_to_be_applied_node_trace[:] = facts_to_be_applied_node_trace_new.copy()
-			facts_to_be_applied_node_new.clear()
-			facts_to_be_applied_node_trace_new.clear()
-
-			# Edges
-			facts_to_be_applied_edge_new.clear()
-			facts_to_be_applied_edge_trace_new.clear()
-			edges_set = set(edges)
-			for i in range(len(facts_to_be_applied_edge)):
-				if facts_to_be_applied_edge[i][0]==t:
-					comp, l, bnd, static, graph_attribute = facts_to_be_applied_edge[i][1], facts_to_be_applied_edge[i][2], facts_to_be_applied_edge[i][3], facts_to_be_applied_edge[i][4], facts_to_be_applied_edge[i][5]
-					# If the component is not in the graph, add it
-					if comp not in edges_set:
-						_add_edge(comp[0], comp[1], neighbors, reverse_neighbors, nodes, edges, label.Label(''), interpretations_node, interpretations_edge, predicate_map_edge, num_ga, t)
-						edges_set.add(comp)
-
-					# Check if bnd is static. Then no need to update, just add to rule trace, check if graph attribute, and add ipl complement to rule trace as well
-					if l in interpretations_edge[comp].world and interpretations_edge[comp].world[l].is_static():
-						# Inverse of this is: if not save_graph_attributes_to_rule_trace and graph_attribute
-						if (save_graph_attributes_to_rule_trace or not graph_attribute) and store_interpretation_changes:
-							rule_trace_edge.append((numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, l, interpretations_edge[comp].world[l]))
-							if atom_trace:
-								_update_rule_trace(rule_trace_edge_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), bnd, facts_to_be_applied_edge_trace[i])
-							for p1, p2 in ipl:
-								if p1==l:
-									rule_trace_edge.append((numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p2, interpretations_edge[comp].world[p2]))
-									if atom_trace:
-										_update_rule_trace(rule_trace_edge_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_edge[comp].world[p2], facts_to_be_applied_edge_trace[i])
-								elif p2==l:
-									rule_trace_edge.append((numba.types.uint16(t), numba.types.uint16(fp_cnt), comp, p1, interpretations_edge[comp].world[p1]))
-									if atom_trace:
-										_update_rule_trace(rule_trace_edge_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), interpretations_edge[comp].world[p1], facts_to_be_applied_edge_trace[i])
+					# Check for inconsistencies
+					if check_consistent_edge(interpretations_edge, comp, (l, bnd)):
+						mode = 'graph-attribute-fact' if graph_attribute else 'fact'
+						override = True if update_mode == 'override' else False
+						u, changes = _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, i, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode=mode, override=override, delta=delta_edge)
+
+						update = u or update
+						# Update convergence params
+						if convergence_mode=='delta_bound':
+							bound_delta = max(bound_delta, changes)
+						else:
+							changes_cnt += changes
+					# Resolve inconsistency
 					else:
-						# Check for inconsistencies
-						if check_consistent_edge(interpretations_edge, comp, (l, bnd)):
-							mode = 'graph-attribute-fact' if graph_attribute else 'fact'
-							override = True if update_mode == 'override' else False
-							u, changes = _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, i, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode=mode, override=override)
+						mode = 'graph-attribute-fact' if graph_attribute else 'fact'
+						if inconsistency_check:
+							resolve_inconsistency_edge(interpretations_edge, comp, (l, bnd), ipl, t, fp_cnt, i, atom_trace, rule_trace_edge, rule_trace_edge_atoms, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, store_interpretation_changes, mode=mode, delta=delta_edge)
+						else:
+							u, changes = _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, i, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode=mode, override=True, delta=delta_edge)
 
 							update = u or update
 							# Update convergence params
@@ -380,38 +493,10 @@ class Interpretation:
 								bound_delta = max(bound_delta, changes)
 							else:
 								changes_cnt += changes
-						# Resolve inconsistency
-						else:
-							mode = 'graph-attribute-fact' if graph_attribute else 'fact'
-							if inconsistency_check:
-								resolve_inconsistency_edge(interpretations_edge, comp, (l, bnd), ipl, t, fp_cnt, i, atom_trace, rule_trace_edge, rule_trace_edge_atoms, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, store_interpretation_changes, mode=mode)
-							else:
-								u, changes = _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, i, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode=mode, override=True)
-
-								update = u or update
-								# Update convergence params
-								if convergence_mode=='delta_bound':
-									bound_delta = max(bound_delta, changes)
-								else:
-									changes_cnt += changes
 
-					if static:
-						facts_to_be_applied_edge_new.append((numba.types.uint16(facts_to_be_applied_edge[i][0]+1), comp, l, bnd, static, graph_attribute))
-						if atom_trace:
-							facts_to_be_applied_edge_trace_new.append(facts_to_be_applied_edge_trace[i])
-
-				# Time doesn't match, fact to be applied later
-				else:
-					facts_to_be_applied_edge_new.append(facts_to_be_applied_edge[i])
-					if atom_trace:
-						facts_to_be_applied_edge_trace_new.append(facts_to_be_applied_edge_trace[i])
-
-			# Update list of facts with ones that have not been applied yet (delete applied facts)
-			facts_to_be_applied_edge[:] = facts_to_be_applied_edge_new.copy()
-			if atom_trace:
-				facts_to_be_applied_edge_trace[:] = facts_to_be_applied_edge_trace_new.copy()
-			facts_to_be_applied_edge_new.clear()
-			facts_to_be_applied_edge_trace_new.clear()
+				# Static facts stay scheduled for every following timestep
+				if static:
+					facts_edge_standing.append(i)
 
 			in_loop = True
 			while in_loop:
@@ -420,88 +505,141 @@ class Interpretation:
 
 				# Apply the rules that need to be applied at this timestep
 				# Nodes
-				rules_to_remove_idx.clear()
-				for idx, i in enumerate(rules_to_be_applied_node):
-					if i[0] == t:
-						comp, l, bnd, set_static = i[1], i[2], i[3], i[4]
-						# Check for inconsistencies
-						if check_consistent_node(interpretations_node, comp, (l, bnd)):
-							override = True if update_mode == 'override' else False
-							u, changes = _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, idx, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode='rule', override=override)
-
-							update = u or update
+				rules_node_due = rules_node_by_t.pop(t) if t in rules_node_by_t else numba.typed.List.empty_list(numba.types.int64)
+				rules_node_applied_cnt += len(rules_node_due)
+				if parallel_reasoning and len(ipl) == 0 and len(rules_node_due) >= min_parallel_updates:
+					# Apply the updates of different nodes in parallel, the updates of one node stay together and in order
+					# New labels are added first because the predicate map and the ground atom count are shared
+					for idx in rules_node_due:
+						_add_label(interpretations_node[rules_to_be_applied_node[idx][1]], predicate_map_node, rules_to_be_applied_node[idx][1], rules_to_be_applied_node[idx][2], num_ga, t, delta_node)
+					# The components are split into one contiguous range per thread, and each range has its own buffers
+					update_order, update_ranges, update_range_of = _group_updates_by_component(rules_to_be_applied_node, rules_node_due, numba.get_num_threads())
+					num_ranges = len(update_ranges) - 1
+
+					# Threadsafe traces, deltas and convergence params for each range; merge after loop
+					rule_trace_node_threadsafe = numba.typed.List.empty_list(rule_trace_node_type)
+					for _ in range(num_ranges):
+						rule_trace_node_threadsafe.append(_new_rule_trace_node())
+					rule_trace_node_atoms_threadsafe = numba.typed.List.empty_list(rule_trace_atoms_store_type)
+					for _ in range(num_ranges):
+						rule_trace_node_atoms_threadsafe.append((numba.typed.List.empty_list(interned_rule_trace_atoms_type), _new_provenance()))
+					delta_node_threadsafe = numba.typed.List([numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_nodes) for _ in range(num_ranges)])
+					update_apply_threadsafe = np.zeros(num_ranges, dtype=np.bool_)
+					changes_threadsafe = np.zeros(num_ranges, dtype=np.float64)
+					rule_trace_start = np.zeros(len(rules_node_due), dtype=np.int64)
+					rule_trace_cnt = np.zeros(len(rules_node_due), dtype=np.int64)
+					rule_trace_atoms_start = np.zeros(len(rules_node_due), dtype=np.int64)
+					rule_trace_atoms_cnt = np.zeros(len(rules_node_due), dtype=np.int64)
+
+					for g in prange(num_ranges):
+						for j in range(update_ranges[g], update_ranges[g+1]):
+							k = update_order[j]
+							idx = rules_node_due[k]
+							i = rules_to_be_applied_node[idx]
+							rule_trace_start[k], rule_trace_atoms_start[k] = _rule_trace_len(rule_trace_node_threadsafe[g]), len(rule_trace_node_atoms_threadsafe[g][0])
+							u, changes = _apply_rule_node(interpretations_node, predicate_map_node, i[1], i[2], i[3], i[4], idx, ipl, rule_trace_node_threadsafe[g], fp_cnt, t, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, facts_to_be_applied_node_trace, rule_trace_node_atoms_threadsafe[g], store_interpretation_changes, num_ga, update_mode, inconsistency_check, delta_node_threadsafe[g])
+							rule_trace_cnt[k] = _rule_trace_len(rule_trace_node_threadsafe[g]) - rule_trace_start[k]
+							rule_trace_atoms_cnt[k] = len(rule_trace_node_atoms_threadsafe[g][0]) - rule_trace_atoms_start[k]
+
+							update_apply_threadsafe[g] = u or update_apply_threadsafe[g]
 							# Update convergence params
 							if convergence_mode=='delta_bound':
-								bound_delta = max(bound_delta, changes)
+								changes_threadsafe[g] = max(changes_threadsafe[g], changes)
 							else:
-								changes_cnt += changes
-						# Resolve inconsistency
+								changes_threadsafe[g] += changes
+
+					# Merge the traces in the order the updates were scheduled, the rest does not depend on the order
+					_merge_rule_trace_buffers(rule_trace_node, rule_trace_node_threadsafe, rule_trace_start, rule_trace_cnt, update_range_of)
+					_merge_rule_trace_atoms_buffers(rule_trace_node_atoms, rule_trace_node_atoms_threadsafe, rule_trace_atoms_start, rule_trace_atoms_cnt, update_range_of)
+					for g in range(num_ranges):
+						_merge_delta(delta_node, delta_node_threadsafe[g])
+						update = update_apply_threadsafe[g] or update
+						if convergence_mode=='delta_bound':
+							bound_delta = max(bound_delta, changes_threadsafe[g])
 						else:
-							if inconsistency_check:
-								resolve_inconsistency_node(interpretations_node, comp, (l, bnd), ipl, t, fp_cnt, idx, atom_trace, rule_trace_node, rule_trace_node_atoms, rules_to_be_applied_node_trace, facts_to_be_applied_node_trace, store_interpretation_changes, mode='rule')
-							else:
-								u, changes = _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, idx, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode='rule', override=True)
-
-								update = u or update
-								# Update convergence params
-								if convergence_mode=='delta_bound':
-									bound_delta = max(bound_delta, changes)
-								else:
-									changes_cnt += changes
-
-						# Delete rules that have been applied from list by adding index to list
-						rules_to_remove_idx.add(idx)
-
-				# Remove from rules to be applied and edges to be applied lists after coming out from loop
-				rules_to_be_applied_node[:] = numba.typed.List([rules_to_be_applied_node[i] for i in range(len(rules_to_be_applied_node)) if i not in rules_to_remove_idx])
-				edges_to_be_added_node_rule[:] = numba.typed.List([edges_to_be_added_node_rule[i] for i in range(len(edges_to_be_added_node_rule)) if i not in rules_to_remove_idx])
-				if atom_trace:
-					rules_to_be_applied_node_trace[:] = numba.typed.List([rules_to_be_applied_node_trace[i] for i in range(len(rules_to_be_applied_node_trace)) if i not in rules_to_remove_idx])
+							changes_cnt += changes_threadsafe[g]
+				else:
+					for idx in rules_node_due:
+						i = rules_to_be_applied_node[idx]
+						u, changes = _apply_rule_node(interpretations_node, predicate_map_node, i[1], i[2], i[3], i[4], idx, ipl, rule_trace_node, fp_cnt, t, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, update_mode, inconsistency_check, delta_node)
+
+						update = u or update
+						# Update convergence params
+						if convergence_mode=='delta_bound':
+							bound_delta = max(bound_delta, changes)
+						else:
+							changes_cnt += changes
 
 				# Edges
-				rules_to_remove_idx.clear()
-				for idx, i in enumerate(rules_to_be_applied_edge):
-					if i[0] == t:
+				rules_edge_due = rules_edge_by_t.pop(t) if t in rules_edge_by_t else numba.typed.List.empty_list(numba.types.int64)
+				rules_edge_applied_cnt += len(rules_edge_due)
+				if parallel_reasoning and len(ipl) == 0 and len(rules_edge_due) >= min_parallel_updates and not _adds_edges(edges_to_be_added_edge_rule, rules_edge_due):
+					# Apply the updates of different edges in parallel, the updates of one edge stay together and in order
+					# New labels are added first because the predicate map and the ground atom count are shared
+					for idx in rules_edge_due:
+						_add_label(interpretations_edge[rules_to_be_applied_edge[idx][1]], predicate_map_edge, rules_to_be_applied_edge[idx][1], rules_to_be_applied_edge[idx][2], num_ga, t, delta_edge)
+					# The components are split into one contiguous range per thread, and each range has its own buffers
+					update_order, update_ranges, update_range_of = _group_updates_by_component(rules_to_be_applied_edge, rules_edge_due, numba.get_num_threads())
+					num_ranges = len(update_ranges) - 1
+
+					# Threadsafe traces, deltas and convergence params for each range; merge after loop
+					rule_trace_edge_threadsafe = numba.typed.List.empty_list(rule_trace_edge_type)
+					for _ in range(num_ranges):
+						rule_trace_edge_threadsafe.append(_new_rule_trace_edge())
+					rule_trace_edge_atoms_threadsafe = numba.typed.List.empty_list(rule_trace_atoms_store_type)
+					for _ in range(num_ranges):
+						rule_trace_edge_atoms_threadsafe.append((numba.typed.List.empty_list(interned_rule_trace_atoms_type), _new_provenance()))
+					delta_edge_threadsafe = numba.typed.List([numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_edges) for _ in range(num_ranges)])
+					update_apply_threadsafe = np.zeros(num_ranges, dtype=np.bool_)
+					changes_threadsafe = np.zeros(num_ranges, dtype=np.float64)
+					rule_trace_start = np.zeros(len(rules_edge_due), dtype=np.int64)
+					rule_trace_cnt = np.zeros(len(rules_edge_due), dtype=np.int64)
+					rule_trace_atoms_start = np.zeros(len(rules_edge_due), dtype=np.int64)
+					rule_trace_atoms_cnt = np.zeros(len(rules_edge_due), dtype=np.int64)
+
+					for g in prange(num_ranges):
+						for j in range(update_ranges[g], update_ranges[g+1]):
+							k = update_order[j]
+							idx = rules_edge_due[k]
+							i = rules_to_be_applied_edge[idx]
+							rule_trace_start[k], rule_trace_atoms_start[k] = _rule_trace_len(rule_trace_edge_threadsafe[g]), len(rule_trace_edge_atoms_threadsafe[g][0])
+							u, changes = _apply_rule_edge(interpretations_edge, predicate_map_edge, i[1], i[2], i[3], i[4], idx, ipl, rule_trace_edge_threadsafe[g], fp_cnt, t, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, rule_trace_edge_atoms_threadsafe[g], store_interpretation_changes, num_ga, update_mode, inconsistency_check, delta_edge_threadsafe[g])
+							rule_trace_cnt[k] = _rule_trace_len(rule_trace_edge_threadsafe[g]) - rule_trace_start[k]
+							rule_trace_atoms_cnt[k] = len(rule_trace_edge_atoms_threadsafe[g][0]) - rule_trace_atoms_start[k]
+
+							update_apply_threadsafe[g] = u or update_apply_threadsafe[g]
+							# Update convergence params
+							if convergence_mode=='delta_bound':
+								changes_threadsafe[g] = max(changes_threadsafe[g], changes)
+							else:
+								changes_threadsafe[g] += changes
+
+					# Merge the traces in the order the updates were scheduled, the rest does not depend on the order
+					_merge_rule_trace_buffers(rule_trace_edge, rule_trace_edge_threadsafe, rule_trace_start, rule_trace_cnt, update_range_of)
+					_merge_rule_trace_atoms_buffers(rule_trace_edge_atoms, rule_trace_edge_atoms_threadsafe, rule_trace_atoms_start, rule_trace_atoms_cnt, update_range_of)
+					for g in range(num_ranges):
+						_merge_delta(delta_edge, delta_edge_threadsafe[g])
+						update = update_apply_threadsafe[g] or update
+						if convergence_mode=='delta_bound':
+							bound_delta = max(bound_delta, changes_threadsafe[g])
+						else:
+							changes_cnt += changes_threadsafe[g]
+				else:
+					for idx in rules_edge_due:
+						i = rules_to_be_applied_edge[idx]
 						comp, l, bnd, set_static = i[1], i[2], i[3], i[4]
 						sources, targets, edge_l = edges_to_be_added_edge_rule[idx]
 						edges_added, changes = _add_edges(sources, targets, neighbors, reverse_neighbors, nodes, edges, edge_l, interpretations_node, interpretations_edge, predicate_map_edge, num_ga, t)
 						changes_cnt += changes
+						if changes > 0:
+							ground_all_rules = True
 
 						# Update bound for newly added edges. Use bnd to update all edges if label is specified, else use bnd to update normally
 						if edge_l.value != '':
 							for e in edges_added:
 								if interpretations_edge[e].world[edge_l].is_static():
 									continue
-								if check_consistent_edge(interpretations_edge, e, (edge_l, bnd)):
-									override = True if update_mode == 'override' else False
-									u, changes = _update_edge(interpretations_edge, predicate_map_edge, e, (edge_l, bnd), ipl, rule_trace_edge, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, idx, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode='rule', override=override)
-									update = u or update
-
-									# Update convergence params
-									if convergence_mode=='delta_bound':
-										bound_delta = max(bound_delta, changes)
-									else:
-										changes_cnt += changes
-								# Resolve inconsistency
-								else:
-									if inconsistency_check:
-										resolve_inconsistency_edge(interpretations_edge, e, (edge_l, bnd), ipl, t, fp_cnt, idx, atom_trace, rule_trace_edge, rule_trace_edge_atoms, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, store_interpretation_changes, mode='rule')
-									else:
-										u, changes = _update_edge(interpretations_edge, predicate_map_edge, e, (edge_l, bnd), ipl, rule_trace_edge, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, idx, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode='rule', override=True)
-
-										update = u or update
-
-										# Update convergence params
-										if convergence_mode=='delta_bound':
-											bound_delta = max(bound_delta, changes)
-										else:
-											changes_cnt += changes
-
-						else:
-							# Check for inconsistencies
-							if check_consistent_edge(interpretations_edge, comp, (l, bnd)):
-								override = True if update_mode == 'override' else False
-								u, changes = _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, idx, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode='rule', override=override)
+								u, changes = _apply_rule_edge(interpretations_edge, predicate_map_edge, e, edge_l, bnd, set_static, idx, ipl, rule_trace_edge, fp_cnt, t, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, update_mode, inconsistency_check, delta_edge)
 
 								update = u or update
 								# Update convergence params
@@ -509,55 +647,77 @@ class Interpretation:
 									bound_delta = max(bound_delta, changes)
 								else:
 									changes_cnt += changes
-							# Resolve inconsistency
-							else:
-								if inconsistency_check:
-									resolve_inconsistency_edge(interpretations_edge, comp, (l, bnd), ipl, t, fp_cnt, idx, atom_trace, rule_trace_edge, rule_trace_edge_atoms, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, store_interpretation_changes, mode='rule')
-								else:
-									u, changes = _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, idx, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode='rule', override=True)
-
-									update = u or update
-									# Update convergence params
-									if convergence_mode=='delta_bound':
-										bound_delta = max(bound_delta, changes)
-									else:
-										changes_cnt += changes
-
-						# Delete rules that have been applied from list by adding the index to list
-						rules_to_remove_idx.add(idx)
+						else:
+							u, changes = _apply_rule_edge(interpretations_edge, predicate_map_edge, comp, l, bnd, set_static, idx, ipl, rule_trace_edge, fp_cnt, t, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, update_mode, inconsistency_check, delta_edge)
 
-				# Remove from rules to be applied and edges to be applied lists after coming out from loop
-				rules_to_be_applied_edge[:] = numba.typed.List([rules_to_be_applied_edge[i] for i in range(len(rules_to_be_applied_edge)) if i not in rules_to_remove_idx])
-				edges_to_be_added_edge_rule[:] = numba.typed.List([edges_to_be_added_edge_rule[i] for i in range(len(edges_to_be_added_edge_rule)) if i not in rules_to_remove_idx])
-				if atom_trace:
-					rules_to_be_applied_edge_trace[:] = numba.typed.List([rules_to_be_applied_edge_trace[i] for i in range(len(rules_to_be_applied_edge_trace)) if i not in rules_to_remove_idx])
+							update = u or update
+							# Update convergence params
+							if convergence_mode=='delta_bound':
+								bound_delta = max(bound_delta, changes)
+							else:
+								changes_cnt += changes
 
 				# Fixed point
 				if update:
 					# Increase fp operator count
 					fp_cnt += 1
 
+					# Semi-naive evaluation: a rule whose body has not changed since the last pass would only produce the same groundings again
+					# Changes to the graph structure can affect every rule, and override mode depends on the order of the updates, so ground everything then
+					if update_mode == 'override' or len(nodes) != num_nodes_grounded or len(edges) != num_edges_grounded:
+						ground_all_rules = True
+					if ground_all_rules:
+						rules_to_ground = all_rules_idx
+					else:
+						if not rule_index_built:
+							_init_rule_dependency_index(rules, rules_by_label_node, rules_by_label_edge)
+							rule_index_built = True
+						rules_to_ground = _get_affected_rules(rules_by_label_node, rules_by_label_edge, delta_node, delta_edge)
+
+					_update_numeric_index(numeric_index_node, numeric_labels_seen_node, predicate_map_node)
+					_update_numeric_index(numeric_index_edge, numeric_labels_seen_edge, predicate_map_edge)
+
+					# Split the work between the threads, either a whole rule or a chunk of a heavy rule's head groundings per unit
+					# The costs come from the current label cardinalities, so a rule is split as soon as it becomes heavy
+					if parallel_reasoning:
+						for r in rules_to_ground:
+							rule_costs[r] = _estimate_head_groundings(rules[r], predicate_map_node, predicate_map_edge, len(nodes), len(edges))
+					grounding_work, split_rules = _plan_grounding_work(rules_to_ground, rule_costs, numba.get_num_threads() if parallel_reasoning else 1)
+
+					# The bodies of the split rules are grounded once (in parallel), their chunks only ground the heads
+					rule_bodies = numba.typed.List.empty_list(rule_body_type)
+					for _ in range(len(split_rules)):
+						rule_bodies.append(_new_rule_body())
+					for k in prange(len(split_rules)):
+						rule = rules[split_rules[k]]
+						if t + rule.get_delta() <= tmax or tmax == -1 or again:
+							rule_bodies[k] = _ground_rule_body(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, allow_ground_rules, numeric_index_node, numeric_index_edge)
+
 					# Lists or threadsafe operations (when parallel is on)
-					rules_to_be_applied_node_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_node_type) for _ in range(len(rules))])
-					rules_to_be_applied_edge_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_edge_type) for _ in range(len(rules))])
+					rules_to_be_applied_node_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_node_type) for _ in range(len(grounding_work))])
+					rules_to_be_applied_edge_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_edge_type) for _ in range(len(grounding_work))])
 					if atom_trace:
-						rules_to_be_applied_node_trace_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_trace_type) for _ in range(len(rules))])
-						rules_to_be_applied_edge_trace_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_trace_type) for _ in range(len(rules))])
-					edges_to_be_added_edge_rule_threadsafe = numba.typed.List([numba.typed.List.empty_list(edges_to_be_added_type) for _ in range(len(rules))])
+						rules_to_be_applied_node_trace_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_trace_type) for _ in range(len(grounding_work))])
+						rules_to_be_applied_edge_trace_threadsafe = numba.typed.List([numba.typed.List.empty_list(rules_to_be_applied_trace_type) for _ in range(len(grounding_work))])
+					edges_to_be_added_edge_rule_threadsafe = numba.typed.List([numba.typed.List.empty_list(edges_to_be_added_type) for _ in range(len(grounding_work))])
 					# Threadsafe flags for in_loop and update within prange; merge after loop
 					in_loop_threadsafe = numba.typed.List.empty_list(numba.types.boolean)
 					update_threadsafe = numba.typed.List.empty_list(numba.types.boolean)
-					for _ in range(len(rules)):
+					for _ in range(len(grounding_work)):
 						in_loop_threadsafe.append(False)
 						update_threadsafe.append(True)
 
-					for i in prange(len(rules)):
-						rule = rules[i]
+					for i in prange(len(grounding_work)):
+						rule_idx, chunk, num_chunks, body_idx = grounding_work[i]
+						rule = rules[rule_idx]
 
 						# Only go through if the rule can be applied within the given timesteps, or we're running until convergence
 						delta_t = rule.get_delta()
 						if t + delta_t <= tmax or tmax == -1 or again:
-							applicable_node_rules, applicable_edge_rules = _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, atom_trace, allow_ground_rules, num_ga, t)
+							if body_idx >= 0:
+								applicable_node_rules, applicable_edge_rules = _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, atom_trace, allow_ground_rules, num_ga, t, chunk, num_chunks, numeric_index_node, numeric_index_edge, rule_bodies[body_idx])
+							else:
+								applicable_node_rules, applicable_edge_rules = _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, atom_trace, allow_ground_rules, num_ga, t, chunk, num_chunks, numeric_index_node, numeric_index_edge)
 
 							# Loop through applicable rules and add them to the rules to be applied for later or next fp operation
 							for applicable_rule in applicable_node_rules:
@@ -601,8 +761,10 @@ class Interpretation:
 										in_loop_threadsafe[i] = True
 										update_threadsafe[i] = False
 
-					# Update lists after parallel run
-					for i in range(len(rules)):
+					# Update lists after parallel run. The units are in rule order, so the results are merged in the same order every time
+					num_rules_node = len(rules_to_be_applied_node)
+					num_rules_edge = len(rules_to_be_applied_edge)
+					for i in range(len(grounding_work)):
 						if len(rules_to_be_applied_node_threadsafe[i]) > 0:
 							rules_to_be_applied_node.extend(rules_to_be_applied_node_threadsafe[i])
 						if len(rules_to_be_applied_edge_threadsafe[i]) > 0:
@@ -614,16 +776,47 @@ class Interpretation:
 								rules_to_be_applied_edge_trace.extend(rules_to_be_applied_edge_trace_threadsafe[i])
 						if len(edges_to_be_added_edge_rule_threadsafe[i]) > 0:
 							edges_to_be_added_edge_rule.extend(edges_to_be_added_edge_rule_threadsafe[i])
+					_schedule_by_time(rules_to_be_applied_node, rules_node_by_t, num_rules_node, t)
+					_schedule_by_time(rules_to_be_applied_edge, rules_edge_by_t, num_rules_edge, t)
 
 					# Merge threadsafe flags for in_loop and update
 					in_loop = in_loop
 					update = update
-					for i in range(len(rules)):
+					for i in range(len(grounding_work)):
 						if in_loop_threadsafe[i]:
 							in_loop = True
 						if not update_threadsafe[i]:
 							update = False
 
+					# Start collecting the changes for the next pass
+					if not persistent:
+						_merge_delta(dirty_node, delta_node)
+						_merge_delta(dirty_edge, delta_edge)
+					delta_node.clear()
+					delta_edge.clear()
+					ground_all_rules = False
+					num_nodes_grounded = len(nodes)
+					num_edges_grounded = len(edges)
+
+			# Drop the applied rules from the queues once they make up at least half of them
+			if 2 * rules_node_applied_cnt >= len(rules_to_be_applied_node) > 0:
+				_remove_applied_rules(rules_to_be_applied_node, rules_to_be_applied_node_trace, edges_to_be_added_node_rule, rules_node_by_t, t_start, t + 1, atom_trace)
+				rules_node_applied_cnt = 0
+			if 2 * rules_edge_applied_cnt >= len(rules_to_be_applied_edge) > 0:
+				_remove_applied_rules(rules_to_be_applied_edge, rules_to_be_applied_edge_trace, edges_to_be_added_edge_rule, rules_edge_by_t, t_start, t + 1, atom_trace)
+				rules_edge_applied_cnt = 0
+
+			# Move the rule trace to disk once it has grown past the threshold, see set_rule_trace_spill
+			if rule_trace_spill_threshold > 0:
+				if _rule_trace_len(rule_trace_node) >= rule_trace_spill_threshold:
+					rule_trace_node_columns, rule_trace_node_atoms_rows = rule_trace_node[0], rule_trace_node_atoms[0]
+					with objmode():
+						_spill_rule_trace(rule_trace_node_columns, rule_trace_node_atoms_rows, rule_trace_spill_folder, 'node')
+				if _rule_trace_len(rule_trace_edge) >= rule_trace_spill_threshold:
+					rule_trace_edge_columns, rule_trace_edge_atoms_rows = rule_trace_edge[0], rule_trace_edge_atoms[0]
+					with objmode():
+						_spill_rule_trace(rule_trace_edge_columns, rule_trace_edge_atoms_rows, rule_trace_spill_folder, 'edge')
+
 			# Check for convergence after each timestep (perfect convergence or convergence specified by user)
 			# Check number of changed interpretations or max bound change
 			# User specified convergence
@@ -656,6 +849,13 @@ class Interpretation:
 			t += 1
 			num_ga.append(num_ga[-1])
 
+		# Remove the facts that have been applied from the queue (static facts remain, scheduled for the next timestep)
+		_remove_applied_facts(facts_to_be_applied_node, facts_to_be_applied_node_trace, t_start, t, atom_trace)
+		_remove_applied_facts(facts_to_be_applied_edge, facts_to_be_applied_edge_trace, t_start, t, atom_trace)
+		# Same for the rules, so that only the ones still waiting to be applied are kept
+		_remove_applied_rules(rules_to_be_applied_node, rules_to_be_applied_node_trace, edges_to_be_added_node_rule, rules_node_by_t, t_start, t, atom_trace)
+		_remove_applied_rules(rules_to_be_applied_edge, rules_to_be_applied_edge_trace, edges_to_be_added_edge_rule, rules_edge_by_t, t_start, t, atom_trace)
+
 		return fp_cnt, t
 
 	def add_edge(self, edge, l):
@@ -664,7 +864,7 @@ class Interpretation:
 
 	def add_node(self, node, labels):
 		# This function is useful for pyreason gym, called externally
-		if node not in self.nodes:
+		if node not in self.interpretations_node:
 			_add_node(node, self.neighbors, self.reverse_neighbors, self.nodes, self.interpretations_node)
 			for l in labels:
 				self.interpretations_node[node].world[label.Label(l)] = interval.closed(0, 1)
@@ -678,39 +878,90 @@ class Interpretation:
 		_delete_node(node, self.neighbors, self.reverse_neighbors, self.nodes, self.interpretations_node, self.predicate_map_node, self.num_ga)
 
 	def get_dict(self):
-		# This function can be called externally to retrieve a dict of the interpretation values
-		# Only values in the rule trace will be added
-
-		# Initialize interpretations for each time and node and edge
-		interpretations = {}
-		for t in range(self.time+1):
-			interpretations[t] = {}
-			for node in self.nodes:
-				interpretations[t][node] = InterpretationDict()
-			for edge in self.edges:
-				interpretations[t][edge] = InterpretationDict()
-
-		# Update interpretation nodes
-		for change in self.rule_trace_node:
-			time, _, node, l, bnd = change
-			interpretations[time][node][l._value] = (bnd.lower, bnd.upper)
-
-			# If persistent, update all following timesteps as well
-			if self. persistent:
-				for t in range(time+1, self.time+1):
-					interpretations[t][node][l._value] = (bnd.lower, bnd.upper)
-
-		# Update interpretation edges
-		for change in self.rule_trace_edge:
-			time, _, edge, l, bnd, = change
-			interpretations[time][edge][l._value] = (bnd.lower, bnd.upper)
-
-			# If persistent, update all following timesteps as well
-			if self. persistent:
-				for t in range(time+1, self.time+1):
-					interpretations[t][edge][l._value] = (bnd.lower, bnd.upper)
-
-		return interpretations
+		"""
+		This function can be called externally to retrieve the interpretation values, time -> component -> label -> bound.
+		Only values in the rule trace are added. The bounds of a component are looked up when it is accessed
+		:return: InterpretationView: Mapping of timestep to a mapping of component to InterpretationDict
+		"""
+		return InterpretationView(self._get_rule_trace_index('node'), self._get_rule_trace_index('edge'), self.nodes, self.edges, self.time)
+
+	def _get_rule_trace_index(self, component_type):
+		# Built once, and again when the interpretation has reasoned since
+		version = (self.time, int(self.prev_reasoning_data[1]))
+		if self.rule_trace_index_version != version:
+			self.rule_trace_index = {}
+			self.rule_trace_index_version = version
+		if component_type not in self.rule_trace_index:
+			# Static atoms hold at every timestep after they were set, including the graph attributes that are not in the rule trace
+			interpretations = self.interpretations_node if component_type == 'node' else self.interpretations_edge
+			components, labels, lower, upper = _get_static_atoms(interpretations, self.nodes if component_type == 'node' else self.edges)
+			static = (list(components), [l.get_value() for l in labels], np.asarray(lower), np.asarray(upper))
+			self.rule_trace_index[component_type] = RuleTraceIndex(self.iter_rule_trace_columns(component_type), self.persistent, static)
+		return self.rule_trace_index[component_type]
+
+	def get_rule_trace_columns(self, component_type='node'):
+		"""
+		This function returns the node or edge rule trace as parallel NumPy arrays. `time`, `fp`, `lower` and `upper` hold the values of each change,
+		`component`, `label` and `origin` hold ids into the `components`, `labels` and `origins` arrays. The origin is the name of the fact/rule
+		that made the change, -1 if it was not tracked (atom_trace off)
+		:param component_type: 'node' or 'edge'
+		:return: dict: Column name to NumPy array
+		"""
+		chunks = list(self.iter_rule_trace_columns(component_type))
+		if len(chunks) == 1:
+			return chunks[0]
+		columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in rule_trace_column_names}
+		columns.update((name, chunks[-1][name]) for name in ('components', 'labels', 'origins'))
+		return columns
+
+	def iter_rule_trace_columns(self, component_type='node'):
+		"""
+		This function yields the node or edge rule trace in chunks, with the same columns as `get_rule_trace_columns`. Every segment that was
+		spilled to disk is one chunk (memory mapped), the rows still in memory are the last one
+		:param component_type: 'node' or 'edge'
+		:return: Generator of dicts: Column name to NumPy array
+		"""
+		return _iter_rule_trace_columns(self.rule_trace_node if component_type == 'node' else self.rule_trace_edge, self.rule_trace_spill_folder, component_type)
+
+	def set_rule_trace_spill(self, threshold, folder=None):
+		"""
+		This function makes reasoning move the rule trace to segments on disk whenever it holds `threshold` rows or more in memory (checked after
+		each timestep). The segments are written to a new temporary directory inside `folder`, which is removed with the interpretation.
+		The atom trace rows are spilled with their changes, the label/component/origin tables and the grounding blocks stay in memory.
+		`iter_rule_trace_columns` and `iter_rule_trace_atoms` read one segment at a time, while `get_rule_trace_columns`, `get_rule_trace_atoms`
+		and the index behind `get_dict` and `query` read every segment back into memory
+		:param threshold: Number of rows after which the trace is spilled, 0 keeps the whole trace in memory
+		:param folder: Directory to create the segments in, the system temporary directory if None
+		"""
+		self.rule_trace_spill_threshold = threshold
+		if threshold > 0 and self.rule_trace_spill_folder == '':
+			self.rule_trace_spill_folder = tempfile.mkdtemp(prefix='pyreason_rule_trace_', dir=folder)
+			weakref.finalize(self, shutil.rmtree, self.rule_trace_spill_folder, True)
+
+	def get_rule_trace_atoms(self, component_type='node'):
+		"""
+		This function returns the node or edge atom trace, one (qualified nodes, qualified edges, old bound, name) row per rule trace change.
+		Rows that were fired by the same groundings share the same lists. Rows spilled to disk are read back, see `iter_rule_trace_atoms`
+		:param component_type: 'node' or 'edge'
+		:return: list: Atom trace rows
+		"""
+		return [row for chunk in self.iter_rule_trace_atoms(component_type) for row in chunk]
+
+	def iter_rule_trace_atoms(self, component_type='node'):
+		"""
+		This function yields the node or edge atom trace in chunks, one chunk per chunk of `iter_rule_trace_columns` with the rows of its changes
+		:param component_type: 'node' or 'edge'
+		:return: Generator of lists: Atom trace rows
+		"""
+		return _iter_rule_trace_atoms(self.rule_trace_node_atoms if component_type == 'node' else self.rule_trace_edge_atoms, self.rule_trace_spill_folder, component_type)
+
+	def get_rule_trace_num_clauses(self, component_type='node'):
+		"""
+		This function returns the largest number of clauses of a row in the node or edge atom trace, without reading the spilled rows back
+		:param component_type: 'node' or 'edge'
+		:return: int: Number of clauses
+		"""
+		return _rule_trace_atoms_num_clauses(self.rule_trace_node_atoms if component_type == 'node' else self.rule_trace_edge_atoms, self.rule_trace_spill_folder, component_type)
 
 	def get_final_num_ground_atoms(self):
 		"""
@@ -737,11 +988,13 @@ class Interpretation:
 			self.num_ga.pop()
 		return self.num_ga
 
-	def query(self, query, return_bool=True) -> Union[bool, Tuple[float, float]]:
+	def query(self, query, return_bool=True, t=None) -> Union[bool, Tuple[float, float]]:
 		"""
 		This function is used to query the graph after reasoning
 		:param query: A PyReason query object
 		:param return_bool: If True, returns boolean of query, else the bounds associated with it
+		:param t: The timestep to query at, defaults to the last timestep. Earlier timesteps are answered from the rule trace, like get_dict,
+		and need store_interpretation_changes. Static atoms (e.g. graph attributes) are answered at every timestep after they were set
 		:return: bool, or bounds
 		"""
 
@@ -750,53 +1003,108 @@ class Interpretation:
 		pred = query.get_predicate()
 		bnd = query.get_bounds()
 
+		if t is not None and (t < 0 or t > self.time):
+			raise ValueError(f'Timestep {t} is out of bounds. Current interpretation is between 0 and {self.time}')
+		if t is not None and t < self.time and not self.store_interpretation_changes:
+			raise ValueError('Past timesteps are answered from the rule trace, which is not stored when store_interpretation_changes is off')
+
 		# Check if the component exists
-		if comp_type == 'node':
-			if component not in self.nodes:
-				return False if return_bool else (0, 1)
-		else:
-			if component not in self.edges:
+		interpretations = self.interpretations_node if comp_type == 'node' else self.interpretations_edge
+		if component not in interpretations:
+			return False if return_bool else (0, 1)
+
+		# Past timesteps are looked up in the rule trace
+		if t is not None and t < self.time:
+			bound = self._get_rule_trace_index(comp_type).get(component, pred.get_value(), t)
+			if bound is None:
 				return False if return_bool else (0, 1)
+			lower, upper = bound
+			if bnd.lower <= lower and upper <= bnd.upper:
+				return True if return_bool else (lower, upper)
+			else:
+				return False if return_bool else (0, 0)
 
 		# Check if the predicate exists
-		if comp_type == 'node':
-			if pred not in self.interpretations_node[component].world:
-				return False if return_bool else (0, 1)
-		else:
-			if pred not in self.interpretations_edge[component].world:
-				return False if return_bool else (0, 1)
+		world = interpretations[component].world
+		if pred not in world:
+			return False if return_bool else (0, 1)
 
 		# Check if the bounds are satisfied
-		if comp_type == 'node':
-			if self.interpretations_node[component].world[pred] in bnd:
-				return True if return_bool else (self.interpretations_node[component].world[pred].lower, self.interpretations_node[component].world[pred].upper)
-			else:
-				return False if return_bool else (0, 0)
+		if world[pred] in bnd:
+			return True if return_bool else (world[pred].lower, world[pred].upper)
 		else:
-			if self.interpretations_edge[component].world[pred] in bnd:
-				return True if return_bool else (self.interpretations_edge[component].world[pred].lower, self.interpretations_edge[component].world[pred].upper)
-			else:
-				return False if return_bool else (0, 0)
+			return False if return_bool else (0, 0)
+
+	def query_many(self, queries, t=None, return_bool=True):
+		"""
+		Answers many queries at once, like calling query on each of them. The bounds are read by a jitted kernel, from the rule trace
+		index at earlier timesteps (see query), and are checked against the queries with numpy
+		:param queries: A list of PyReason query objects, or a tuple of arrays (components, predicates, lower, upper) with the node or
+			(source, target) edge, the label name and the bounds of each query
+		:param t: The timestep to query at, defaults to the last timestep
+		:param return_bool: If True, returns a boolean array, else an (n, 2) array of the bounds associated with each query
+		:return: np.ndarray in the order of the queries
+		"""
+		if t is not None and (t < 0 or t > self.time):
+			raise ValueError(f'Timestep {t} is out of bounds. Current interpretation is between 0 and {self.time}')
+		if t is not None and t < self.time and not self.store_interpretation_changes:
+			raise ValueError('Past timesteps are answered from the rule trace, which is not stored when store_interpretation_changes is off')
+
+		if isinstance(queries, tuple):
+			components, predicates, query_lower, query_upper = queries
+			components = [component if isinstance(component, tuple) else str(component) for component in components]
+			predicates = [str(pred) for pred in predicates]
+			is_edge = np.fromiter((isinstance(component, tuple) for component in components), dtype=np.bool_, count=len(components))
+		else:
+			components = [query.get_component() for query in queries]
+			predicates = [query.get_predicate().get_value() for query in queries]
+			is_edge = np.fromiter((query.get_component_type() == 'edge' for query in queries), dtype=np.bool_, count=len(queries))
+			bounds = [query.get_bounds() for query in queries]
+			query_lower = [bnd.lower for bnd in bounds]
+			query_upper = [bnd.upper for bnd in bounds]
+		n = len(components)
+		query_lower = np.asarray(query_lower, dtype=np.float64)
+		query_upper = np.asarray(query_upper, dtype=np.float64)
+
+		# Every predicate is turned into a label once
+		label_ids = {}
+		label_of_query = np.fromiter((label_ids.setdefault(pred, len(label_ids)) for pred in predicates), dtype=np.int64, count=n)
+		names = list(label_ids)
+		labels = numba.typed.List([label.Label(name) for name in names])
+
+		# Resolve the bound of every query, queries whose component or label does not exist are not found
+		found = np.zeros(n, dtype=np.bool_)
+		lower = np.full(n, np.nan)
+		upper = np.full(n, np.nan)
+		for comp_type, positions in (('node', np.flatnonzero(~is_edge)), ('edge', np.flatnonzero(is_edge))):
+			if len(positions) == 0:
+				continue
+			interpretations = self.interpretations_node if comp_type == 'node' else self.interpretations_edge
+			comps = [components[i] for i in positions]
+			exists, found[positions], lower[positions], upper[positions] = _get_world_bounds(interpretations, numba.typed.List(comps), labels, label_of_query[positions])
+			if t is not None and t < self.time:
+				index = self._get_rule_trace_index(comp_type)
+				groups = index.group_ids(comps, [names[i] for i in label_of_query[positions]])
+				found[positions], lower[positions], upper[positions] = index.get_many(np.where(exists, groups, -1), t)
+
+		satisfied = found & (query_lower <= lower) & (upper <= query_upper)
+		if return_bool:
+			return satisfied
+
+		# (0, 1) when the atom does not exist and (0, 0) when its bounds are not satisfied, like query
+		bounds = np.zeros((n, 2), dtype=np.float64)
+		bounds[~found, 1] = 1
+		bounds[satisfied, 0] = lower[satisfied]
+		bounds[satisfied, 1] = upper[satisfied]
+		return bounds
 
 
 @numba.njit(cache=True)
-def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, atom_trace, allow_ground_rules, num_ga, t):
-	# Extract rule params
-	rule_type = rule.get_type()
-	head_variables = rule.get_head_variables()
+def _ground_rule_body(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, allow_ground_rules, numeric_index_node=None, numeric_index_edge=None):
+	# Ground the clauses of the rule's body, and prepare the head groundings that _ground_rule goes through
+	# Comparison clauses against a constant are grounded from the numeric attribute index, and are otherwise treated like node/edge clauses
 	clauses = rule.get_clauses()
 	thresholds = rule.get_thresholds()
-	ann_fn = rule.get_annotation_function()
-	rule_edges = rule.get_edges()
-
-	if rule_type == 'node':
-		head_var_1 = head_variables[0]
-	else:
-		head_var_1, head_var_2 = head_variables[0], head_variables[1]
-
-	# We return a list of tuples which specify the target nodes/edges that have made the rule body true
-	applicable_rules_node = numba.typed.List.empty_list(node_applicable_rule_type)
-	applicable_rules_edge = numba.typed.List.empty_list(edge_applicable_rule_type)
 
 	# Grounding procedure
 	# 1. Go through each clause and check which variables have not been initialized in groundings
@@ -811,31 +1119,38 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 	dependency_graph_neighbors = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_nodes)
 	dependency_graph_reverse_neighbors = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_nodes)
 
-	nodes_set = set(nodes)
-	edges_set = set(edges)
+	# Ground the body in the planned order, the trace and annotations of _ground_rule still follow the rule's clause order
+	clause_order = _plan_clause_order(clauses, thresholds, predicate_map_node, predicate_map_edge, len(nodes), len(edges))
 
 	satisfaction = True
-	for i, clause in enumerate(clauses):
+	for i in clause_order:
+		clause = clauses[i]
+
 		# Unpack clause variables
-		clause_type = clause[0]
+		clause_type = _get_grounding_type(clause)
 		clause_label = clause[1]
 		clause_variables = clause[2]
 		clause_bnd = clause[3]
-		_clause_operator = clause[4]
+		clause_operator = clause[4]
+		is_comparison = clause[0] == 'comparison'
 
 		# This is a node clause
 		if clause_type == 'node':
 			clause_var_1 = clause_variables[0]
 
-			# Get subset of nodes that can be used to ground the variable
-			# If we allow ground atoms, we can use the nodes directly
-			if allow_ground_rules and clause_var_1 in nodes_set:
-				grounding = numba.typed.List([clause_var_1])
+			# Comparison clauses are grounded with a range lookup in the numeric attribute index
+			if is_comparison:
+				grounding, qualified_groundings = get_qualified_node_comparison_groundings(interpretations_node, predicate_map_node, numeric_index_node, groundings, clause_var_1, clause_label, clause_bnd, clause_operator)
 			else:
-				grounding = get_rule_node_clause_grounding(clause_var_1, groundings, predicate_map_node, clause_label, nodes)
+				# Get subset of nodes that can be used to ground the variable
+				# If we allow ground atoms, we can use the nodes directly
+				if allow_ground_rules and clause_var_1 in interpretations_node:
+					grounding = numba.typed.List([clause_var_1])
+				else:
+					grounding = get_rule_node_clause_grounding(clause_var_1, groundings, predicate_map_node, clause_label, nodes)
 
-			# Narrow subset based on predicate
-			qualified_groundings = get_qualified_node_groundings(interpretations_node, grounding, clause_label, clause_bnd)
+				# Narrow subset based on predicate
+				qualified_groundings = get_qualified_node_groundings(interpretations_node, grounding, clause_label, clause_bnd)
 			groundings[clause_var_1] = qualified_groundings
 			qualified_groundings_set = set(qualified_groundings)
 			for c1, c2 in groundings_edges:
@@ -854,15 +1169,19 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 		elif clause_type == 'edge':
 			clause_var_1, clause_var_2 = clause_variables[0], clause_variables[1]
 
-			# Get subset of edges that can be used to ground the variables
-			# If we allow ground atoms, we can use the nodes directly
-			if allow_ground_rules and (clause_var_1, clause_var_2) in edges_set:
-				grounding = numba.typed.List([(clause_var_1, clause_var_2)])
+			# Comparison clauses are grounded with a range lookup in the numeric attribute index
+			if is_comparison:
+				grounding, qualified_groundings = get_qualified_edge_comparison_groundings(interpretations_edge, predicate_map_edge, numeric_index_edge, groundings, groundings_edges, clause_var_1, clause_var_2, clause_label, clause_bnd, clause_operator)
 			else:
-				grounding = get_rule_edge_clause_grounding(clause_var_1, clause_var_2, groundings, groundings_edges, neighbors, reverse_neighbors, predicate_map_edge, clause_label, edges)
+				# Get subset of edges that can be used to ground the variables
+				# If we allow ground atoms, we can use the nodes directly
+				if allow_ground_rules and (clause_var_1, clause_var_2) in interpretations_edge:
+					grounding = numba.typed.List([(clause_var_1, clause_var_2)])
+				else:
+					grounding = get_rule_edge_clause_grounding(clause_var_1, clause_var_2, groundings, groundings_edges, neighbors, reverse_neighbors, predicate_map_edge, clause_label, edges)
 
-			# Narrow subset based on predicate (save the edges that are qualified to use for finding future groundings faster)
-			qualified_groundings = get_qualified_edge_groundings(interpretations_edge, grounding, clause_label, clause_bnd)
+				# Narrow subset based on predicate (save the edges that are qualified to use for finding future groundings faster)
+				qualified_groundings = get_qualified_edge_groundings(interpretations_edge, grounding, clause_label, clause_bnd)
 
 			# Check satisfaction of those edges wrt the threshold
 			# Only check satisfaction if the default threshold is used. This saves us from grounding the rest of the rule
@@ -897,7 +1216,7 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 			elif clause_var_1 not in dependency_graph_reverse_neighbors[clause_var_2]:
 				dependency_graph_reverse_neighbors[clause_var_2].append(clause_var_1)
 
-		# This is a comparison clause
+		# This is a comparison clause that is not against a constant (not handled for now)
 		else:
 			pass
 
@@ -909,8 +1228,110 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 		if not satisfaction:
 			break
 
-	# If satisfaction is still true, one final refinement to check if each edge pair is valid in edge rules
-	# Then continue to setup any edges to be added and annotations
+	# Prepare the head groundings. They are the same for every chunk of the rule, so this is done once with the body
+	head_variables = rule.get_head_variables()
+	valid_edge_groundings = numba.typed.List.empty_list(edge_type)
+	edge_groundings_by_head = numba.typed.Dict.empty(key_type=edge_type, value_type=edges_by_node_type)
+	add_head_var_1_node_to_graph = False
+	add_head_var_2_node_to_graph = False
+	add_head_edge_to_graph = False
+	if satisfaction:
+		if rule.get_type() == 'node':
+			head_var_1 = head_variables[0]
+
+			# If there is no grounding for head_var_1, we treat it as a ground atom and add it to the graph
+			head_var_1_in_nodes = head_var_1 in interpretations_node
+			if allow_ground_rules and head_var_1_in_nodes:
+				groundings[head_var_1] = numba.typed.List([head_var_1])
+			elif head_var_1 not in groundings:
+				if not head_var_1_in_nodes:
+					add_head_var_1_node_to_graph = True
+				groundings[head_var_1] = numba.typed.List([head_var_1])
+
+			# Check for satisfaction one more time in case the refining process has changed the groundings
+			# The groundings are the same for every head grounding of a node rule, so this is done once
+			satisfaction = check_all_clause_satisfaction(interpretations_node, interpretations_edge, clauses, thresholds, groundings, groundings_edges)
+
+		else:
+			head_var_1, head_var_2 = head_variables[0], head_variables[1]
+
+			# If there is no grounding for head_var_1 or head_var_2, we treat it as a ground atom and add it to the graph
+			head_var_1_in_nodes = head_var_1 in interpretations_node
+			head_var_2_in_nodes = head_var_2 in interpretations_node
+			if allow_ground_rules and head_var_1_in_nodes:
+				groundings[head_var_1] = numba.typed.List([head_var_1])
+			if allow_ground_rules and head_var_2_in_nodes:
+				groundings[head_var_2] = numba.typed.List([head_var_2])
+
+			if head_var_1 not in groundings:
+				if not head_var_1_in_nodes:
+					add_head_var_1_node_to_graph = True
+				groundings[head_var_1] = numba.typed.List([head_var_1])
+			if head_var_2 not in groundings:
+				if not head_var_2_in_nodes:
+					add_head_var_2_node_to_graph = True
+				groundings[head_var_2] = numba.typed.List([head_var_2])
+
+			# Artificially connect the head variables with an edge if both of them were not in the graph
+			if not head_var_1_in_nodes and not head_var_2_in_nodes:
+				add_head_edge_to_graph = True
+
+			source, target, _ = rule.get_edges()
+			infer_edges = True if source != '' and target != '' else False
+
+			# Prepare the edges that we will loop over.
+			# For infer edges we loop over each combination pair
+			# Else we loop over the valid edges in the graph
+			for g1 in groundings[head_var_1]:
+				for g2 in groundings[head_var_2]:
+					if infer_edges:
+						valid_edge_groundings.append((g1, g2))
+					else:
+						if (g1, g2) in interpretations_edge:
+							valid_edge_groundings.append((g1, g2))
+
+			# Only the clauses connected to the head variables in the dependency graph change when the groundings are narrowed to a
+			# head grounding. The other clauses are checked once here, and only the connected ones for every head grounding
+			_, _, other_clauses, other_thresholds = _split_head_connected_clauses(clauses, thresholds, head_variables, dependency_graph_neighbors, dependency_graph_reverse_neighbors)
+			if not check_all_clause_satisfaction(interpretations_node, interpretations_edge, other_clauses, other_thresholds, groundings, groundings_edges):
+				valid_edge_groundings.clear()
+
+			# Group the edge groundings of the clauses that touch a head variable by the endpoint bound to it
+			# Narrowing them to a head grounding is then a lookup instead of a scan over all the edge groundings
+			edge_groundings_by_head = _group_edge_groundings_by_head(groundings_edges, head_var_1, head_var_2)
+
+	add_to_graph = (add_head_var_1_node_to_graph, add_head_var_2_node_to_graph, add_head_edge_to_graph)
+	return satisfaction, groundings, groundings_edges, dependency_graph_neighbors, dependency_graph_reverse_neighbors, valid_edge_groundings, edge_groundings_by_head, add_to_graph
+
+
+@numba.njit(cache=True)
+def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, atom_trace, allow_ground_rules, num_ga, t, chunk=0, num_chunks=1, numeric_index_node=None, numeric_index_edge=None, body=None):
+	# Only the head groundings in the given chunk (out of num_chunks equal parts) are evaluated. The chunks of a rule can share
+	# its body (and head groundings) grounded once by _ground_rule_body, it is only read here
+	# Extract rule params
+	rule_type = rule.get_type()
+	head_variables = rule.get_head_variables()
+	clauses = rule.get_clauses()
+	thresholds = rule.get_thresholds()
+	ann_fn = rule.get_annotation_function()
+	rule_edges = rule.get_edges()
+
+	if rule_type == 'node':
+		head_var_1 = head_variables[0]
+	else:
+		head_var_1, head_var_2 = head_variables[0], head_variables[1]
+
+	# We return a list of tuples which specify the target nodes/edges that have made the rule body true
+	applicable_rules_node = numba.typed.List.empty_list(node_applicable_rule_type)
+	applicable_rules_edge = numba.typed.List.empty_list(edge_applicable_rule_type)
+
+	if body is None:
+		satisfaction, groundings, groundings_edges, dependency_graph_neighbors, dependency_graph_reverse_neighbors, valid_edge_groundings, edge_groundings_by_head, add_to_graph = _ground_rule_body(rule, interpretations_node, interpretations_edge, predicate_map_node, predicate_map_edge, nodes, edges, neighbors, reverse_neighbors, allow_ground_rules, numeric_index_node, numeric_index_edge)
+	else:
+		satisfaction, groundings, groundings_edges, dependency_graph_neighbors, dependency_graph_reverse_neighbors, valid_edge_groundings, edge_groundings_by_head, add_to_graph = body
+	add_head_var_1_node_to_graph, add_head_var_2_node_to_graph, add_head_edge_to_graph = add_to_graph
+
+	# If satisfaction is still true, continue to setup any edges to be added and annotations
 	# Fill out the rules to be applied lists
 	if satisfaction:
 		# Create temp grounding containers to verify if the head groundings are valid (only for edge rules)
@@ -921,32 +1342,20 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 		if rule_type == 'node':
 			# Loop through all the head variable groundings and add it to the rules to be applied
 			# Loop through the clauses and add appropriate trace data and annotations
-
-			# If there is no grounding for head_var_1, we treat it as a ground atom and add it to the graph
-			head_var_1_in_nodes = head_var_1 in nodes
-			add_head_var_node_to_graph = False
-			if allow_ground_rules and head_var_1_in_nodes:
-				groundings[head_var_1] = numba.typed.List([head_var_1])
-			elif head_var_1 not in groundings:
-				if not head_var_1_in_nodes:
-					add_head_var_node_to_graph = True
-				groundings[head_var_1] = numba.typed.List([head_var_1])
-
-			for head_grounding in groundings[head_var_1]:
+			head_groundings = groundings[head_var_1]
+			start, end = _get_chunk_bounds(len(head_groundings), chunk, num_chunks)
+			for j in range(start, end):
+				head_grounding = head_groundings[j]
 				qualified_nodes = numba.typed.List.empty_list(numba.typed.List.empty_list(node_type))
 				qualified_edges = numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type))
 				annotations = numba.typed.List.empty_list(numba.typed.List.empty_list(interval.interval_type))
 				edges_to_be_added = (numba.typed.List.empty_list(node_type), numba.typed.List.empty_list(node_type), rule_edges[-1])
 
-				# Check for satisfaction one more time in case the refining process has changed the groundings
-				satisfaction = check_all_clause_satisfaction(interpretations_node, interpretations_edge, clauses, thresholds, groundings, groundings_edges)
-				if not satisfaction:
-					continue
-
 				for i, clause in enumerate(clauses):
-					clause_type = clause[0]
+					clause_type = _get_grounding_type(clause)
 					clause_label = clause[1]
 					clause_variables = clause[2]
+					is_comparison = clause[0] == 'comparison'
 
 					if clause_type == 'node':
 						clause_var_1 = clause_variables[0]
@@ -962,10 +1371,10 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 						if ann_fn != '':
 							a = numba.typed.List.empty_list(interval.interval_type)
 							if clause_var_1 == head_var_1:
-								a.append(interpretations_node[head_grounding].world[clause_label])
+								a.append(_get_clause_bound(interpretations_node[head_grounding], clause_label, is_comparison))
 							else:
 								for qn in groundings[clause_var_1]:
-									a.append(interpretations_node[qn].world[clause_label])
+									a.append(_get_clause_bound(interpretations_node[qn], clause_label, is_comparison))
 							annotations.append(a)
 
 					elif clause_type == 'edge':
@@ -988,108 +1397,64 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 							if clause_var_1 == head_var_1:
 								for e in groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[0] == head_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							elif clause_var_2 == head_var_1:
 								for e in groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[1] == head_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							else:
 								for qe in groundings_edges[(clause_var_1, clause_var_2)]:
-									a.append(interpretations_edge[qe].world[clause_label])
+									a.append(_get_clause_bound(interpretations_edge[qe], clause_label, is_comparison))
 							annotations.append(a)
 					else:
-						# Comparison clause (we do not handle for now)
+						# Comparison clause that is not against a constant (we do not handle for now)
 						pass
 
 				# Now that we're sure that the rule is satisfied, we add the head to the graph if needed (only for ground rules)
-				if add_head_var_node_to_graph:
+				if add_head_var_1_node_to_graph:
 					_add_node(head_var_1, neighbors, reverse_neighbors, nodes, interpretations_node)
 
 				# For each grounding add a rule to be applied
 				applicable_rules_node.append((head_grounding, annotations, qualified_nodes, qualified_edges, edges_to_be_added))
 
 		elif rule_type == 'edge':
-			head_var_1 = head_variables[0]
-			head_var_2 = head_variables[1]
-
-			# If there is no grounding for head_var_1 or head_var_2, we treat it as a ground atom and add it to the graph
-			head_var_1_in_nodes = head_var_1 in nodes
-			head_var_2_in_nodes = head_var_2 in nodes
-			add_head_var_1_node_to_graph = False
-			add_head_var_2_node_to_graph = False
-			add_head_edge_to_graph = False
-			if allow_ground_rules and head_var_1_in_nodes:
-				groundings[head_var_1] = numba.typed.List([head_var_1])
-			if allow_ground_rules and head_var_2_in_nodes:
-				groundings[head_var_2] = numba.typed.List([head_var_2])
-
-			if head_var_1 not in groundings:
-				if not head_var_1_in_nodes:
-					add_head_var_1_node_to_graph = True
-				groundings[head_var_1] = numba.typed.List([head_var_1])
-			if head_var_2 not in groundings:
-				if not head_var_2_in_nodes:
-					add_head_var_2_node_to_graph = True
-				groundings[head_var_2] = numba.typed.List([head_var_2])
-
-			# Artificially connect the head variables with an edge if both of them were not in the graph
-			if not head_var_1_in_nodes and not head_var_2_in_nodes:
-				add_head_edge_to_graph = True
-
-			head_var_1_groundings = groundings[head_var_1]
-			head_var_2_groundings = groundings[head_var_2]
-
 			source, target, _ = rule_edges
 			infer_edges = True if source != '' and target != '' else False
+			head_clauses, head_thresholds, _, _ = _split_head_connected_clauses(clauses, thresholds, head_variables, dependency_graph_neighbors, dependency_graph_reverse_neighbors)
 
-			# Prepare the edges that we will loop over.
-			# For infer edges we loop over each combination pair
-			# Else we loop over the valid edges in the graph
-			valid_edge_groundings = numba.typed.List.empty_list(edge_type)
-			for g1 in head_var_1_groundings:
-				for g2 in head_var_2_groundings:
-					if infer_edges:
-						valid_edge_groundings.append((g1, g2))
-					else:
-						if (g1, g2) in edges_set:
-							valid_edge_groundings.append((g1, g2))
+			# Containers to keep track of groundings to make sure that the edge pair is valid
+			# We do this because we cannot know beforehand the edge matches from source groundings to target groundings
+			# They are reset from the rule's groundings for every head grounding instead of being copied
+			temp_groundings = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_nodes)
+			temp_groundings_edges = numba.typed.Dict.empty(key_type=edge_type, value_type=list_of_edges)
 
 			# Loop through the head variable groundings
-			for valid_e in valid_edge_groundings:
+			start, end = _get_chunk_bounds(len(valid_edge_groundings), chunk, num_chunks)
+			for j in range(start, end):
+				valid_e = valid_edge_groundings[j]
 				head_var_1_grounding, head_var_2_grounding = valid_e[0], valid_e[1]
 				qualified_nodes = numba.typed.List.empty_list(numba.typed.List.empty_list(node_type))
 				qualified_edges = numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type))
 				annotations = numba.typed.List.empty_list(numba.typed.List.empty_list(interval.interval_type))
 				edges_to_be_added = (numba.typed.List.empty_list(node_type), numba.typed.List.empty_list(node_type), rule_edges[-1])
 
-				# Containers to keep track of groundings to make sure that the edge pair is valid
-				# We do this because we cannot know beforehand the edge matches from source groundings to target groundings
-				temp_groundings = groundings.copy()
-				temp_groundings_edges = groundings_edges.copy()
+				for v in groundings:
+					temp_groundings[v] = groundings[v]
+				for c in groundings_edges:
+					temp_groundings_edges[c] = groundings_edges[c]
 
 				# Refine the temp groundings for the specific edge head grounding
 				# We update the edge collection as well depending on if there's a match between the clause variables and head variables
 				temp_groundings[head_var_1] = numba.typed.List([head_var_1_grounding])
 				temp_groundings[head_var_2] = numba.typed.List([head_var_2_grounding])
-				for c1, c2 in temp_groundings_edges.keys():
-					if c1 == head_var_1 and c2 == head_var_2:
-						temp_groundings_edges[(c1, c2)] = numba.typed.List([e for e in temp_groundings_edges[(c1, c2)] if e == (head_var_1_grounding, head_var_2_grounding)])
-					elif c1 == head_var_2 and c2 == head_var_1:
-						temp_groundings_edges[(c1, c2)] = numba.typed.List([e for e in temp_groundings_edges[(c1, c2)] if e == (head_var_2_grounding, head_var_1_grounding)])
-					elif c1 == head_var_1:
-						temp_groundings_edges[(c1, c2)] = numba.typed.List([e for e in temp_groundings_edges[(c1, c2)] if e[0] == head_var_1_grounding])
-					elif c2 == head_var_1:
-						temp_groundings_edges[(c1, c2)] = numba.typed.List([e for e in temp_groundings_edges[(c1, c2)] if e[1] == head_var_1_grounding])
-					elif c1 == head_var_2:
-						temp_groundings_edges[(c1, c2)] = numba.typed.List([e for e in temp_groundings_edges[(c1, c2)] if e[0] == head_var_2_grounding])
-					elif c2 == head_var_2:
-						temp_groundings_edges[(c1, c2)] = numba.typed.List([e for e in temp_groundings_edges[(c1, c2)] if e[1] == head_var_2_grounding])
+				for c in edge_groundings_by_head:
+					temp_groundings_edges[c] = _get_head_edge_groundings(edge_groundings_by_head[c], c, head_var_1, head_var_2, head_var_1_grounding, head_var_2_grounding)
 
 				refine_groundings(head_variables, temp_groundings, temp_groundings_edges, dependency_graph_neighbors, dependency_graph_reverse_neighbors)
 
 				# Check if the thresholds are still satisfied
 				# Check if all clauses are satisfied again in case the refining process changed anything
-				satisfaction = check_all_clause_satisfaction(interpretations_node, interpretations_edge, clauses, thresholds, temp_groundings, temp_groundings_edges)
+				satisfaction = check_all_clause_satisfaction(interpretations_node, interpretations_edge, head_clauses, head_thresholds, temp_groundings, temp_groundings_edges)
 
 				if not satisfaction:
 					continue
@@ -1102,9 +1467,10 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 					edges_to_be_added[1].append(head_var_2_grounding)
 
 				for i, clause in enumerate(clauses):
-					clause_type = clause[0]
+					clause_type = _get_grounding_type(clause)
 					clause_label = clause[1]
 					clause_variables = clause[2]
+					is_comparison = clause[0] == 'comparison'
 
 					if clause_type == 'node':
 						clause_var_1 = clause_variables[0]
@@ -1121,12 +1487,12 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 						if ann_fn != '':
 							a = numba.typed.List.empty_list(interval.interval_type)
 							if clause_var_1 == head_var_1:
-								a.append(interpretations_node[head_var_1_grounding].world[clause_label])
+								a.append(_get_clause_bound(interpretations_node[head_var_1_grounding], clause_label, is_comparison))
 							elif clause_var_1 == head_var_2:
-								a.append(interpretations_node[head_var_2_grounding].world[clause_label])
+								a.append(_get_clause_bound(interpretations_node[head_var_2_grounding], clause_label, is_comparison))
 							else:
 								for qn in temp_groundings[clause_var_1]:
-									a.append(interpretations_node[qn].world[clause_label])
+									a.append(_get_clause_bound(interpretations_node[qn], clause_label, is_comparison))
 							annotations.append(a)
 
 					elif clause_type == 'edge':
@@ -1165,30 +1531,30 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 							if clause_var_1 == head_var_1 and clause_var_2 == head_var_2:
 								for e in temp_groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[0] == head_var_1_grounding and e[1] == head_var_2_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							elif clause_var_1 == head_var_2 and clause_var_2 == head_var_1:
 								for e in temp_groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[0] == head_var_2_grounding and e[1] == head_var_1_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							elif clause_var_1 == head_var_1:
 								for e in temp_groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[0] == head_var_1_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							elif clause_var_1 == head_var_2:
 								for e in temp_groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[0] == head_var_2_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							elif clause_var_2 == head_var_1:
 								for e in temp_groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[1] == head_var_1_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							elif clause_var_2 == head_var_2:
 								for e in temp_groundings_edges[(clause_var_1, clause_var_2)]:
 									if e[1] == head_var_2_grounding:
-										a.append(interpretations_edge[e].world[clause_label])
+										a.append(_get_clause_bound(interpretations_edge[e], clause_label, is_comparison))
 							else:
 								for qe in temp_groundings_edges[(clause_var_1, clause_var_2)]:
-									a.append(interpretations_edge[qe].world[clause_label])
+									a.append(_get_clause_bound(interpretations_edge[qe], clause_label, is_comparison))
 							annotations.append(a)
 
 				# Now that we're sure that the rule is satisfied, we add the head to the graph if needed (only for ground rules)
@@ -1209,13 +1575,337 @@ def _ground_rule(rule, interpretations_node, interpretations_edge, predicate_map
 	return applicable_rules_node, applicable_rules_edge
 
 
+@numba.njit(cache=True)
+def _split_head_connected_clauses(clauses, thresholds, head_variables, dependency_graph_neighbors, dependency_graph_reverse_neighbors):
+	# Split the clauses (and their thresholds) into the ones with a variable that is connected to a head variable in the
+	# dependency graph, and the others
+	connected = set(head_variables)
+	frontier = numba.typed.List(head_variables)
+	while len(frontier) > 0:
+		v = frontier.pop()
+		if v in dependency_graph_neighbors:
+			for n in dependency_graph_neighbors[v]:
+				if n not in connected:
+					connected.add(n)
+					frontier.append(n)
+		if v in dependency_graph_reverse_neighbors:
+			for n in dependency_graph_reverse_neighbors[v]:
+				if n not in connected:
+					connected.add(n)
+					frontier.append(n)
+
+	head_clauses = clauses[:0]
+	head_thresholds = thresholds[:0]
+	other_clauses = clauses[:0]
+	other_thresholds = thresholds[:0]
+	for i in range(len(clauses)):
+		is_connected = False
+		for v in clauses[i][2]:
+			if v in connected:
+				is_connected = True
+		if is_connected:
+			head_clauses.append(clauses[i])
+			head_thresholds.append(thresholds[i])
+		else:
+			other_clauses.append(clauses[i])
+			other_thresholds.append(thresholds[i])
+	return head_clauses, head_thresholds, other_clauses, other_thresholds
+
+
+@numba.njit(cache=True)
+def _head_edge_clause_side(clause_variables, head_var_1, head_var_2):
+	# Which endpoint of an edge clause's groundings is bound by a head variable (-1 if none), whether it is bound by the
+	# second head variable, and whether the other endpoint is bound by the other head variable as well
+	c1, c2 = clause_variables
+	if c1 == head_var_1 and c2 == head_var_2:
+		return 0, False, True
+	elif c1 == head_var_2 and c2 == head_var_1:
+		return 0, True, True
+	elif c1 == head_var_1:
+		return 0, False, False
+	elif c2 == head_var_1:
+		return 1, False, False
+	elif c1 == head_var_2:
+		return 0, True, False
+	elif c2 == head_var_2:
+		return 1, True, False
+	return -1, False, False
+
+
+@numba.njit(cache=True)
+def _group_edge_groundings_by_head(groundings_edges, head_var_1, head_var_2):
+	# Group the edge groundings of every clause that shares a variable with the head by the endpoint bound to the head
+	edge_groundings_by_head = numba.typed.Dict.empty(key_type=edge_type, value_type=edges_by_node_type)
+	for c in groundings_edges:
+		side, _, _ = _head_edge_clause_side(c, head_var_1, head_var_2)
+		if side == -1:
+			continue
+		edges_by_node = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_edges)
+		for e in groundings_edges[c]:
+			n = e[side]
+			if n not in edges_by_node:
+				edges_by_node[n] = numba.typed.List.empty_list(edge_type)
+			edges_by_node[n].append(e)
+		edge_groundings_by_head[c] = edges_by_node
+	return edge_groundings_by_head
+
+
+@numba.njit(cache=True)
+def _get_head_edge_groundings(edges_by_node, clause_variables, head_var_1, head_var_2, head_var_1_grounding, head_var_2_grounding):
+	# The edge groundings of a clause that agree with a head grounding, in their original order
+	_, second, both = _head_edge_clause_side(clause_variables, head_var_1, head_var_2)
+	n, other = (head_var_2_grounding, head_var_1_grounding) if second else (head_var_1_grounding, head_var_2_grounding)
+	head_edge_groundings = numba.typed.List.empty_list(edge_type)
+	if n in edges_by_node:
+		for e in edges_by_node[n]:
+			if not both or e[1] == other:
+				head_edge_groundings.append(e)
+	return head_edge_groundings
+
+
+@numba.njit(cache=True)
+def _plan_clause_order(clauses, thresholds, predicate_map_node, predicate_map_edge, num_nodes, num_edges):
+	# Greedy join order for the body: start from the most selective clause and keep picking the cheapest remaining one
+	# given the variables bound so far. Costs come from the label cardinalities in the predicate maps and the average degree,
+	# so the plan follows the interpretation as it changes between timesteps.
+	# Only rules with default thresholds and no comparison clauses are planned, the others depend on the clause order
+	clause_order = numba.typed.List.empty_list(numba.types.int64)
+	num_clauses = len(clauses)
+	plan = num_clauses > 1
+	for i in range(num_clauses):
+		threshold = thresholds[i]
+		if clauses[i][0] == 'comparison' or not (threshold[0] == 'greater_equal' and threshold[1][0] == 'number' and threshold[1][1] == 'total' and threshold[2] == 1.0):
+			plan = False
+	if not plan:
+		for i in range(num_clauses):
+			clause_order.append(i)
+		return clause_order
+
+	avg_degree = num_edges / num_nodes if num_nodes > 0 else 0.0
+	variable_sizes = numba.typed.Dict.empty(key_type=numba.types.string, value_type=numba.types.float64)
+	planned = np.zeros(num_clauses, dtype=np.bool_)
+	for _ in range(num_clauses):
+		# Ties keep the original order
+		best = -1
+		best_cost = 0.0
+		for i in range(num_clauses):
+			if not planned[i]:
+				cost = _estimate_clause_cost(clauses[i], variable_sizes, predicate_map_node, predicate_map_edge, avg_degree)
+				if best == -1 or cost < best_cost:
+					best = i
+					best_cost = cost
+		planned[best] = True
+		clause_order.append(best)
+
+		# The variables of the chosen clause are now bound to at most as many nodes as the clause produces
+		for v in clauses[best][2]:
+			if v not in variable_sizes or best_cost < variable_sizes[v]:
+				variable_sizes[v] = best_cost
+
+	return clause_order
+
+
+@numba.njit(cache=True)
+def _estimate_clause_cost(clause, variable_sizes, predicate_map_node, predicate_map_edge, avg_degree):
+	# Estimated number of candidates a clause produces. A label that is not in the predicate map cannot be satisfied
+	clause_type = clause[0]
+	clause_label = clause[1]
+	clause_variables = clause[2]
+	if clause_type == 'node':
+		cardinality = float(len(predicate_map_node[clause_label])) if clause_label in predicate_map_node else 0.0
+		clause_var_1 = clause_variables[0]
+		if clause_var_1 in variable_sizes:
+			return min(cardinality, variable_sizes[clause_var_1])
+		return cardinality
+	else:
+		cardinality = float(len(predicate_map_edge[clause_label])) if clause_label in predicate_map_edge else 0.0
+		clause_var_1, clause_var_2 = clause_variables[0], clause_variables[1]
+		if clause_var_1 in variable_sizes and clause_var_2 in variable_sizes:
+			return min(cardinality, min(variable_sizes[clause_var_1], variable_sizes[clause_var_2]) * avg_degree)
+		elif clause_var_1 in variable_sizes:
+			return min(cardinality, variable_sizes[clause_var_1] * avg_degree)
+		elif clause_var_2 in variable_sizes:
+			return min(cardinality, variable_sizes[clause_var_2] * avg_degree)
+		return cardinality
+
+
+@numba.njit(cache=True)
+def _get_grounding_type(clause):
+	# Comparison clauses against a constant are grounded like node or edge clauses depending on their number of variables
+	clause_type = clause[0]
+	if clause_type == 'comparison' and _parse_comparison(clause[4])[2]:
+		return 'node' if len(clause[2]) == 1 else 'edge'
+	return clause_type
+
+
+@numba.njit(cache=True)
+def _parse_comparison(clause_operator):
+	# The operator of a comparison clause is followed by the constant it compares to, e.g. '>30' or '<=-2.5'
+	op = clause_operator[:2]
+	op_len = 2 if op == '<=' or op == '>=' or op == '==' or op == '!=' else 1
+	value_str = clause_operator[op_len:]
+	if is_number(value_str):
+		return clause_operator[:op_len], str_to_float(value_str), True
+	return clause_operator[:op_len], 0.0, False
+
+
+@numba.njit(cache=True)
+def _parse_numeric_label(l_str):
+	# Numeric graph attributes become labels of the form 'attribute-value', e.g. 'age-35' or 'temperature--2.5'
+	pos = l_str.find('-')
+	while pos > 0:
+		if is_number(l_str[pos+1:]):
+			return l_str[:pos], str_to_float(l_str[pos+1:]), True
+		pos = l_str.find('-', pos+1)
+	return l_str, 0.0, False
+
+
+@numba.njit(cache=True)
+def _update_numeric_index(numeric_index, numeric_labels_seen, predicate_map):
+	# Add the numeric labels that are new in the predicate map to the index, and sort the attributes that got new values
+	new_values = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_floats)
+	new_labels = numba.typed.Dict.empty(key_type=label.label_type, value_type=list_of_labels)
+	for l in predicate_map:
+		if l in numeric_labels_seen:
+			continue
+		numeric_labels_seen[l] = True
+		attribute, value, is_numeric = _parse_numeric_label(l.get_value())
+		if is_numeric:
+			attribute_label = label.Label(attribute)
+			if attribute_label not in new_values:
+				new_values[attribute_label] = numba.typed.List.empty_list(numba.types.float64)
+				new_labels[attribute_label] = numba.typed.List.empty_list(label.label_type)
+			new_values[attribute_label].append(value)
+			new_labels[attribute_label].append(l)
+
+	for attribute_label in new_values:
+		values = np.empty(len(new_values[attribute_label]), dtype=np.float64)
+		for j in range(len(values)):
+			values[j] = new_values[attribute_label][j]
+		labels = new_labels[attribute_label]
+		if attribute_label in numeric_index:
+			old_values, old_labels = numeric_index[attribute_label]
+			values = np.concatenate((old_values, values))
+			labels = numba.typed.List(old_labels)
+			labels.extend(new_labels[attribute_label])
+		order = np.argsort(values, kind='mergesort')
+		sorted_labels = numba.typed.List.empty_list(label.label_type)
+		for j in order:
+			sorted_labels.append(labels[j])
+		numeric_index[attribute_label] = (values[order], sorted_labels)
+
+
+@numba.njit(cache=True)
+def _get_comparison_labels(numeric_index, clause_label, clause_operator):
+	# Binary search the attribute's values for the labels that satisfy the comparison
+	comparison_labels = numba.typed.List.empty_list(label.label_type)
+	if clause_label not in numeric_index:
+		return comparison_labels
+	values, labels = numeric_index[clause_label]
+	op, value, _ = _parse_comparison(clause_operator)
+	lo = np.searchsorted(values, value, side='left')
+	hi = np.searchsorted(values, value, side='right')
+	if op == '>':
+		start, end = hi, len(values)
+	elif op == '>=':
+		start, end = lo, len(values)
+	elif op == '<':
+		start, end = 0, lo
+	elif op == '<=':
+		start, end = 0, hi
+	else:
+		start, end = lo, hi
+	if op == '!=':
+		for j in range(lo):
+			comparison_labels.append(labels[j])
+		for j in range(hi, len(values)):
+			comparison_labels.append(labels[j])
+	else:
+		for j in range(start, end):
+			comparison_labels.append(labels[j])
+	return comparison_labels
+
+
+@numba.njit(cache=True)
+def get_qualified_node_comparison_groundings(interpretations_node, predicate_map, numeric_index, groundings, clause_var_1, clause_l, clause_bnd, clause_operator):
+	# The grounding is every node whose attribute value satisfies the comparison (restricted to the previous grounding of the
+	# variable if there is one). The qualified groundings are the ones whose numeric label also satisfies the clause bound
+	grounding = numba.typed.List.empty_list(node_type)
+	qualified_groundings = numba.typed.List.empty_list(node_type)
+	candidates = numba.typed.List.empty_list(node_type)
+	grounding_set = set(candidates)
+	qualified_set = set(candidates)
+	for l in _get_comparison_labels(numeric_index, clause_l, clause_operator):
+		if l in predicate_map:
+			for n in predicate_map[l]:
+				if n not in grounding_set:
+					grounding_set.add(n)
+					candidates.append(n)
+				if is_satisfied_node(interpretations_node, n, (l, clause_bnd)):
+					qualified_set.add(n)
+
+	# Keep the order of the previous grounding if the variable has one, else the order of the values
+	if clause_var_1 in groundings:
+		candidates = groundings[clause_var_1]
+	for n in candidates:
+		if n in grounding_set:
+			grounding.append(n)
+			if n in qualified_set:
+				qualified_groundings.append(n)
+	return grounding, qualified_groundings
+
+
+@numba.njit(cache=True)
+def get_qualified_edge_comparison_groundings(interpretations_edge, predicate_map, numeric_index, groundings, groundings_edges, clause_var_1, clause_var_2, clause_l, clause_bnd, clause_operator):
+	# Same as for nodes, with the edges restricted to the previous groundings of both variables
+	grounding = numba.typed.List.empty_list(edge_type)
+	qualified_groundings = numba.typed.List.empty_list(edge_type)
+	candidates = numba.typed.List.empty_list(edge_type)
+	grounding_set = set(candidates)
+	qualified_set = set(candidates)
+	for l in _get_comparison_labels(numeric_index, clause_l, clause_operator):
+		if l in predicate_map:
+			for e in predicate_map[l]:
+				if e not in grounding_set:
+					grounding_set.add(e)
+					candidates.append(e)
+				if is_satisfied_edge(interpretations_edge, e, (l, clause_bnd)):
+					qualified_set.add(e)
+
+	if (clause_var_1, clause_var_2) in groundings_edges:
+		candidates = groundings_edges[(clause_var_1, clause_var_2)]
+	if clause_var_1 in groundings:
+		groundings_clause_1_set = set(groundings[clause_var_1])
+		candidates = numba.typed.List([e for e in candidates if e[0] in groundings_clause_1_set])
+	if clause_var_2 in groundings:
+		groundings_clause_2_set = set(groundings[clause_var_2])
+		candidates = numba.typed.List([e for e in candidates if e[1] in groundings_clause_2_set])
+	for e in candidates:
+		if e in grounding_set:
+			grounding.append(e)
+			if e in qualified_set:
+				qualified_groundings.append(e)
+	return grounding, qualified_groundings
+
+
+@numba.njit(cache=True)
+def _get_clause_bound(world, clause_label, is_comparison):
+	# Comparison clauses name the attribute, their atoms are the numeric labels of that attribute
+	if is_comparison:
+		for l in world.world:
+			attribute, _, is_numeric = _parse_numeric_label(l.get_value())
+			if is_numeric and attribute == clause_label.get_value():
+				return world.world[l]
+	return world.world[clause_label]
+
+
 @numba.njit(cache=True)
 def check_all_clause_satisfaction(interpretations_node, interpretations_edge, clauses, thresholds, groundings, groundings_edges):
 	# Check if the thresholds are satisfied for each clause
 	satisfaction = True
 	for i, clause in enumerate(clauses):
 		# Unpack clause variables
-		clause_type = clause[0]
+		clause_type = _get_grounding_type(clause)
 		clause_label = clause[1]
 		clause_variables = clause[2]
 
@@ -1231,6 +1921,7 @@ def check_all_clause_satisfaction(interpretations_node, interpretations_edge, cl
 @numba.njit(cache=True)
 def refine_groundings(clause_variables, groundings, groundings_edges, dependency_graph_neighbors, dependency_graph_reverse_neighbors):
 	# Loop through the dependency graph and refine the groundings that have connections
+	# Each refinement is a hash semi-join of the edge groundings against the refined node groundings
 	all_variables_refined = numba.typed.List(clause_variables)
 	variables_just_refined = numba.typed.List(clause_variables)
 	new_variables_refined = numba.typed.List.empty_list(numba.types.string)
@@ -1240,7 +1931,7 @@ def refine_groundings(clause_variables, groundings, groundings_edges, dependency
 			if refined_variable in dependency_graph_neighbors:
 				for neighbor in dependency_graph_neighbors[refined_variable]:
 					old_edge_groundings = groundings_edges[(refined_variable, neighbor)]
-					new_node_groundings = groundings[refined_variable]
+					new_node_groundings = set(groundings[refined_variable])
 
 					# Delete old groundings for the variable being refined
 					del groundings[neighbor]
@@ -1262,7 +1953,7 @@ def refine_groundings(clause_variables, groundings, groundings_edges, dependency
 			if refined_variable in dependency_graph_reverse_neighbors:
 				for reverse_neighbor in dependency_graph_reverse_neighbors[refined_variable]:
 					old_edge_groundings = groundings_edges[(reverse_neighbor, refined_variable)]
-					new_node_groundings = groundings[refined_variable]
+					new_node_groundings = set(groundings[refined_variable])
 
 					# Delete old groundings for the variable being refined
 					del groundings[reverse_neighbor]
@@ -1347,15 +2038,15 @@ def get_rule_edge_clause_grounding(clause_var_1, clause_var_2, groundings, groun
 	# We replace Y by the sources of Z
 	elif clause_var_1 not in groundings and clause_var_2 in groundings:
 		for n in groundings[clause_var_2]:
-			es = numba.typed.List([(nn, n) for nn in reverse_neighbors[n]])
-			edge_groundings.extend(es)
+			for nn in reverse_neighbors[n]:
+				edge_groundings.append((nn, n))
 
 	# Case 3:
 	# We replace Z by the neighbors of Y
 	elif clause_var_1 in groundings and clause_var_2 not in groundings:
 		for n in groundings[clause_var_1]:
-			es = numba.typed.List([(n, nn) for nn in neighbors[n]])
-			edge_groundings.extend(es)
+			for nn in neighbors[n]:
+				edge_groundings.append((n, nn))
 
 	# Case 4:
 	# We have seen both variables before
@@ -1367,8 +2058,9 @@ def get_rule_edge_clause_grounding(clause_var_1, clause_var_2, groundings, groun
 		else:
 			groundings_clause_var_2_set = set(groundings[clause_var_2])
 			for n in groundings[clause_var_1]:
-				es = numba.typed.List([(n, nn) for nn in neighbors[n] if nn in groundings_clause_var_2_set])
-				edge_groundings.extend(es)
+				for nn in neighbors[n]:
+					if nn in groundings_clause_var_2_set:
+						edge_groundings.append((n, nn))
 
 	return edge_groundings
 
@@ -1428,7 +2120,35 @@ def _satisfies_threshold(num_neigh, num_qualified_component, threshold):
 
 
 @numba.njit(cache=True)
-def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_cnt, t_cnt, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_trace, idx, facts_to_be_applied_trace, rule_trace_atoms, store_interpretation_changes, num_ga, mode, override=False):
+def _apply_rule_node(interpretations_node, predicate_map_node, comp, l, bnd, set_static, idx, ipl, rule_trace_node, fp_cnt, t, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, update_mode, inconsistency_check, delta_node):
+	# Check for inconsistencies
+	if check_consistent_node(interpretations_node, comp, (l, bnd)):
+		override = True if update_mode == 'override' else False
+		return _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, idx, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode='rule', override=override, delta=delta_node)
+	# Resolve inconsistency
+	elif inconsistency_check:
+		resolve_inconsistency_node(interpretations_node, comp, (l, bnd), ipl, t, fp_cnt, idx, atom_trace, rule_trace_node, rule_trace_node_atoms, rules_to_be_applied_node_trace, facts_to_be_applied_node_trace, store_interpretation_changes, mode='rule', delta=delta_node)
+		return False, 0.0
+	else:
+		return _update_node(interpretations_node, predicate_map_node, comp, (l, bnd), ipl, rule_trace_node, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_node_trace, idx, facts_to_be_applied_node_trace, rule_trace_node_atoms, store_interpretation_changes, num_ga, mode='rule', override=True, delta=delta_node)
+
+
+@numba.njit(cache=True)
+def _apply_rule_edge(interpretations_edge, predicate_map_edge, comp, l, bnd, set_static, idx, ipl, rule_trace_edge, fp_cnt, t, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, update_mode, inconsistency_check, delta_edge):
+	# Check for inconsistencies
+	if check_consistent_edge(interpretations_edge, comp, (l, bnd)):
+		override = True if update_mode == 'override' else False
+		return _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, idx, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode='rule', override=override, delta=delta_edge)
+	# Resolve inconsistency
+	elif inconsistency_check:
+		resolve_inconsistency_edge(interpretations_edge, comp, (l, bnd), ipl, t, fp_cnt, idx, atom_trace, rule_trace_edge, rule_trace_edge_atoms, rules_to_be_applied_edge_trace, facts_to_be_applied_edge_trace, store_interpretation_changes, mode='rule', delta=delta_edge)
+		return False, 0.0
+	else:
+		return _update_edge(interpretations_edge, predicate_map_edge, comp, (l, bnd), ipl, rule_trace_edge, fp_cnt, t, set_static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_edge_trace, idx, facts_to_be_applied_edge_trace, rule_trace_edge_atoms, store_interpretation_changes, num_ga, mode='rule', override=True, delta=delta_edge)
+
+
+@numba.njit(cache=True)
+def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_cnt, t_cnt, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_trace, idx, facts_to_be_applied_trace, rule_trace_atoms, store_interpretation_changes, num_ga, mode, override=False, delta=None):
 	updated = False
 	# This is to prevent a key error in case the label is a specific label
 	try:
@@ -1437,13 +2157,7 @@ def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 		updated_bnds = numba.typed.List.empty_list(interval.interval_type)
 
 		# Add label to world if it is not there
-		if l not in world.world:
-			world.world[l] = interval.closed(0, 1)
-			num_ga[t_cnt] += 1
-			if l in predicate_map:
-				predicate_map[l].append(comp)
-			else:
-				predicate_map[l] = numba.typed.List([comp])
+		_add_label(world, predicate_map, comp, l, num_ga, t_cnt, delta)
 
 		# Check if update is necessary with previous bnd
 		prev_bnd = world.world[l].copy()
@@ -1457,10 +2171,15 @@ def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 		if world.world[l]!=prev_bnd:
 			updated = True
 			updated_bnds.append(world.world[l])
+			if delta is not None:
+				_record_delta(delta, comp, l)
 
 			# Add to rule trace if update happened and add to atom trace if necessary
 			if (save_graph_attributes_to_rule_trace or not mode=='graph-attribute-fact') and store_interpretation_changes:
-				rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, l, world.world[l].copy()))
+				origin = ''
+				if atom_trace:
+					origin = facts_to_be_applied_trace[idx] if mode=='fact' or mode=='graph-attribute-fact' else rules_to_be_applied_trace[idx][2]
+				_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, l, world.world[l], origin)
 				if atom_trace:
 					# Mode can be fact or rule, updation of trace will happen accordingly
 					if mode=='fact' or mode=='graph-attribute-fact':
@@ -1484,15 +2203,17 @@ def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 						else:
 							predicate_map[p2] = numba.typed.List([comp])
 					if atom_trace:
-						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2], f'IPL: {l.get_value()}')
+						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2].copy(), f'IPL: {l.get_value()}')
 					lower = max(world.world[p2].lower, 1 - world.world[p1].upper)
 					upper = min(world.world[p2].upper, 1 - world.world[p1].lower)
 					world.world[p2].set_lower_upper(lower, upper)
 					world.world[p2].set_static(static)
 					ip_update_cnt += 1
+					if delta is not None:
+						_record_delta(delta, comp, p2)
 					updated_bnds.append(world.world[p2])
 					if store_interpretation_changes:
-						rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, interval.closed(lower, upper)))
+						_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, world.world[p2], f'IPL: {l.get_value()}' if atom_trace else '')
 				if p2 == l:
 					if p1 not in world.world:
 						world.world[p1] = interval.closed(0, 1)
@@ -1501,15 +2222,17 @@ def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 						else:
 							predicate_map[p1] = numba.typed.List([comp])
 					if atom_trace:
-						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1], f'IPL: {l.get_value()}')
+						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1].copy(), f'IPL: {l.get_value()}')
 					lower = max(world.world[p1].lower, 1 - world.world[p2].upper)
 					upper = min(world.world[p1].upper, 1 - world.world[p2].lower)
 					world.world[p1].set_lower_upper(lower, upper)
 					world.world[p1].set_static(static)
 					ip_update_cnt += 1
+					if delta is not None:
+						_record_delta(delta, comp, p1)
 					updated_bnds.append(world.world[p1])
 					if store_interpretation_changes:
-						rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, interval.closed(lower, upper)))
+						_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, world.world[p1], f'IPL: {l.get_value()}' if atom_trace else '')
 
 		# Gather convergence data
 		change = 0
@@ -1534,7 +2257,7 @@ def _update_node(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 
 
 @numba.njit(cache=True)
-def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_cnt, t_cnt, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_trace, idx, facts_to_be_applied_trace, rule_trace_atoms, store_interpretation_changes, num_ga, mode, override=False):
+def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_cnt, t_cnt, static, convergence_mode, atom_trace, save_graph_attributes_to_rule_trace, rules_to_be_applied_trace, idx, facts_to_be_applied_trace, rule_trace_atoms, store_interpretation_changes, num_ga, mode, override=False, delta=None):
 	updated = False
 	# This is to prevent a key error in case the label is a specific label
 	try:
@@ -1543,13 +2266,7 @@ def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 		updated_bnds = numba.typed.List.empty_list(interval.interval_type)
 
 		# Add label to world if it is not there
-		if l not in world.world:
-			world.world[l] = interval.closed(0, 1)
-			num_ga[t_cnt] += 1
-			if l in predicate_map:
-				predicate_map[l].append(comp)
-			else:
-				predicate_map[l] = numba.typed.List([comp])
+		_add_label(world, predicate_map, comp, l, num_ga, t_cnt, delta)
 
 		# Check if update is necessary with previous bnd
 		prev_bnd = world.world[l].copy()
@@ -1563,10 +2280,15 @@ def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 		if world.world[l]!=prev_bnd:
 			updated = True
 			updated_bnds.append(world.world[l])
+			if delta is not None:
+				_record_delta(delta, comp, l)
 
 			# Add to rule trace if update happened and add to atom trace if necessary
 			if (save_graph_attributes_to_rule_trace or not mode=='graph-attribute-fact') and store_interpretation_changes:
-				rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, l, world.world[l].copy()))
+				origin = ''
+				if atom_trace:
+					origin = facts_to_be_applied_trace[idx] if mode=='fact' or mode=='graph-attribute-fact' else rules_to_be_applied_trace[idx][2]
+				_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, l, world.world[l], origin)
 				if atom_trace:
 					# Mode can be fact or rule, updation of trace will happen accordingly
 					if mode=='fact' or mode=='graph-attribute-fact':
@@ -1590,15 +2312,17 @@ def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 						else:
 							predicate_map[p2] = numba.typed.List([comp])
 					if atom_trace:
-						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2], f'IPL: {l.get_value()}')
+						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2].copy(), f'IPL: {l.get_value()}')
 					lower = max(world.world[p2].lower, 1 - world.world[p1].upper)
 					upper = min(world.world[p2].upper, 1 - world.world[p1].lower)
 					world.world[p2].set_lower_upper(lower, upper)
 					world.world[p2].set_static(static)
 					ip_update_cnt += 1
+					if delta is not None:
+						_record_delta(delta, comp, p2)
 					updated_bnds.append(world.world[p2])
 					if store_interpretation_changes:
-						rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, interval.closed(lower, upper)))
+						_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, world.world[p2], f'IPL: {l.get_value()}' if atom_trace else '')
 				if p2 == l:
 					if p1 not in world.world:
 						world.world[p1] = interval.closed(0, 1)
@@ -1607,15 +2331,17 @@ def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 						else:
 							predicate_map[p1] = numba.typed.List([comp])
 					if atom_trace:
-						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1], f'IPL: {l.get_value()}')
+						_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1].copy(), f'IPL: {l.get_value()}')
 					lower = max(world.world[p1].lower, 1 - world.world[p2].upper)
 					upper = min(world.world[p1].upper, 1 - world.world[p2].lower)
 					world.world[p1].set_lower_upper(lower, upper)
 					world.world[p1].set_static(static)
 					ip_update_cnt += 1
+					if delta is not None:
+						_record_delta(delta, comp, p1)
 					updated_bnds.append(world.world[p2])
 					if store_interpretation_changes:
-						rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, interval.closed(lower, upper)))
+						_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, world.world[p1], f'IPL: {l.get_value()}' if atom_trace else '')
 
 		# Gather convergence data
 		change = 0
@@ -1639,8 +2365,636 @@ def _update_edge(interpretations, predicate_map, comp, na, ipl, rule_trace, fp_c
 
 
 @numba.njit(cache=True)
-def _update_rule_trace(rule_trace, qn, qe, prev_bnd, name):
-	rule_trace.append((qn, qe, prev_bnd.copy(), name))
+def _add_label(world, predicate_map, comp, l, num_ga, t_cnt, delta):
+	if l not in world.world:
+		world.world[l] = interval.closed(0, 1)
+		num_ga[t_cnt] += 1
+		if l in predicate_map:
+			predicate_map[l].append(comp)
+		else:
+			predicate_map[l] = numba.typed.List([comp])
+		if delta is not None:
+			_record_delta(delta, comp, l)
+
+
+@numba.njit(cache=True)
+def _update_rule_trace(rule_trace_atoms, qn, qe, prev_bnd, name):
+	rows, (node_blocks, edge_blocks) = rule_trace_atoms
+	qn_ids = numba.typed.List.empty_list(numba.types.int64)
+	qe_ids = numba.typed.List.empty_list(numba.types.int64)
+	for groundings in qn:
+		qn_ids.append(_intern_grounding_block(node_blocks, groundings))
+	for groundings in qe:
+		qe_ids.append(_intern_grounding_block(edge_blocks, groundings))
+	rows.append((qn_ids, qe_ids, prev_bnd.copy(), name))
+
+
+@numba.njit(cache=True)
+def _new_provenance():
+	node_blocks = (numba.typed.List.empty_list(list_of_nodes), numba.typed.Dict.empty(key_type=numba.types.int64, value_type=list_of_idx))
+	edge_blocks = (numba.typed.List.empty_list(list_of_edges), numba.typed.Dict.empty(key_type=numba.types.int64, value_type=list_of_idx))
+	return node_blocks, edge_blocks
+
+
+@numba.njit(cache=True)
+def _intern_grounding_block(blocks, groundings):
+	# Return the id of the block with the same groundings, or add the groundings as a new block. Blocks are never modified
+	block_list, block_ids = blocks
+	h = _hash_grounding_block(groundings)
+	if h in block_ids:
+		for i in block_ids[h]:
+			if _grounding_blocks_equal(block_list[i], groundings):
+				return i
+	else:
+		block_ids[h] = numba.typed.List.empty_list(numba.types.int64)
+	block_ids[h].append(len(block_list))
+	block_list.append(groundings)
+	return len(block_list) - 1
+
+
+@numba.njit(cache=True)
+def _hash_grounding_block(groundings):
+	h = len(groundings)
+	for g in groundings:
+		h = ((h * 1000003) ^ hash(g)) & 0x7FFFFFFFFFFFFFFF
+	return h
+
+
+@numba.njit(cache=True)
+def _grounding_blocks_equal(block, groundings):
+	if len(block) != len(groundings):
+		return False
+	for i in range(len(block)):
+		if block[i] != groundings[i]:
+			return False
+	return True
+
+
+@numba.njit(cache=True)
+def _merge_rule_trace_atoms_buffers(rule_trace_atoms, rule_trace_atoms_threadsafe, start, cnt, buffer_of):
+	# Append the rows made by each update (cnt[k] rows from start[k] in its buffer), in the order of the updates. The groundings
+	# are interned again in the shared blocks
+	for k in range(len(cnt)):
+		rows, ((node_blocks, _), (edge_blocks, _)) = rule_trace_atoms_threadsafe[buffer_of[k]]
+		for j in range(start[k], start[k] + cnt[k]):
+			qn_ids, qe_ids, prev_bnd, name = rows[j]
+			qn = numba.typed.List.empty_list(list_of_nodes)
+			qe = numba.typed.List.empty_list(list_of_edges)
+			for i in qn_ids:
+				qn.append(node_blocks[i])
+			for i in qe_ids:
+				qe.append(edge_blocks[i])
+			_update_rule_trace(rule_trace_atoms, qn, qe, prev_bnd, name)
+
+
+def _resolve_rule_trace_atoms(rule_trace_atoms):
+	# Look the blocks of each row up, every block is converted once so rows with the same groundings share the same lists
+	rows, ((node_blocks, _), (edge_blocks, _)) = rule_trace_atoms
+	node_lists, edge_lists = {}, {}
+	resolved = []
+	for qn_ids, qe_ids, prev_bnd, name in rows:
+		for i in qn_ids:
+			if i not in node_lists:
+				node_lists[i] = list(node_blocks[i])
+		for i in qe_ids:
+			if i not in edge_lists:
+				edge_lists[i] = list(edge_blocks[i])
+		resolved.append(([node_lists[i] for i in qn_ids], [edge_lists[i] for i in qe_ids], prev_bnd, name))
+	return resolved
+
+
+@numba.njit(cache=True)
+def _new_rule_trace_node():
+	return _new_rule_trace((numba.typed.List.empty_list(node_type), numba.typed.Dict.empty(key_type=node_type, value_type=numba.types.int64)))
+
+
+@numba.njit(cache=True)
+def _new_rule_trace_edge():
+	return _new_rule_trace((numba.typed.List.empty_list(edge_type), numba.typed.Dict.empty(key_type=edge_type, value_type=numba.types.int64)))
+
+
+@numba.njit(cache=True)
+def _new_rule_trace(components):
+	# Time and fp operation, component/label/origin ids, lower and upper bounds
+	times = numba.typed.List.empty_list(uint16_column_type)
+	ids = numba.typed.List.empty_list(int32_column_type)
+	bounds = numba.typed.List.empty_list(float64_column_type)
+	for _ in range(2):
+		times.append(np.empty(rule_trace_capacity, dtype=np.uint16))
+		bounds.append(np.empty(rule_trace_capacity, dtype=np.float64))
+	for _ in range(3):
+		ids.append(np.empty(rule_trace_capacity, dtype=np.int32))
+	size = np.zeros(1, dtype=np.int64)
+
+	labels = (numba.typed.List.empty_list(label.label_type), numba.typed.Dict.empty(key_type=label.label_type, value_type=numba.types.int64))
+	origins = (numba.typed.List.empty_list(numba.types.string), numba.typed.Dict.empty(key_type=numba.types.string, value_type=numba.types.int64))
+	return (times, ids, bounds, size), components, labels, origins
+
+
+@numba.njit(cache=True)
+def _append_rule_trace(rule_trace, t, fp_cnt, comp, l, bnd, origin):
+	_append_rule_trace_columns(rule_trace, t, fp_cnt, comp, l, bnd.lower, bnd.upper, origin)
+
+
+@numba.njit(cache=True)
+def _append_rule_trace_columns(rule_trace, t, fp_cnt, comp, l, lower, upper, origin):
+	(times, ids, bounds, size), components, labels, origins = rule_trace
+	n = size[0]
+	if n == len(bounds[0]):
+		_grow_rule_trace(times, ids, bounds, n)
+
+	times[0][n] = t
+	times[1][n] = fp_cnt
+	ids[0][n] = _intern_rule_trace_key(components, comp)
+	ids[1][n] = _intern_rule_trace_key(labels, l)
+	# The origin is only known when the atom trace is kept
+	ids[2][n] = _intern_rule_trace_key(origins, origin) if origin != '' else -1
+	bounds[0][n] = lower
+	bounds[1][n] = upper
+	size[0] = n + 1
+
+
+@numba.njit(cache=True)
+def _grow_rule_trace(times, ids, bounds, n):
+	# Double the capacity of every column, this keeps appends amortized O(1)
+	for i in range(len(times)):
+		column = np.empty(2 * n, dtype=np.uint16)
+		column[:n] = times[i][:n]
+		times[i] = column
+	for i in range(len(ids)):
+		column = np.empty(2 * n, dtype=np.int32)
+		column[:n] = ids[i][:n]
+		ids[i] = column
+	for i in range(len(bounds)):
+		column = np.empty(2 * n, dtype=np.float64)
+		column[:n] = bounds[i][:n]
+		bounds[i] = column
+
+
+@numba.njit(cache=True)
+def _intern_rule_trace_key(table, key):
+	keys, key_ids = table
+	if key in key_ids:
+		return key_ids[key]
+	key_ids[key] = len(keys)
+	keys.append(key)
+	return len(keys) - 1
+
+
+@numba.njit(cache=True)
+def _get_static_atoms(interpretations, components):
+	# The component, label and bound of every static atom
+	static_components = components.copy()
+	static_components.clear()
+	labels = numba.typed.List.empty_list(label.label_type)
+	lower = numba.typed.List.empty_list(numba.types.float64)
+	upper = numba.typed.List.empty_list(numba.types.float64)
+	for comp in interpretations:
+		world = interpretations[comp].world
+		for l in world:
+			if world[l].is_static():
+				static_components.append(comp)
+				labels.append(l)
+				lower.append(world[l].lower)
+				upper.append(world[l].upper)
+	return static_components, labels, lower, upper
+
+
+@numba.njit(cache=True)
+def _get_world_bounds(interpretations, components, labels, label_ids):
+	# Whether each component exists, and the bound of its label (labels[label_ids[i]]) if it has one
+	n = len(components)
+	exists = np.zeros(n, dtype=np.bool_)
+	found = np.zeros(n, dtype=np.bool_)
+	lower = np.full(n, np.nan)
+	upper = np.full(n, np.nan)
+	for i in range(n):
+		if components[i] in interpretations:
+			exists[i] = True
+			world = interpretations[components[i]].world
+			l = labels[label_ids[i]]
+			if l in world:
+				found[i] = True
+				lower[i] = world[l].lower
+				upper[i] = world[l].upper
+	return exists, found, lower, upper
+
+
+@numba.njit(cache=True)
+def _rule_trace_len(rule_trace):
+	return rule_trace[0][3][0]
+
+
+@numba.njit(cache=True)
+def _merge_rule_trace_buffers(rule_trace, rule_trace_threadsafe, start, cnt, buffer_of):
+	# Append the rows made by each update (cnt[k] rows from start[k] in its buffer), in the order of the updates. Ids are
+	# interned again in the shared trace
+	for k in range(len(cnt)):
+		(times, ids, bounds, _), components, labels, origins = rule_trace_threadsafe[buffer_of[k]]
+		for j in range(start[k], start[k] + cnt[k]):
+			origin = origins[0][ids[2][j]] if ids[2][j] >= 0 else ''
+			_append_rule_trace_columns(rule_trace, times[0][j], times[1][j], components[0][ids[0][j]], labels[0][ids[1][j]], bounds[0][j], bounds[1][j], origin)
+
+
+def _rule_trace_to_columns(rule_trace):
+	# Read the columns of a rule trace back into NumPy arrays, the tables are returned as object arrays
+	(times, ids, bounds, size), components, labels, origins = rule_trace
+	n = size[0]
+	return {
+		'time': times[0][:n],
+		'fp': times[1][:n],
+		'component': ids[0][:n],
+		'label': ids[1][:n],
+		'origin': ids[2][:n],
+		'lower': bounds[0][:n],
+		'upper': bounds[1][:n],
+		'components': _to_object_array(components[0]),
+		'labels': _to_object_array([l.get_value() for l in labels[0]]),
+		'origins': _to_object_array(origins[0]),
+	}
+
+
+def _spill_rule_trace(columns, atoms, folder, component_type):
+	# Write the rows in memory to a new segment (one .npy file per column) and empty the columns. The atom trace rows (one per
+	# change, if atom_trace is on) go to the same segment. The tables and grounding blocks are not spilled, the ids in the
+	# segments refer to the ones in memory
+	times, ids, bounds, size = columns
+	n = size[0]
+	segment = os.path.join(folder, f'{component_type}-{len(_rule_trace_segments(folder, component_type)):06d}')
+	os.makedirs(segment)
+	for name, column in zip(rule_trace_column_names, (times[0], times[1], ids[0], ids[1], ids[2], bounds[0], bounds[1])):
+		np.save(os.path.join(segment, f'{name}.npy'), column[:n])
+	size[0] = 0
+	if len(atoms) > 0:
+		arrays, names = _rule_trace_atoms_to_arrays(atoms)
+		for name, array in zip(rule_trace_atoms_column_names, arrays):
+			np.save(os.path.join(segment, f'{name}.npy'), array)
+		np.save(os.path.join(segment, 'atom_names.npy'), np.array(list(names), dtype=str))
+		atoms.clear()
+
+
+@numba.njit(cache=True)
+def _rule_trace_atoms_to_arrays(atoms):
+	# The block ids of each row flattened with offsets, the old bounds and the name ids into the returned names
+	n = len(atoms)
+	qn_offsets = np.zeros(n + 1, dtype=np.int64)
+	qe_offsets = np.zeros(n + 1, dtype=np.int64)
+	for i in range(n):
+		qn_offsets[i + 1] = qn_offsets[i] + len(atoms[i][0])
+		qe_offsets[i + 1] = qe_offsets[i] + len(atoms[i][1])
+	qn_ids = np.empty(qn_offsets[n], dtype=np.int64)
+	qe_ids = np.empty(qe_offsets[n], dtype=np.int64)
+	lower = np.empty(n, dtype=np.float64)
+	upper = np.empty(n, dtype=np.float64)
+	name_ids = np.empty(n, dtype=np.int32)
+	names = numba.typed.List.empty_list(numba.types.string)
+	name_idx = numba.typed.Dict.empty(key_type=numba.types.string, value_type=numba.types.int64)
+	for i in range(n):
+		row_qn, row_qe, prev_bnd, name = atoms[i]
+		for j in range(len(row_qn)):
+			qn_ids[qn_offsets[i] + j] = row_qn[j]
+		for j in range(len(row_qe)):
+			qe_ids[qe_offsets[i] + j] = row_qe[j]
+		lower[i] = prev_bnd.lower
+		upper[i] = prev_bnd.upper
+		if name not in name_idx:
+			name_idx[name] = len(names)
+			names.append(name)
+		name_ids[i] = name_idx[name]
+	return (qn_offsets, qn_ids, qe_offsets, qe_ids, lower, upper, name_ids), names
+
+
+def _rule_trace_segments(folder, component_type):
+	if folder == '':
+		return []
+	return sorted(os.path.join(folder, segment) for segment in os.listdir(folder) if segment.startswith(f'{component_type}-'))
+
+
+def _iter_rule_trace_columns(rule_trace, folder, component_type):
+	# The segments on disk come first, in the order they were spilled, then the rows in memory
+	tail = _rule_trace_to_columns(rule_trace)
+	for segment in _rule_trace_segments(folder, component_type):
+		columns = {name: np.load(os.path.join(segment, f'{name}.npy'), mmap_mode='r') for name in rule_trace_column_names}
+		columns.update((name, tail[name]) for name in ('components', 'labels', 'origins'))
+		yield columns
+	yield tail
+
+
+def _iter_rule_trace_atoms(rule_trace_atoms, folder, component_type):
+	# One chunk of resolved rows per chunk of _iter_rule_trace_columns. A segment spilled while atom_trace was off has no rows
+	_, ((node_blocks, _), (edge_blocks, _)) = rule_trace_atoms
+	for segment in _rule_trace_segments(folder, component_type):
+		if not os.path.exists(os.path.join(segment, 'atom_names.npy')):
+			yield []
+			continue
+		qn_offsets, qn_ids, qe_offsets, qe_ids, lower, upper, name_ids = (np.load(os.path.join(segment, f'{name}.npy')) for name in rule_trace_atoms_column_names)
+		names = [str(name) for name in np.load(os.path.join(segment, 'atom_names.npy'))]
+		node_lists, edge_lists = {}, {}
+		rows = []
+		for i in range(len(lower)):
+			qn = qn_ids[qn_offsets[i]:qn_offsets[i + 1]].tolist()
+			qe = qe_ids[qe_offsets[i]:qe_offsets[i + 1]].tolist()
+			for j in qn:
+				if j not in node_lists:
+					node_lists[j] = list(node_blocks[j])
+			for j in qe:
+				if j not in edge_lists:
+					edge_lists[j] = list(edge_blocks[j])
+			rows.append(([node_lists[j] for j in qn], [edge_lists[j] for j in qe], interval.closed(lower[i], upper[i]), names[name_ids[i]]))
+		yield rows
+	yield _resolve_rule_trace_atoms(rule_trace_atoms)
+
+
+def _rule_trace_atoms_num_clauses(rule_trace_atoms, folder, component_type):
+	# The most clauses of any row, read from the offsets of the segments without resolving them
+	num_clauses = max((len(qn_ids) for qn_ids, _, _, _ in rule_trace_atoms[0]), default=0)
+	for segment in _rule_trace_segments(folder, component_type):
+		path = os.path.join(segment, 'qn_offsets.npy')
+		if os.path.exists(path):
+			qn_offsets = np.load(path, mmap_mode='r')
+			num_clauses = max(num_clauses, int(np.diff(qn_offsets).max(initial=0)))
+	return num_clauses
+
+
+def _to_object_array(values):
+	# Fill element by element so that tuples (edges) are not turned into a 2d array
+	array = np.empty(len(values), dtype=object)
+	for i, v in enumerate(values):
+		array[i] = v
+	return array
+
+
+@numba.njit(cache=True)
+def _record_delta(delta, comp, l):
+	# Keep track of the atoms that changed since the last grounding pass, grouped by label
+	if l in delta:
+		delta[l].append(comp)
+	else:
+		delta[l] = numba.typed.List([comp])
+
+
+@numba.njit(cache=True)
+def _schedule_by_time(queue, queue_by_t, start, t):
+	# Group the positions (from start onwards) of the facts/rules that still have to be applied (at t or later) by timestep
+	for i in range(start, len(queue)):
+		queue_t = int(queue[i][0])
+		if queue_t >= t:
+			if queue_t in queue_by_t:
+				queue_by_t[queue_t].append(i)
+			else:
+				queue_by_t[queue_t] = numba.typed.List([i])
+
+
+@numba.njit(cache=True)
+def _get_due_facts(facts_by_t, standing, t):
+	# Merge the facts scheduled for t with the standing static facts, keeping the order in which they were added
+	due = numba.typed.List.empty_list(numba.types.int64)
+	if t not in facts_by_t:
+		due.extend(standing)
+		return due
+	scheduled = facts_by_t.pop(t)
+	i, j = 0, 0
+	while i < len(scheduled) or j < len(standing):
+		if j == len(standing) or (i < len(scheduled) and scheduled[i] < standing[j]):
+			due.append(scheduled[i])
+			i += 1
+		else:
+			due.append(standing[j])
+			j += 1
+	return due
+
+
+@numba.njit(cache=True)
+def _remove_applied_facts(facts, facts_trace, t_start, t, atom_trace):
+	# Facts between t_start and t have been applied. Static ones are kept and scheduled for t
+	facts_new = facts.copy()
+	facts_new.clear()
+	facts_trace_new = facts_trace.copy()
+	facts_trace_new.clear()
+	for i in range(len(facts)):
+		fact = facts[i]
+		applied = t_start <= fact[0] < t
+		if applied and fact[4]:
+			facts_new.append((numba.types.uint16(t), fact[1], fact[2], fact[3], fact[4], fact[5]))
+		elif not applied:
+			facts_new.append(fact)
+		else:
+			continue
+		if atom_trace:
+			facts_trace_new.append(facts_trace[i])
+	facts[:] = facts_new
+	if atom_trace:
+		facts_trace[:] = facts_trace_new
+
+
+@numba.njit(cache=True)
+def _remove_applied_rules(rules, rules_trace, edges_to_be_added, rules_by_t, t_start, t, atom_trace):
+	# Rules between t_start and t have been applied. Remove them in place and reschedule the rest, whose positions have moved
+	keep = numba.typed.List.empty_list(numba.types.boolean)
+	for r in rules:
+		keep.append(not (t_start <= r[0] < t))
+	_compact(rules, keep)
+	_compact(edges_to_be_added, keep)
+	if atom_trace:
+		_compact(rules_trace, keep)
+	rules_by_t.clear()
+	_schedule_by_time(rules, rules_by_t, 0, t)
+
+
+@numba.njit(cache=True)
+def _compact(queue, keep):
+	j = 0
+	for i in range(len(queue)):
+		if i >= len(keep) or keep[i]:
+			queue[j] = queue[i]
+			j += 1
+	while len(queue) > j:
+		queue.pop()
+
+
+@numba.njit(cache=True)
+def _group_updates_by_component(rules_to_be_applied, due, num_ranges):
+	# Order the updates (positions in due) by the component they update, keeping their order within each component. The order
+	# is then cut into num_ranges contiguous ranges of about the same number of updates, without splitting a component.
+	# Returns the order, the bounds of the ranges in it, and the range of every update
+	n = len(due)
+	group_of = np.empty(n, dtype=np.int64)
+	group_idx = dict()
+	num_groups = 0
+	for k in range(n):
+		comp = rules_to_be_applied[due[k]][1]
+		if comp not in group_idx:
+			group_idx[comp] = num_groups
+			num_groups += 1
+		group_of[k] = group_idx[comp]
+	order = np.argsort(group_of, kind='mergesort')
+
+	num_ranges = min(num_ranges, num_groups)
+	if num_ranges < 1:
+		num_ranges = 1
+	ranges = np.empty(num_ranges + 1, dtype=np.int64)
+	ranges[0] = 0
+	for r in range(1, num_ranges):
+		b = n * r // num_ranges
+		if b < ranges[r-1]:
+			b = ranges[r-1]
+		while b > 0 and b < n and group_of[order[b]] == group_of[order[b-1]]:
+			b += 1
+		ranges[r] = b
+	ranges[num_ranges] = n
+
+	range_of = np.empty(n, dtype=np.int64)
+	for r in range(num_ranges):
+		for j in range(ranges[r], ranges[r+1]):
+			range_of[order[j]] = r
+	return order, ranges, range_of
+
+
+@numba.njit(cache=True)
+def _adds_edges(edges_to_be_added, due):
+	for idx in due:
+		if len(edges_to_be_added[idx][0]) > 0 or edges_to_be_added[idx][2].value != '':
+			return True
+	return False
+
+
+@numba.njit(cache=True)
+def _merge_delta(dirty, delta):
+	for l in delta:
+		for comp in delta[l]:
+			_record_delta(dirty, comp, l)
+
+
+@numba.njit(cache=True)
+def _reset_interpretations(interpretations, dirty):
+	# Reset the non-static atoms that changed since the last reset. A reset moves the bound into prev, so atoms that were not
+	# at [0,1] have to be reset once more next timestep (if they don't change again) to end up the same as a full reset
+	reset_again = dirty.copy()
+	reset_again.clear()
+	for l in dirty:
+		for comp in set(dirty[l]):
+			w = interpretations[comp].world
+			if l in w and not w[l].is_static():
+				if w[l].lower != 0 or w[l].upper != 1:
+					_record_delta(reset_again, comp, l)
+				w[l].reset()
+	return reset_again
+
+
+@numba.njit(cache=True)
+def _init_rule_dependency_index(rules, rules_by_label_node, rules_by_label_edge):
+	# Map each node/edge label to the indices of the rules that have it in their body
+	# Comparison clauses are indexed by their attribute, the numeric labels of the attribute are mapped to it when looking up
+	for i in range(len(rules)):
+		for clause in rules[i].get_clauses():
+			clause_type = _get_grounding_type(clause)
+			if clause_type == 'node':
+				rules_by_label = rules_by_label_node
+			elif clause_type == 'edge':
+				rules_by_label = rules_by_label_edge
+			else:
+				continue
+			if clause[1] not in rules_by_label:
+				rules_by_label[clause[1]] = numba.typed.List([numba.types.int64(i)])
+			elif rules_by_label[clause[1]][-1] != i:
+				rules_by_label[clause[1]].append(numba.types.int64(i))
+
+
+@numba.njit(cache=True)
+def _get_affected_rules(rules_by_label_node, rules_by_label_edge, delta_node, delta_edge):
+	# A rule can only produce new groundings if one of its body predicates has changed since it was last grounded
+	affected_rules = set(numba.typed.List.empty_list(numba.types.int64))
+	for l in delta_node:
+		_add_affected_rules(rules_by_label_node, l, affected_rules)
+	for l in delta_edge:
+		_add_affected_rules(rules_by_label_edge, l, affected_rules)
+
+	# Keep the rules in their original order so that the results are merged deterministically
+	rules_idx = numba.typed.List.empty_list(numba.types.int64)
+	for i in affected_rules:
+		rules_idx.append(i)
+	rules_idx.sort()
+	return rules_idx
+
+
+@numba.njit(cache=True)
+def _add_affected_rules(rules_by_label, l, affected_rules):
+	if l in rules_by_label:
+		for i in rules_by_label[l]:
+			affected_rules.add(i)
+	# A numeric label also affects the comparison clauses on its attribute
+	attribute, _, is_numeric = _parse_numeric_label(l.get_value())
+	if is_numeric:
+		attribute_label = label.Label(attribute)
+		if attribute_label in rules_by_label:
+			for i in rules_by_label[attribute_label]:
+				affected_rules.add(i)
+
+
+@numba.njit(cache=True)
+def _estimate_head_groundings(rule, predicate_map_node, predicate_map_edge, num_nodes, num_edges):
+	# Estimated number of head groundings of a rule, from the label cardinalities of the clauses that bind its head variables.
+	# Head variables that no clause binds are ground atoms
+	avg_degree = num_edges / num_nodes if num_nodes > 0 else 0.0
+	variable_sizes = numba.typed.Dict.empty(key_type=numba.types.string, value_type=numba.types.float64)
+	for clause in rule.get_clauses():
+		if clause[0] == 'comparison':
+			continue
+		cost = _estimate_clause_cost(clause, variable_sizes, predicate_map_node, predicate_map_edge, avg_degree)
+		for v in clause[2]:
+			if v not in variable_sizes or cost < variable_sizes[v]:
+				variable_sizes[v] = cost
+
+	head_variables = rule.get_head_variables()
+	size_1 = variable_sizes[head_variables[0]] if head_variables[0] in variable_sizes else 1.0
+	if rule.get_type() == 'node':
+		return numba.types.int64(size_1)
+	size_2 = variable_sizes[head_variables[1]] if head_variables[1] in variable_sizes else 1.0
+	source, target, _ = rule.get_edges()
+	if source != '' and target != '':
+		return numba.types.int64(size_1 * size_2)
+	# Without inferring edges only the pairs that are edges of the graph are head groundings
+	return numba.types.int64(min(size_1 * size_2, float(num_edges)))
+
+
+@numba.njit(cache=True)
+def _plan_grounding_work(rules_to_ground, rule_costs, num_threads):
+	# Each thread should get about the same number of head groundings. Rules that are cheaper than that are grounded whole (in
+	# parallel with the other rules), heavier ones have their head groundings split into chunks that are grounded in parallel.
+	# The body of a split rule is grounded once for all its chunks, the rules are returned in the order of their bodies
+	total_cost = 0
+	for r in rules_to_ground:
+		total_cost += rule_costs[r]
+	share = max(total_cost // num_threads, min_grounding_chunk)
+
+	grounding_work = numba.typed.List.empty_list(grounding_work_type)
+	split_rules = numba.typed.List.empty_list(numba.types.int64)
+	for r in rules_to_ground:
+		num_chunks = 1
+		body_idx = -1
+		if num_threads > 1 and rule_costs[r] > share:
+			num_chunks = min(num_threads, (rule_costs[r] + share - 1) // share)
+			body_idx = len(split_rules)
+			split_rules.append(r)
+		for chunk in range(num_chunks):
+			grounding_work.append((numba.types.int64(r), numba.types.int64(chunk), numba.types.int64(num_chunks), numba.types.int64(body_idx)))
+	return grounding_work, split_rules
+
+
+@numba.njit(cache=True)
+def _new_rule_body():
+	groundings = numba.typed.Dict.empty(key_type=numba.types.string, value_type=list_of_nodes)
+	groundings_edges = numba.typed.Dict.empty(key_type=edge_type, value_type=list_of_edges)
+	dependency_graph_neighbors = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_nodes)
+	dependency_graph_reverse_neighbors = numba.typed.Dict.empty(key_type=node_type, value_type=list_of_nodes)
+	valid_edge_groundings = numba.typed.List.empty_list(edge_type)
+	edge_groundings_by_head = numba.typed.Dict.empty(key_type=edge_type, value_type=edges_by_node_type)
+	return False, groundings, groundings_edges, dependency_graph_neighbors, dependency_graph_reverse_neighbors, valid_edge_groundings, edge_groundings_by_head, (False, False, False)
+
+
+@numba.njit(cache=True)
+def _get_chunk_bounds(n, chunk, num_chunks):
+	return n * chunk // num_chunks, n * (chunk + 1) // num_chunks
 
 
 @numba.njit(cache=True)
@@ -1745,15 +3099,59 @@ def is_satisfied_edge_comparison(interpretations, comp, na):
 
 @numba.njit(cache=True)
 def annotate(annotation_functions, rule, annotations, weights):
-	func_name = rule.get_annotation_function()
-	if func_name == '':
+	# The annotation function is resolved to its index in annotation_functions before reasoning
+	func_id = rule.get_annotation_function_id()
+	if func_id < 0:
 		return rule.get_bnd().lower, rule.get_bnd().upper
 	else:
-		with numba.objmode(annotation='Tuple((float64, float64))'):
-			for func in annotation_functions:
-				if func.__name__ == func_name:
-					annotation = func(annotations, weights)
-		return annotation
+		return _call_annotation_function(annotation_functions, func_id, annotations, weights)
+
+
+def _call_annotation_function(annotation_functions, func_id, annotations, weights):
+	# Python implementation, the jitted version is dispatched natively below
+	return _get_annotation_bounds(annotation_functions[func_id](annotations, weights))
+
+
+@overload(_call_annotation_function)
+def _call_annotation_function_impl(annotation_functions, func_id, annotations, weights):
+	# Nothing to dispatch if no annotation functions were added (an empty tuple cannot be unrolled)
+	if len(annotation_functions) == 0:
+		def impl(annotation_functions, func_id, annotations, weights):
+			return 0.0, 1.0
+	else:
+		def impl(annotation_functions, func_id, annotations, weights):
+			return _dispatch_annotation_function(annotation_functions, func_id, annotations, weights)
+	return impl
+
+
+@numba.njit(cache=True)
+def _dispatch_annotation_function(annotation_functions, func_id, annotations, weights):
+	# Unroll the tuple of annotation functions and call the one with the matching index in nopython mode
+	annotation = (0.0, 1.0)
+	i = 0
+	for func in literal_unroll(annotation_functions):
+		if i == func_id:
+			annotation = _get_annotation_bounds(func(annotations, weights))
+		i += 1
+	return annotation
+
+
+def _get_annotation_bounds(annotation):
+	# Annotation functions can return either an interval or a (lower, upper) tuple
+	if hasattr(annotation, 'lower'):
+		return float(annotation.lower), float(annotation.upper)
+	return float(annotation[0]), float(annotation[1])
+
+
+@overload(_get_annotation_bounds)
+def _get_annotation_bounds_impl(annotation):
+	if isinstance(annotation, interval.IntervalType):
+		def impl(annotation):
+			return numba.float64(annotation.lower), numba.float64(annotation.upper)
+	else:
+		def impl(annotation):
+			return numba.float64(annotation[0]), numba.float64(annotation[1])
+	return impl
 
 
 @numba.njit(cache=True)
@@ -1783,72 +3181,86 @@ def check_consistent_edge(interpretations, comp, na):
 
 
 @numba.njit(cache=True)
-def resolve_inconsistency_node(interpretations, comp, na, ipl, t_cnt, fp_cnt, idx, atom_trace, rule_trace, rule_trace_atoms, rules_to_be_applied_trace, facts_to_be_applied_trace, store_interpretation_changes, mode):
+def resolve_inconsistency_node(interpretations, comp, na, ipl, t_cnt, fp_cnt, idx, atom_trace, rule_trace, rule_trace_atoms, rules_to_be_applied_trace, facts_to_be_applied_trace, store_interpretation_changes, mode, delta=None):
 	world = interpretations[comp]
 	if store_interpretation_changes:
-		rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, na[0], interval.closed(0,1)))
 		if mode == 'fact' or mode == 'graph-attribute-fact' and atom_trace:
 			name = facts_to_be_applied_trace[idx]
 		elif mode == 'rule' and atom_trace:
 			name = rules_to_be_applied_trace[idx][2]
 		else:
 			name = '-'
+		origin = f'Inconsistency due to {name}' if atom_trace else ''
+		_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, na[0], interval.closed(0,1), origin)
 		if atom_trace:
 			_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[na[0]], f'Inconsistency due to {name}')
 	# Resolve inconsistency and set static
 	world.world[na[0]].set_lower_upper(0, 1)
 	world.world[na[0]].set_static(True)
+	if delta is not None:
+		_record_delta(delta, comp, na[0])
 	for p1, p2 in ipl:
 		if p1==na[0]:
 			if atom_trace:
 				_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p2], f'Inconsistency due to {name}')
 			world.world[p2].set_lower_upper(0, 1)
 			world.world[p2].set_static(True)
+			if delta is not None:
+				_record_delta(delta, comp, p2)
 			if store_interpretation_changes:
-				rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, interval.closed(0,1)))
+				_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, interval.closed(0,1), origin)
 
 		if p2==na[0]:
 			if atom_trace:
 				_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), world.world[p1], f'Inconsistency due to {name}')
 			world.world[p1].set_lower_upper(0, 1)
 			world.world[p1].set_static(True)
+			if delta is not None:
+				_record_delta(delta, comp, p1)
 			if store_interpretation_changes:
-				rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, interval.closed(0,1)))
+				_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, interval.closed(0,1), origin)
 	# Add inconsistent predicates to a list
 
 
 @numba.njit(cache=True)
-def resolve_inconsistency_edge(interpretations, comp, na, ipl, t_cnt, fp_cnt, idx, atom_trace, rule_trace, rule_trace_atoms, rules_to_be_applied_trace, facts_to_be_applied_trace, store_interpretation_changes, mode):
+def resolve_inconsistency_edge(interpretations, comp, na, ipl, t_cnt, fp_cnt, idx, atom_trace, rule_trace, rule_trace_atoms, rules_to_be_applied_trace, facts_to_be_applied_trace, store_interpretation_changes, mode, delta=None):
 	w = interpretations[comp]
 	if store_interpretation_changes:
-		rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, na[0], interval.closed(0,1)))
 		if mode == 'fact' or mode == 'graph-attribute-fact' and atom_trace:
 			name = facts_to_be_applied_trace[idx]
 		elif mode == 'rule' and atom_trace:
 			name = rules_to_be_applied_trace[idx][2]
 		else:
 			name = '-'
+		origin = f'Inconsistency due to {name}' if atom_trace else ''
+		_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, na[0], interval.closed(0,1), origin)
 		if atom_trace:
 			_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), w.world[na[0]], f'Inconsistency due to {name}')
 	# Resolve inconsistency and set static
 	w.world[na[0]].set_lower_upper(0, 1)
 	w.world[na[0]].set_static(True)
+	if delta is not None:
+		_record_delta(delta, comp, na[0])
 	for p1, p2 in ipl:
 		if p1==na[0]:
 			if atom_trace:
 				_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), w.world[p2], f'Inconsistency due to {name}')
 			w.world[p2].set_lower_upper(0, 1)
 			w.world[p2].set_static(True)
+			if delta is not None:
+				_record_delta(delta, comp, p2)
 			if store_interpretation_changes:
-				rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, interval.closed(0,1)))
+				_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p2, interval.closed(0,1), origin)
 
 		if p2==na[0]:
 			if atom_trace:
 				_update_rule_trace(rule_trace_atoms, numba.typed.List.empty_list(numba.typed.List.empty_list(node_type)), numba.typed.List.empty_list(numba.typed.List.empty_list(edge_type)), w.world[p1], f'Inconsistency due to {name}')
 			w.world[p1].set_lower_upper(0, 1)
 			w.world[p1].set_static(True)
+			if delta is not None:
+				_record_delta(delta, comp, p1)
 			if store_interpretation_changes:
-				rule_trace.append((numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, interval.closed(0,1)))
+				_append_rule_trace(rule_trace, numba.types.uint16(t_cnt), numba.types.uint16(fp_cnt), comp, p1, interval.closed(0,1), origin)
 
 
 @numba.njit(cache=True)
@@ -1862,10 +3274,10 @@ def _add_node(node, neighbors, reverse_neighbors, nodes, interpretations_node):
 @numba.njit(cache=True)
 def _add_edge(source, target, neighbors, reverse_neighbors, nodes, edges, l, interpretations_node, interpretations_edge, predicate_map, num_ga, t):
 	# If not a node, add to list of nodes and initialize neighbors
-	if source not in nodes:
+	if source not in interpretations_node:
 		_add_node(source, neighbors, reverse_neighbors, nodes, interpretations_node)
 
-	if target not in nodes:
+	if target not in interpretations_node:
 		_add_node(target, neighbors, reverse_neighbors, nodes, interpretations_node)
 
 	# Make sure edge doesn't already exist
@@ -1873,7 +3285,7 @@ def _add_edge(source, target, neighbors, reverse_neighbors, nodes, edges, l, int
 	# Make sure, if edge exists, that we don't override the l label if it exists
 	edge = (source, target)
 	new_edge = False
-	if edge not in edges:
+	if edge not in interpretations_edge:
 		new_edge = True
 		edges.append(edge)
 		neighbors[source].append(target)
@@ -1956,6 +3368,11 @@ def float_to_str(value):
 
 @numba.njit(cache=True)
 def str_to_float(value):
+	e = max(value.find('e'), value.find('E'))
+	exponent = 0
+	if e != -1:
+		exponent = str_to_int(value[e+1:])
+		value = value[:e]
 	decimal_pos = value.find('.')
 	if decimal_pos != -1:
 		after_decimal_len = len(value[decimal_pos+1:])
@@ -1964,6 +3381,8 @@ def str_to_float(value):
 	value = value.replace('.', '')
 	value = str_to_int(value)
 	value = value / 10**after_decimal_len
+	if exponent != 0:
+		value = value * 10.0**exponent
 	return value
 
 
@@ -0,0 +1,134 @@
+import bisect
+import numpy as np
+
+
+class RuleTraceIndex:
+    """
+    The changes of a rule trace sorted by (component, label) and then by time. Interpretations at past timesteps are looked up
+    here instead of keeping a copy of every timestep. With persistent reasoning a bound holds until the next change, otherwise
+    only at the timestep it was set. Static bounds hold from the timestep they were set on in both cases. The static atoms that
+    are not in the rule trace (graph attributes, unless they are saved to it) are seeded with their bound from timestep 0, they
+    are answered by `get` and `get_many` but are not listed by `changed` and `get_component`
+    """
+    def __init__(self, chunks, persistent, static=None):
+        """
+        :param chunks: Chunks of the rule trace columns, see Interpretation.iter_rule_trace_columns
+        :param persistent: Whether the reasoning was persistent
+        :param static: (components, labels, lowers, uppers) of the atoms that are static at the end of the reasoning
+        """
+        self.persistent = persistent
+        times, component_ids, label_ids, lowers, uppers = [], [], [], [], []
+        components, labels = np.empty(0, dtype=object), np.empty(0, dtype=object)
+        for columns in chunks:
+            times.append(np.asarray(columns['time'], dtype=np.int64))
+            component_ids.append(np.asarray(columns['component'], dtype=np.int64))
+            label_ids.append(np.asarray(columns['label'], dtype=np.int64))
+            lowers.append(np.asarray(columns['lower'], dtype=np.float64))
+            uppers.append(np.asarray(columns['upper'], dtype=np.float64))
+            # Every chunk refers to the same tables, the last one has all of them
+            components, labels = columns['components'], columns['labels']
+        time, component_id, label_id = np.concatenate(times), np.concatenate(component_ids), np.concatenate(label_ids)
+        lower, upper = np.concatenate(lowers), np.concatenate(uppers)
+
+        # Changes at the same time keep the order they were made in, so the last one of a timestep is the latest
+        n = len(time)
+        order = np.lexsort((np.arange(n), time, label_id, component_id))
+        time, component_id, label_id = time[order], component_id[order], label_id[order]
+        new_group = np.ones(n, dtype=np.bool_)
+        new_group[1:] = (component_id[1:] != component_id[:-1]) | (label_id[1:] != label_id[:-1])
+        starts = np.flatnonzero(new_group)
+        self.group_start = np.append(starts, n)
+        self.keys = [(components[c], labels[l]) for c, l in zip(component_id[starts].tolist(), label_id[starts].tolist())]
+        self.groups = {key: g for g, key in enumerate(self.keys)}
+        self.component_groups = {}
+        for g, (component, _) in enumerate(self.keys):
+            self.component_groups.setdefault(component, []).append(g)
+        self.num_traced = len(self.keys)
+        lower, upper = lower[order], upper[order]
+
+        # Static atoms are added after the traced ones as groups with a single change at timestep 0
+        static_group = np.zeros(len(self.keys), dtype=np.bool_)
+        if static is not None:
+            seeds = []
+            for key in zip(*static[:2]):
+                g = self.groups.get(key)
+                if g is None:
+                    self.groups[key] = len(self.keys)
+                    self.keys.append(key)
+                    g = -1
+                seeds.append(g)
+            seeds = np.array(seeds, dtype=np.int64)
+            static_group[seeds[seeds >= 0]] = True
+            new = np.flatnonzero(seeds < 0)
+            static_group = np.append(static_group, np.ones(len(new), dtype=np.bool_))
+            time = np.append(time, np.zeros(len(new), dtype=np.int64))
+            lower = np.append(lower, np.asarray(static[2], dtype=np.float64)[new])
+            upper = np.append(upper, np.asarray(static[3], dtype=np.float64)[new])
+            self.group_start = np.append(self.group_start, n + np.arange(1, len(new) + 1))
+            n += len(new)
+        self.static_group = static_group
+
+        self.time = time
+        self.lower = lower
+        self.upper = upper
+        self._time = time.tolist()
+        self._lower = self.lower.tolist()
+        self._upper = self.upper.tolist()
+        # (group, time) as one sorted key, to look many groups up with a single searchsorted
+        self._span = int(time.max()) + 2 if n else 1
+        self._group_time = np.repeat(np.arange(len(self.keys), dtype=np.int64), np.diff(self.group_start)) * self._span + time
+
+    def get(self, component, label, t):
+        """
+        Bound of `label` on `component` at timestep `t`, None if the rule trace has none
+        """
+        g = self.groups.get((component, label))
+        if g is None:
+            return None
+        lo, hi = self.group_start[g], self.group_start[g + 1]
+        i = bisect.bisect_right(self._time, t, lo, hi) - 1
+        if i < lo or (not self.persistent and not self.static_group[g] and self._time[i] != t):
+            return None
+        return self._lower[i], self._upper[i]
+
+    def group_ids(self, components, labels):
+        """
+        Group id of every (component, label) pair, -1 for the ones that never changed
+        """
+        return np.fromiter((self.groups.get(key, -1) for key in zip(components, labels)), dtype=np.int64, count=len(components))
+
+    def get_many(self, groups, t):
+        """
+        Vectorized `get` for an array of group ids (-1 for a (component, label) that never changed)
+        :return: found mask, lower bounds, upper bounds
+        """
+        groups = np.asarray(groups, dtype=np.int64)
+        if len(self.keys) == 0:
+            return np.zeros(len(groups), dtype=np.bool_), np.full(len(groups), np.nan), np.full(len(groups), np.nan)
+        known = groups >= 0
+        g = np.where(known, groups, 0)
+        # Last change of the group at or before t, it belongs to an earlier group if there is none
+        i = np.searchsorted(self._group_time, g * self._span + min(t, self._span - 1), side='right') - 1
+        found = known & (i >= self.group_start[g])
+        i = np.where(found, i, 0)
+        if not self.persistent:
+            found &= (self.time[i] == t) | self.static_group[g]
+        return found, np.where(found, self.lower[i], np.nan), np.where(found, self.upper[i], np.nan)
+
+    def get_component(self, component, t):
+        """
+        Yields (label, bound) for every label of `component` with a bound at timestep `t`
+        """
+        groups = self.component_groups.get(component, [])
+        found, lower, upper = self.get_many(groups, t)
+        for i in np.flatnonzero(found).tolist():
+            yield self.keys[groups[i]][1], (float(lower[i]), float(upper[i]))
+
+    def changed(self, t):
+        """
+        Yields (component, label, bound) for every label with a bound at timestep `t`
+        """
+        found, lower, upper = self.get_many(np.arange(self.num_traced), t)
+        for g in np.flatnonzero(found).tolist():
+            component, label = self.keys[g]
+            yield component, label, (float(lower[g]), float(upper[g]))
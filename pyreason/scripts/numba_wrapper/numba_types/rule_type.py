@@ -55,6 +55,7 @@ class RuleModel(models.StructModel):
             ('weights', types.float64[::1]),
             ('edges', types.Tuple((types.string, types.string, label.label_type))),
             ('static', types.boolean),
+            ('ann_fn_id', types.int64),
             ]
         models.StructModel.__init__(self, dmm, fe_type, members)
 
@@ -72,6 +73,7 @@ make_attribute_wrapper(RuleType, 'ann_fn', 'ann_fn')
 make_attribute_wrapper(RuleType, 'weights', 'weights')
 make_attribute_wrapper(RuleType, 'edges', 'edges')
 make_attribute_wrapper(RuleType, 'static', 'static')
+make_attribute_wrapper(RuleType, 'ann_fn_id', 'ann_fn_id')
 
 
 # Implement constructor
@@ -169,6 +171,13 @@ def get_annotation_function(rule):
     return impl
 
 
+@overload_method(RuleType, "get_annotation_function_id")
+def get_annotation_function_id(rule):
+    def impl(rule):
+        return rule.ann_fn_id
+    return impl
+
+
 @overload_method(RuleType, "get_weights")
 def get_weights(rule):
     def impl(rule):
@@ -205,6 +214,7 @@ def unbox_rule(typ, obj, c):
     weights_obj = c.pyapi.object_getattr_string(obj, "_weights")
     edges_obj = c.pyapi.object_getattr_string(obj, "_edges")
     static_obj = c.pyapi.object_getattr_string(obj, "_static")
+    ann_fn_id_obj = c.pyapi.object_getattr_string(obj, "_ann_fn_id")
     rule = cgutils.create_struct_proxy(typ)(c.context, c.builder)
     rule.rule_name = c.unbox(types.string, name_obj).value
     rule.type = c.unbox(types.string, type_obj).value
@@ -218,6 +228,7 @@ def unbox_rule(typ, obj, c):
     rule.weights = c.unbox(types.float64[::1], weights_obj).value
     rule.edges = c.unbox(types.Tuple((types.string, types.string, label.label_type)), edges_obj).value
     rule.static = c.unbox(types.boolean, static_obj).value
+    rule.ann_fn_id = c.unbox(types.int64, ann_fn_id_obj).value
     c.pyapi.decref(name_obj)
     c.pyapi.decref(type_obj)
     c.pyapi.decref(target_obj)
@@ -230,6 +241,7 @@ def unbox_rule(typ, obj, c):
     c.pyapi.decref(weights_obj)
     c.pyapi.decref(edges_obj)
     c.pyapi.decref(static_obj)
+    c.pyapi.decref(ann_fn_id_obj)
     is_error = cgutils.is_not_null(c.builder, c.pyapi.err_occurred())
     return NativeValue(rule._getvalue(), is_error=is_error)
 
@@ -250,7 +262,8 @@ def box_rule(typ, val, c):
     weights_obj = c.box(types.float64[::1], rule.weights)
     edges_obj = c.box(types.Tuple((types.string, types.string, label.label_type)), rule.edges)
     static_obj = c.box(types.boolean, rule.static)
-    res = c.pyapi.call_function_objargs(class_obj, (name_obj, type_obj, target_obj, head_variables_obj, delta_obj, clauses_obj, bnd_obj, thresholds_obj, ann_fn_obj, weights_obj, edges_obj, static_obj))
+    ann_fn_id_obj = c.box(types.int64, rule.ann_fn_id)
+    res = c.pyapi.call_function_objargs(class_obj, (name_obj, type_obj, target_obj, head_variables_obj, delta_obj, clauses_obj, bnd_obj, thresholds_obj, ann_fn_obj, weights_obj, edges_obj, static_obj, ann_fn_id_obj))
     c.pyapi.decref(name_obj)
     c.pyapi.decref(type_obj)
     c.pyapi.decref(target_obj)
@@ -263,5 +276,6 @@ def box_rule(typ, val, c):
     c.pyapi.decref(weights_obj)
     c.pyapi.decref(edges_obj)
     c.pyapi.decref(static_obj)
+    c.pyapi.decref(ann_fn_id_obj)
     c.pyapi.decref(class_obj)
     return res
@@ -101,10 +101,16 @@ def is_satisfied(world, label, interval):
 
 @overload_method(WorldType, 'update')
 def update(w, label, interval):
-    def impl(w, label, interval):       
+    def impl(w, label, interval):
+        # Intersect in place instead of allocating a new Interval for every update
         current_bnd = w.world[label]
-        new_bnd = current_bnd.intersection(interval)
-        w.world[label] = new_bnd
+        lower = max(current_bnd.lower, interval.lower)
+        upper = min(current_bnd.upper, interval.upper)
+        if lower > upper:
+            lower = 0.0
+            upper = 1.0
+        current_bnd.set_lower_upper(lower, upper)
+        current_bnd.set_static(False)
     return impl
 
 @overload_method(WorldType, 'get_bound')
@@ -6,6 +6,8 @@ from pyreason.scripts.interpretation.interpretation_fp import Interpretation as
 class Program:
 	specific_node_labels = []
 	specific_edge_labels = []
+	rule_trace_spill_threshold = 0
+	rule_trace_spill_folder = None
 
 	def __init__(self, graph, facts_node, facts_edge, rules, ipl, annotation_functions, reverse_graph, atom_trace, save_graph_attributes_to_rule_trace, canonical, inconsistency_check, store_interpretation_changes, parallel_computing, update_mode, allow_ground_rules, fp_version):
 		self._graph = graph
@@ -32,13 +34,14 @@ class Program:
 		Interpretation.specific_node_labels = self.specific_node_labels
 		Interpretation.specific_edge_labels = self.specific_edge_labels
 
-		# Instantiate correct interpretation class based on whether we parallelize the code or not. (We cannot parallelize with cache on)
+		# Instantiate correct interpretation class based on whether we parallelize the code or not. (Both are cached separately)
 		if self._parallel_computing:
 			self.interp = InterpretationParallel(self._graph, self._ipl, self._annotation_functions, self._reverse_graph, self._atom_trace, self._save_graph_attributes_to_rule_trace, self._canonical, self._inconsistency_check, self._store_interpretation_changes, self._update_mode, self._allow_ground_rules)
 		elif self._fp_version:
 			self.interp = InterpretationFP(self._graph, self._ipl, self._annotation_functions, self._reverse_graph, self._atom_trace, self._save_graph_attributes_to_rule_trace, self._canonical, self._inconsistency_check, self._store_interpretation_changes, self._update_mode, self._allow_ground_rules)
 		else:
 			self.interp = Interpretation(self._graph, self._ipl, self._annotation_functions, self._reverse_graph, self._atom_trace, self._save_graph_attributes_to_rule_trace, self._canonical, self._inconsistency_check, self._store_interpretation_changes, self._update_mode, self._allow_ground_rules)
+		self.interp.set_rule_trace_spill(self.rule_trace_spill_threshold, self.rule_trace_spill_folder)
 		self.interp.start_fp(self._tmax, self._facts_node, self._facts_edge, self._rules, verbose, convergence_threshold, convergence_bound_threshold)
 
 		return self.interp
@@ -1,6 +1,6 @@
 class Rule:
 
-    def __init__(self, rule_name, rule_type, target, head_variables, delta, clauses, bnd, thresholds, ann_fn, weights, edges, static):
+    def __init__(self, rule_name, rule_type, target, head_variables, delta, clauses, bnd, thresholds, ann_fn, weights, edges, static, ann_fn_id=-1):
         self._rule_name = rule_name
         self._type = rule_type
         self._target = target
@@ -13,6 +13,8 @@ class Rule:
         self._weights = weights
         self._edges = edges
         self._static = static
+        # Index of the annotation function in the tuple of annotation functions passed to the interpretation, -1 if unresolved
+        self._ann_fn_id = ann_fn_id
 
     def get_rule_name(self):
         return self._rule_name
@@ -49,6 +51,12 @@ class Rule:
 
     def get_annotation_function(self):
         return self._ann_fn
+
+    def get_annotation_function_id(self):
+        return self._ann_fn_id
+
+    def set_annotation_function_id(self, ann_fn_id):
+        self._ann_fn_id = ann_fn_id
     
     def get_edges(self):
         return self._edges
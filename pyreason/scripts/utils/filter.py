@@ -1,117 +1,113 @@
+import weakref
+import numpy as np
 import pandas as pd
 
 
 class Filter:
+    # Latest bound of every (t, component, label) in the rule trace, built once per interpretation and component type. It is
+    # built again when the interpretation has reasoned since
+    _latest_bounds = weakref.WeakKeyDictionary()
+
     def __init__(self, tmax):
         self.tmax = tmax
 
     def filter_and_sort_nodes(self, interpretation, labels, bound, sort_by='lower', descending=True):
         # Make use of rule trace in interpretation object to efficiently filter through data.
-        
-        # Initialize nested dict
-        df = {}
-        nodes = []
-        latest_changes = {}
-        for t in range(self.tmax+1):
-            df[t] = {}
-            nodes.append({})
-            latest_changes[t] = {}
-
-        # change contains the timestep, fp operation, component, label and interval
-        # Keep only the latest/most recent changes. Since list is sequencial, whatever was earlier will be overwritten
-        for change in interpretation.rule_trace_node:
-            t, fp, comp, label, bnd = change
-            latest_changes[t][(comp, label)] = bnd
-        
-        # Create a list that needs to be sorted. This contains only the latest changes
-        list_to_be_sorted = []
-        for t, d in latest_changes.items():
-            for (comp, label), bnd in d.items():
-                list_to_be_sorted.append((bnd, t, comp, label))
-
-        # Sort the list
-        reverse = True if descending else False
-        if sort_by == 'lower':
-            list_to_be_sorted.sort(key=lambda x: x[0].lower, reverse=reverse)
-        elif sort_by == 'upper':
-            list_to_be_sorted.sort(key=lambda x: x[0].upper, reverse=reverse)
-
-        # Add sorted elements to df
-        for i in list_to_be_sorted:
-            bnd, t, comp, label = i
-            df[t][(comp, label)] = bnd
-
-        for t, d in df.items():
-            for (comp, label), bnd in d.items():
-                if label.get_value() in labels and bnd in bound:
-                    if comp not in nodes[t]:
-                        nodes[t][comp] = {lab:[0,1] for lab in labels}
-                    nodes[t][comp][label.get_value()] = [bnd.lower, bnd.upper]
-
-        dataframes = []
-        for t in range(self.tmax+1):
-            dataframe = pd.DataFrame.from_dict(nodes[t]).transpose()
-            dataframe = dataframe.reset_index()
-            if not dataframe.empty:
-                dataframe.columns = ['component', *labels]
-            else:
-                dataframe = pd.DataFrame(columns=['component', *labels])
-            dataframes.append(dataframe)
-        return dataframes
+        filtered = self.filter_and_sort(interpretation, 'node', labels, bound, sort_by, descending)
+        return list(self._iter_frames_by_time(filtered, labels))
 
     def filter_and_sort_edges(self, interpretation, labels, bound, sort_by='lower', descending=True):
         # Make use of rule trace in interpretation object to efficiently filter through data.
-
-        # Initialize nested dict
-        df = {}
-        edges = []
-        latest_changes = {}
-        for t in range(self.tmax+1):
-            df[t] = {}
-            edges.append({})
-            latest_changes[t] = {}
-
-        # change contains the timestep, fp operation, component, label and interval
-        # Keep only the latest/most recent changes. Since list is sequential, whatever was earlier will be overwritten
-        for change in interpretation.rule_trace_edge:
-            t, fp, comp, label, bnd = change
-            latest_changes[t][(comp, label)] = bnd
-
-        # Create a list that needs to be sorted. This contains only the latest changes
-        list_to_be_sorted = []
-        for t, d in latest_changes.items():
-            for (comp, label), bnd in d.items():
-                list_to_be_sorted.append((bnd, t, comp, label))
-
-        # Sort the list
-        reverse = True if descending else False
-        if sort_by == 'lower':
-            list_to_be_sorted.sort(key=lambda x: x[0].lower, reverse=reverse)
-        elif sort_by == 'upper':
-            list_to_be_sorted.sort(key=lambda x: x[0].upper, reverse=reverse)
-
-        # Add sorted elements to df
-        for i in list_to_be_sorted:
-            bnd, t, comp, label = i
-            df[t][(comp, label)] = bnd
-
-        for t, d in df.items():
-            for (comp, label), bnd in d.items():
-                if label.get_value() in labels and bnd in bound:
-                    if comp not in edges[t]:
-                        edges[t][comp] = {lab: [0, 1] for lab in labels}
-                    edges[t][comp][label.get_value()] = [bnd.lower, bnd.upper]
-
-        dataframes = []
-        for t in range(self.tmax+1):
-            dataframe = pd.DataFrame.from_dict(edges[t]).transpose()
-            dataframe = dataframe.reset_index()
-            if not dataframe.empty:
-                dataframe.columns = ['source', 'target', *labels]
-                dataframe['component'] = dataframe[['source', 'target']].apply(tuple, axis=1)
-                dataframe.drop(columns=['source', 'target'], inplace=True)
-                dataframe = dataframe[['component', *labels]]
-            else:
-                dataframe = pd.DataFrame(columns=['component', *labels])
-            dataframes.append(dataframe)
-        return dataframes
+        filtered = self.filter_and_sort(interpretation, 'edge', labels, bound, sort_by, descending)
+        return list(self._iter_frames_by_time(filtered, labels))
+
+    def filter_and_sort(self, interpretation, component_type, labels, bound, sort_by='lower', descending=True):
+        """Returns the latest bound of every (time, component, label) that has one of `labels` and lies within `bound`, as a single
+        long-form frame with columns time, component, label, lower and upper, sorted by `sort_by` (ties keep the order of the trace)
+
+        :param interpretation: the interpretation to read the rule trace from
+        :param component_type: 'node' or 'edge'
+        :param labels: list of labels to keep
+        :param bound: interval the bounds have to be in
+        :param sort_by: 'lower' or 'upper', anything else keeps the order of the trace
+        :param descending: whether to sort in descending order
+        :return: pd.DataFrame
+        """
+        index = self._get_latest_bounds(interpretation, component_type)
+
+        # Filter with masks first, only what is left is sorted
+        label_ids = np.flatnonzero(np.isin(index['labels'], list(labels)))
+        mask = np.isin(index['label'], label_ids) & (index['time'] <= self.tmax) & (bound.lower <= index['lower']) & (index['upper'] <= bound.upper)
+        rows = np.flatnonzero(mask)
+
+        # The index is ordered by time and then by first appearance in the trace, so a stable sort keeps that order for ties
+        if sort_by in ('lower', 'upper'):
+            key = index[sort_by][rows]
+            rows = rows[np.argsort(-key if descending else key, kind='stable')]
+
+        return pd.DataFrame({
+            'time': index['time'][rows],
+            'component': index['components'][index['component'][rows]],
+            'label': index['labels'][index['label'][rows]],
+            'lower': index['lower'][rows],
+            'upper': index['upper'][rows],
+        })
+
+    def _iter_frames_by_time(self, filtered, labels):
+        # One frame per timestep with a row per component and a column per label, in the order of the filtered frame.
+        # Labels a component does not have at that time are [0, 1]
+        times = filtered['time'].to_numpy()
+        order = np.argsort(times, kind='stable')
+        starts = np.searchsorted(times[order], np.arange(self.tmax + 2))
+        components, trace_labels = filtered['component'].to_numpy(), filtered['label'].to_numpy()
+        lower, upper = filtered['lower'].tolist(), filtered['upper'].tolist()
+        for t in range(self.tmax + 1):
+            rows = order[starts[t]:starts[t + 1]]
+            if len(rows) == 0:
+                yield pd.DataFrame(columns=['component', *labels])
+                continue
+
+            positions = {}
+            for i in rows:
+                positions.setdefault(components[i], len(positions))
+            data = {lab: [[0, 1] for _ in range(len(positions))] for lab in labels}
+            for i in rows:
+                data[trace_labels[i]][positions[components[i]]] = [lower[i], upper[i]]
+
+            column = np.empty(len(positions), dtype=object)
+            for comp, position in positions.items():
+                column[position] = comp
+            yield pd.DataFrame({'component': column, **data}, columns=['component', *labels])
+
+    @classmethod
+    def _get_latest_bounds(cls, interpretation, component_type):
+        version = (interpretation.time, int(interpretation.prev_reasoning_data[1]))
+        cached = cls._latest_bounds.setdefault(interpretation, {}).get(component_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        index = cls._build_latest_bounds(interpretation.get_rule_trace_columns(component_type))
+        cls._latest_bounds[interpretation][component_type] = (version, index)
+        return index
+
+    @staticmethod
+    def _build_latest_bounds(columns):
+        # Rows are in the order they happened, so the latest bound of a (t, component, label) is its last row. Entries are
+        # ordered by time and then by the first row of the (t, component, label)
+        keys = np.stack((columns['time'].astype(np.int64), columns['component'].astype(np.int64), columns['label'].astype(np.int64)), axis=1)
+        if len(keys) == 0:
+            first = last = np.empty(0, dtype=np.int64)
+        else:
+            _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+            last = np.zeros(len(first), dtype=np.int64)
+            np.maximum.at(last, inverse.reshape(-1), np.arange(len(keys)))
+        order = np.lexsort((first, keys[first, 0]))
+        first, last = first[order], last[order]
+        return {
+            'time': keys[first, 0],
+            'component': columns['component'][first],
+            'label': columns['label'][first],
+            'lower': columns['lower'][last],
+            'upper': columns['upper'][last],
+            'components': columns['components'],
+            'labels': columns['labels'],
+        }
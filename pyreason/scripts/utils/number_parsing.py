@@ -0,0 +1,19 @@
+import numba
+
+
+@numba.njit(cache=True)
+def is_number(value_str):
+    # A decimal with an optional sign and exponent, e.g. '-1.5', '1.', '.5' or '1e3'. The rule parser and the reasoner both
+    # use it, so that every comparison constant the parser keeps can be read by the reasoner's str_to_float
+    e = max(value_str.find('e'), value_str.find('E'))
+    mantissa = value_str if e == -1 else value_str[:e]
+    if mantissa[:1] == '-':
+        mantissa = mantissa[1:]
+    if mantissa.count('.') > 1 or not mantissa.replace('.', '').isdigit():
+        return False
+    if e == -1:
+        return True
+    exponent = value_str[e+1:]
+    if exponent[:1] == '-':
+        exponent = exponent[1:]
+    return bool(exponent.isdigit())
@@ -1,4 +1,6 @@
+import itertools
 import os
+import numpy as np
 import pandas as pd
 
 
@@ -9,107 +11,98 @@ class Output:
         self.rule_trace_node = None
         self.rule_trace_edge = None
 
-    def _parse_internal_rule_trace(self, interpretation):
-        header_node = ['Time', 'Fixed-Point-Operation', 'Node', 'Label', 'Old Bound', 'New Bound', 'Occurred Due To']
-
-        # Nodes rule trace
-        data = []
-        max_j = -1
-
-        for i, r in enumerate(interpretation.rule_trace_node):
-            row = [r[0], r[1], r[2], r[3]._value, '-', r[4].to_str(), '-']
-            if interpretation.atom_trace:
-                qn, qe, old_bnd, name = interpretation.rule_trace_node_atoms[i]
-                row[4] = old_bnd.to_str()
-                # Go through all the changes in the rule trace
-                # len(qn) = len(qe) = num of clauses in rule that was used
-                row[6] = name
-
-                # Go through each clause
-                for j in range(len(qn)):
-                    max_j = max(j, max_j)
-                    if len(qe[j]) == 0:
-                        # Node clause
-                        row.append(list(qn[j]))
-                    elif len(qn[j]) == 0:
-                        # Edge clause
-                        row.append(list(qe[j]))
-
-            data.append(row)
-
-        # Add Clause-num to header
-        if interpretation.atom_trace and max_j != -1:
-            for i in range(1, max_j + 2):
-                header_node.append(f'Clause-{i}')
-
-        # Store the trace in a DataFrame
-        self.rule_trace_node = pd.DataFrame(data, columns=header_node)
-
-        header_edge = ['Time', 'Fixed-Point-Operation', 'Edge', 'Label', 'Old Bound', 'New Bound', 'Occurred Due To']
-
-        # Edges rule trace
-        data = []
-        max_j = -1
-
-        for i, r in enumerate(interpretation.rule_trace_edge):
-            row = [r[0], r[1], r[2], r[3]._value, '-', r[4].to_str(), '-']
-            if interpretation.atom_trace:
-                qn, qe, old_bnd, name = interpretation.rule_trace_edge_atoms[i]
-                row[4] = old_bnd.to_str()
-                # Go through all the changes in the rule trace
-                # len(qn) = num of clauses in rule that was used
-                row[6] = name
-
-                # Go through each clause
-                for j in range(len(qn)):
-                    max_j = max(j, max_j)
-                    if len(qe[j]) == 0:
-                        # Node clause
-                        row.append(list(qn[j]))
-                    elif len(qn[j]) == 0:
-                        # Edge clause
-                        row.append(list(qe[j]))
-
-            data.append(row)
-
-        # Add Clause-num to header
-        if interpretation.atom_trace and max_j != -1:
-            for i in range(1, max_j + 2):
-                header_edge.append(f'Clause-{i}')
-
-        # Store the trace in a DataFrame
-        self.rule_trace_edge = pd.DataFrame(data, columns=header_edge)
-
-        # Now do the reordering
-        if self.clause_map is not None:
-            offset = 7
-            columns_to_reorder_node = header_node[offset:]
-            columns_to_reorder_edge = header_edge[offset:]
-            self.rule_trace_node = self.rule_trace_node.apply(self._reorder_row, axis=1, map_dict=self.clause_map, columns_to_reorder=columns_to_reorder_node)
-            self.rule_trace_edge = self.rule_trace_edge.apply(self._reorder_row, axis=1, map_dict=self.clause_map, columns_to_reorder=columns_to_reorder_edge)
-
-    def save_rule_trace(self, interpretation, folder='./'):
-        if self.rule_trace_node is None and self.rule_trace_edge is None:
-            self._parse_internal_rule_trace(interpretation)
-
+    def _parse_internal_rule_trace(self, interpretation, include_clauses=True):
+        self.rule_trace_node = pd.concat(list(self._iter_rule_trace_frames(interpretation, 'node', include_clauses)), ignore_index=True)
+        self.rule_trace_edge = pd.concat(list(self._iter_rule_trace_frames(interpretation, 'edge', include_clauses)), ignore_index=True)
+
+    def _iter_rule_trace_frames(self, interpretation, component_type, include_clauses=True):
+        # One frame per chunk of the rule trace, so that a trace spilled to disk can be streamed out
+        header = ['Time', 'Fixed-Point-Operation', 'Node' if component_type == 'node' else 'Edge', 'Label', 'Old Bound', 'New Bound', 'Occurred Due To']
+        # Every chunk gets the same Clause-num columns
+        num_clauses = interpretation.get_rule_trace_num_clauses(component_type) if interpretation.atom_trace and include_clauses else 0
+        # The atom trace is read chunk by chunk alongside the columns
+        chunks = interpretation.iter_rule_trace_atoms(component_type) if interpretation.atom_trace else itertools.repeat([])
+        for columns, rule_trace_atoms in zip(interpretation.iter_rule_trace_columns(component_type), chunks):
+            yield self._build_rule_trace_frame(columns, rule_trace_atoms, interpretation.atom_trace, header, num_clauses, self.clause_map)
+
+    def save_rule_trace(self, interpretation, folder='./', include_clauses=True):
         path_nodes = os.path.join(folder, f'rule_trace_nodes_{self.timestamp}.csv')
         path_edges = os.path.join(folder, f'rule_trace_edges_{self.timestamp}.csv')
-        self.rule_trace_node.to_csv(path_nodes, index=False)
-        self.rule_trace_edge.to_csv(path_edges, index=False)
+        if self.rule_trace_node is not None or self.rule_trace_edge is not None:
+            self.rule_trace_node.to_csv(path_nodes, index=False)
+            self.rule_trace_edge.to_csv(path_edges, index=False)
+            return
+
+        # Write the trace chunk by chunk instead of building the whole frame
+        for component_type, path in (('node', path_nodes), ('edge', path_edges)):
+            for i, df in enumerate(self._iter_rule_trace_frames(interpretation, component_type, include_clauses)):
+                df.to_csv(path, index=False, header=i == 0, mode='w' if i == 0 else 'a')
 
-    def get_rule_trace(self, interpretation):
+    def get_rule_trace(self, interpretation, include_clauses=True):
         if self.rule_trace_node is None and self.rule_trace_edge is None:
-            self._parse_internal_rule_trace(interpretation)
+            self._parse_internal_rule_trace(interpretation, include_clauses)
 
         return self.rule_trace_node, self.rule_trace_edge
 
     @staticmethod
-    def _reorder_row(row, map_dict, columns_to_reorder):
-        if row['Occurred Due To'] in map_dict:
-            original_values = row[columns_to_reorder].values
-            new_values = [None] * len(columns_to_reorder)
-            for orig_pos, target_pos in map_dict[row['Occurred Due To']].items():
-                new_values[target_pos] = original_values[orig_pos]
-            for i, col in enumerate(columns_to_reorder):
-                row[col] = new_values[i]
-        return row
+    def _build_rule_trace_frame(columns, rule_trace_atoms, atom_trace, header, num_clauses=None, clause_map=None):
+        # The trace is read from its columns, only the atom trace (old bounds and clauses) is stored per row
+        n = len(columns['time'])
+        data = {
+            header[0]: columns['time'].astype(np.int64),
+            header[1]: columns['fp'].astype(np.int64),
+            header[2]: columns['components'][columns['component']],
+            header[3]: columns['labels'][columns['label']],
+            header[4]: np.full(n, '-', dtype=object),
+            header[5]: Output._format_bounds(columns['lower'], columns['upper']),
+            header[6]: np.full(n, '-', dtype=object),
+        }
+        if atom_trace:
+            old_lower = np.fromiter((old_bnd.lower for _, _, old_bnd, _ in rule_trace_atoms), dtype=np.float64, count=n)
+            old_upper = np.fromiter((old_bnd.upper for _, _, old_bnd, _ in rule_trace_atoms), dtype=np.float64, count=n)
+            data[header[4]] = Output._format_bounds(old_lower, old_upper)
+            # An untracked origin (id -1) picks the '-' appended at the end
+            origins = np.append(columns['origins'], '-')
+            data[header[6]] = origins[columns['origin']]
+
+        df = pd.DataFrame(data, columns=header)
+        if num_clauses is None:
+            num_clauses = max((len(qn) for qn, _, _, _ in rule_trace_atoms), default=0)
+        if not atom_trace or num_clauses == 0:
+            return df
+
+        # Go through each clause, len(qn) = len(qe) = num of clauses in rule that was used
+        # A clause is grounded either in qn (node clause) or in qe (edge clause)
+        clauses = np.full((n, num_clauses), None, dtype=object)
+        for i, (qn, qe, _, _) in enumerate(rule_trace_atoms):
+            for j in range(len(qn)):
+                clauses[i, j] = qn[j] if len(qe[j]) == 0 else qe[j]
+
+        # Put the clauses of each rule back in the order they were written, one rule at a time
+        if clause_map is not None:
+            origin_ids = columns['origin']
+            for origin_id, name in enumerate(columns['origins']):
+                positions = clause_map.get(name)
+                if positions is None or all(orig_pos == target_pos for orig_pos, target_pos in positions.items()):
+                    continue
+                rows = np.flatnonzero(origin_ids == origin_id)
+                orig, target = np.array(list(positions.keys())), np.array(list(positions.values()))
+                block = clauses[rows]
+                clauses[rows] = None
+                clauses[np.ix_(rows, target)] = block[:, orig]
+
+        # Add Clause-num to header
+        for j in range(num_clauses):
+            df[f'Clause-{j + 1}'] = clauses[:, j]
+        return df
+
+    @staticmethod
+    def _format_bounds(lower, upper):
+        # Bounds repeat a lot, so every distinct pair is formatted once
+        if len(lower) == 0:
+            return np.empty(0, dtype=object)
+        pairs, inverse = np.unique(np.stack((lower, upper), axis=1), axis=0, return_inverse=True)
+        formatted = np.empty(len(pairs), dtype=object)
+        for i, (l, u) in enumerate(pairs.tolist()):
+            formatted[i] = f'[{l},{u}]'
+        return formatted[inverse.reshape(-1)]
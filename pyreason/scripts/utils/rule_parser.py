@@ -7,6 +7,7 @@ import pyreason.scripts.numba_wrapper.numba_types.rule_type as rule
 import pyreason.scripts.numba_wrapper.numba_types.label_type as label
 import pyreason.scripts.numba_wrapper.numba_types.interval_type as interval
 from pyreason.scripts.threshold.threshold import Threshold
+from pyreason.scripts.utils.number_parsing import is_number
 
 
 def parse_rule(rule_text: str, name: str, custom_thresholds: Union[None, list, dict], infer_edges: bool = False, set_static: bool = False, weights: Union[None, np.ndarray] = None) -> rule.Rule:
@@ -33,40 +34,24 @@ def parse_rule(rule_text: str, name: str, custom_thresholds: Union[None, list, d
 
     # Raw parsing steps
     # 1. Remove whitespaces
-    # 2. replace ) by )) and ] by ]] so that we can split without damaging the string
-    # 3. Split with ), and then for each element of list, split with ], and add to new list
-    # 4. Then replace ]] with ] and )) with ) in for loop
-    # 5. Add :[1,1] or :[0,0] to the end of each element if a bound is not specified
-    # 6. Then split each element with :
-    # 7. Transform bound strings into pr.intervals
+    # 2. Split the body at the commas between clauses, the commas inside parentheses and bounds belong to the clause
+    # 3. Add [1,1] or [0,0] as the bound of each clause if a bound is not specified
+    # 4. Transform bound strings into pr.intervals
 
     # 2
-    body = body.replace(')', '))')
-    body = body.replace(']', ']]')
+    split_body = _split_body(body)
 
     # 3
-    body = body.split('),')
-    split_body = []
-    for b in body:
-        split_body.extend(b.split('],'))
-
-    # 4
-    for i in range(len(split_body)):
-        split_body[i] = split_body[i].replace('))', ')')
-        split_body[i] = split_body[i].replace(']]', ']')
-
-    # 5
-    for i in range(len(split_body)):
-        if split_body[i][0] == '~':
-            split_body[i] = split_body[i][1:] + ':[0,0]'
-        elif split_body[i][-1] != ']':
-            split_body[i] += ':[1,1]'
-
-    # 6
+    # A comparison against a constant (age(x)>30) keeps its operator and constant in the clause, its bound comes after ':'
     body_clauses = []
     body_bounds = []
     for b in split_body:
-        clause, bound = b.split(':')
+        if b[0] == '~':
+            clause, bound = b[1:], '[0,0]'
+        elif ':' in b:
+            clause, bound = b.split(':')
+        else:
+            clause, bound = b, '[1,1]'
         body_clauses.append(clause)
         body_bounds.append(bound)
 
@@ -78,7 +63,7 @@ def parse_rule(rule_text: str, name: str, custom_thresholds: Union[None, list, d
             custom_thresholds[i] = Threshold("greater_equal", ("percent", "total"), 100)
             body_clauses[i] = b[:-1].replace('forall(', '')
 
-    # 7
+    # 4
     for i in range(len(body_bounds)):
         bound = body_bounds[i]
         lower, upper = _str_bound_to_bound(bound)
@@ -179,6 +164,10 @@ def parse_rule(rule_text: str, name: str, custom_thresholds: Union[None, list, d
         op = _get_operator_from_clause(body_clause)
         if op:
             clause_type = 'comparison'
+            # Comparisons against a constant keep the constant with the operator, e.g. age(x) > 30 becomes '>30'
+            constant = body_clause[body_clause.find(op) + len(op):]
+            if is_number(constant):
+                op += constant
 
         subset = numba.typed.List(variables)
         label_obj = label.Label(predicate)
@@ -229,6 +218,22 @@ def _is_bound(str_bound):
     return result
 
 
+def _split_body(body):
+    clauses = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(body):
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            clauses.append(body[start:i])
+            start = i + 1
+    clauses.append(body[start:])
+    return clauses
+
+
 def _get_operator_from_clause(clause):
     operators = ['<=', '>=', '<', '>', '==', '!=']
     for op in operators:
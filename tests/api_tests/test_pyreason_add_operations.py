@@ -367,3 +367,11 @@ class TestAutoNamingCounters:
 
         # Fact should get auto-generated name
         assert fact2.name.startswith('fact_')
+
+    def test_rule_with_unregistered_annotation_function_raises(self):
+        """Test reasoning with a rule whose annotation function was never added."""
+        pr.add_rule(pr.Rule('test(x):missing_fn <- fact(x)', 'ann_rule'))
+        pr.add_fact(pr.Fact('fact(A)'))
+
+        with pytest.raises(ValueError, match='missing_fn'):
+            pr.reason(timesteps=1)
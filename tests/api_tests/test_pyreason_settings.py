@@ -113,6 +113,16 @@ class TestSettingsDefaults:
         
         assert pr.settings.fp_version is False
 
+    def test_rule_trace_spill_threshold_default(self):
+        """Test rule_trace_spill_threshold default value."""
+        
+        assert pr.settings.rule_trace_spill_threshold == 0
+
+    def test_rule_trace_spill_folder_default(self):
+        """Test rule_trace_spill_folder default value."""
+        
+        assert pr.settings.rule_trace_spill_folder is None
+
 
 class TestSettingsValidSetters:
     """Test setting valid values for all properties."""
@@ -254,6 +264,18 @@ class TestSettingsValidSetters:
         pr.settings.fp_version = True
         assert pr.settings.fp_version is True
 
+    def test_rule_trace_spill_threshold_setter_valid_int(self):
+        """Test setting rule_trace_spill_threshold to a positive int."""
+        
+        pr.settings.rule_trace_spill_threshold = 100000
+        assert pr.settings.rule_trace_spill_threshold == 100000
+
+    def test_rule_trace_spill_folder_setter_valid_string(self):
+        """Test setting rule_trace_spill_folder to a path."""
+        
+        pr.settings.rule_trace_spill_folder = '/tmp'
+        assert pr.settings.rule_trace_spill_folder == '/tmp'
+
 
 class TestSettingsInvalidSetters:
     """Test type validation for all property setters."""
@@ -425,6 +447,30 @@ class TestSettingsInvalidSetters:
         with pytest.raises(TypeError, match='value has to be a bool'):
             pr.settings.fp_version = invalid_value
 
+    @pytest.mark.parametrize("invalid_value", [
+        True, "100", 3.14, [], None, object()
+    ])
+    def test_rule_trace_spill_threshold_setter_invalid_type(self, invalid_value):
+        """Test rule_trace_spill_threshold setter with invalid types."""
+        
+        with pytest.raises(TypeError, match='value has to be an int'):
+            pr.settings.rule_trace_spill_threshold = invalid_value
+
+    def test_rule_trace_spill_threshold_setter_negative(self):
+        """Test rule_trace_spill_threshold setter with a negative value."""
+        
+        with pytest.raises(ValueError, match='value has to be 0 or more'):
+            pr.settings.rule_trace_spill_threshold = -1
+
+    @pytest.mark.parametrize("invalid_value", [
+        True, 123, 3.14, [], object()
+    ])
+    def test_rule_trace_spill_folder_setter_invalid_type(self, invalid_value):
+        """Test rule_trace_spill_folder setter with invalid types."""
+        
+        with pytest.raises(TypeError, match='value has to be a str or None'):
+            pr.settings.rule_trace_spill_folder = invalid_value
+
 
 class TestSettingsReset:
     """Test settings reset functionality."""
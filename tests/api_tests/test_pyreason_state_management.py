@@ -5,6 +5,7 @@ Tests the critical reset(), reset_rules(), reset_settings() functions and global
 
 import pytest
 from unittest.mock import patch, MagicMock
+import networkx as nx
 import pyreason as pr
 
 
@@ -295,3 +296,47 @@ class TestStateConsistency:
         assert pr.settings.verbose is True
         assert pr.settings.memory_profile is False
         assert pr.settings.output_file_name == "pyreason_output"
+
+
+class TestInitializeCacheFunction:
+    """Test the initialize_cache() function."""
+
+    def setup_method(self):
+        """Clean state before each test."""
+        pr.reset()
+        pr.reset_settings()
+
+    @pytest.mark.parametrize('parallel_computing', [False, True])
+    def test_initialize_cache_reasons_in_requested_mode_and_restores_state(self, parallel_computing):
+        """Test that initialize_cache() reasons with the requested reasoner and leaves settings and rules untouched."""
+        pr.settings.verbose = True
+        modes = []
+        with patch('pyreason.pyreason.reason', side_effect=lambda **kwargs: modes.append(pr.settings.parallel_computing)):
+            pr.initialize_cache(parallel_computing=parallel_computing)
+
+        assert modes == [parallel_computing]
+        assert pr.settings.verbose is True
+        assert pr.settings.parallel_computing is False
+        assert pr.get_rules() is None
+
+    def test_initialize_cache_restores_settings_when_reasoning_fails(self):
+        """Test that initialize_cache() restores settings and clears the example when reasoning raises."""
+        pr.settings.verbose = True
+        with patch('pyreason.pyreason.reason', side_effect=RuntimeError('compilation failed')):
+            with pytest.raises(RuntimeError):
+                pr.initialize_cache(parallel_computing=True)
+
+        assert pr.settings.verbose is True
+        assert pr.settings.parallel_computing is False
+        assert pr.get_rules() is None
+
+    def test_initialize_cache_refuses_to_replace_a_loaded_program(self):
+        """Test that initialize_cache() does not wipe a graph and rules that are already loaded."""
+        pr.load_graph(nx.DiGraph([('A', 'B')]))
+        pr.add_rule(pr.Rule('f(x) <- g(x)', 'user_rule'))
+        with patch('pyreason.pyreason.reason') as reason:
+            with pytest.raises(Exception, match='initialize_cache'):
+                pr.initialize_cache()
+
+        reason.assert_not_called()
+        assert [r.get_rule_name() for r in pr.get_rules()] == ['user_rule']
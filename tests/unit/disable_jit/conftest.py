@@ -13,6 +13,7 @@ stub.add_fact = lambda *a, **k: None
 stub.reason = lambda *a, **k: None
 stub.reset = lambda *a, **k: None
 stub.reset_rules = lambda *a, **k: None
+stub.initialize_cache = lambda *a, **k: None
 class Rule:
     def __init__(self, *args, **kwargs):
         pass
@@ -67,6 +68,7 @@ def reason_env(monkeypatch, helpers_fixture):
     class SimpleInterval:
         def __init__(self, val=1.0, static=False):
             self.val = val
+            self.lower = self.upper = val
             self._static = static
 
         def copy(self):
@@ -102,10 +104,10 @@ def reason_env(monkeypatch, helpers_fixture):
         "facts_to_be_applied_node_trace": [],
         "facts_to_be_applied_edge_trace": [],
         "ipl": [],
-        "rule_trace_node": [],
-        "rule_trace_edge": [],
-        "rule_trace_node_atoms": [],
-        "rule_trace_edge_atoms": [],
+        "rule_trace_node": helpers_fixture.new_rule_trace("node"),
+        "rule_trace_edge": helpers_fixture.new_rule_trace("edge"),
+        "rule_trace_node_atoms": helpers_fixture.new_rule_trace_atoms(),
+        "rule_trace_edge_atoms": helpers_fixture.new_rule_trace_atoms(),
         "reverse_graph": {},
         "atom_trace": False,
         "save_graph_attributes_to_rule_trace": False,
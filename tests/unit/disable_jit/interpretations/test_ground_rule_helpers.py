@@ -1041,6 +1041,142 @@ def test_ground_rule_node_success_adds_head_node_and_collects_trace_ann(monkeypa
     assert edges_to_add[2] == "HEAD_LBL"
 
 
+def test_ground_rule_chunks_partition_head_groundings(monkeypatch):
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+    _shim_typed_list(monkeypatch)
+
+    heads = ["x1", "x2", "x3", "x4", "x5"]
+    monkeypatch.setattr(interpretation, "get_rule_node_clause_grounding", lambda *a, **k: list(heads))
+    monkeypatch.setattr(interpretation, "get_qualified_node_groundings", lambda *a, **k: list(heads))
+    monkeypatch.setattr(interpretation, "check_node_grounding_threshold_satisfaction", lambda *a, **k: True)
+    monkeypatch.setattr(interpretation, "refine_groundings", lambda *a, **k: None)
+    monkeypatch.setattr(interpretation, "check_all_clause_satisfaction", lambda *a, **k: True)
+
+    rule = DummyRule(
+        rtype="node",
+        head_vars=("X",),
+        clauses=[("node", "L1", ("X",), ("b",), "op")],
+        thresholds=[("ge", ("number", "total"), 1)],
+        ann_fn="",
+        rule_edges=("", "", "HEAD_LBL"),
+    )
+    interpretations_node = {h: None for h in heads}
+
+    def ground(chunk, num_chunks):
+        apps_node, _ = ground_rule(
+            rule, interpretations_node, {}, {}, {}, list(heads), [], {}, {},
+            atom_trace=False, allow_ground_rules=False, t=0, chunk=chunk, num_chunks=num_chunks
+        )
+        return [a[0] for a in apps_node]
+
+    # The chunks together give the same groundings in the same order as grounding the whole rule
+    assert ground(0, 1) == heads
+    assert [ground(c, 3) for c in range(3)] == [["x1"], ["x2", "x3"], ["x4", "x5"]]
+
+    # The body can be grounded once and shared by the chunks, which leave it as it is
+    body = interpretation._ground_rule_body(rule, interpretations_node, {}, {}, {}, list(heads), [], {}, {}, False)
+    grounded = Mock(side_effect=AssertionError("the body is already grounded"))
+    monkeypatch.setattr(interpretation, "_ground_rule_body", grounded)
+    chunks = []
+    for c in range(3):
+        apps_node, _ = ground_rule(
+            rule, interpretations_node, {}, {}, {}, list(heads), [], {}, {},
+            atom_trace=False, allow_ground_rules=False, t=0, chunk=c, num_chunks=3, body=body
+        )
+        chunks.append([a[0] for a in apps_node])
+    assert chunks == [["x1"], ["x2", "x3"], ["x4", "x5"]]
+    assert dict(body[1]) == {"X": heads}
+
+
+def test_ground_rule_edge_chunks_share_the_prepared_head_groundings(monkeypatch):
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+    _shim_typed_list(monkeypatch)
+
+    heads = ["a", "b", "c"]
+    monkeypatch.setattr(interpretation, "get_rule_node_clause_grounding", lambda *a, **k: list(heads))
+    monkeypatch.setattr(interpretation, "get_qualified_node_groundings", lambda *a, **k: list(heads))
+    monkeypatch.setattr(interpretation, "check_node_grounding_threshold_satisfaction", lambda *a, **k: True)
+    monkeypatch.setattr(interpretation, "refine_groundings", lambda *a, **k: None)
+    monkeypatch.setattr(interpretation, "check_all_clause_satisfaction", lambda *a, **k: True)
+    group = Mock(wraps=interpretation._group_edge_groundings_by_head)
+    monkeypatch.setattr(interpretation, "_group_edge_groundings_by_head", group)
+
+    rule = DummyRule(
+        rtype="edge",
+        head_vars=("X", "Y"),
+        clauses=[("node", "L", ("X",), ("b",), ""), ("node", "L", ("Y",), ("b",), "")],
+        thresholds=[("ge", ("number", "total"), 1)] * 2,
+        ann_fn="",
+        rule_edges=("X", "Y", "HEAD_LBL"),
+    )
+    interpretations_node = {h: None for h in heads}
+
+    # The pairs of head groundings are prepared once with the body
+    body = interpretation._ground_rule_body(rule, interpretations_node, {}, {}, {}, list(heads), [], {}, {}, False)
+    pairs = [(x, y) for x in heads for y in heads]
+    assert list(body[5]) == pairs
+    assert group.call_count == 1
+
+    chunks = []
+    for c in range(4):
+        _, apps_edge = ground_rule(
+            rule, interpretations_node, {}, {}, {}, list(heads), [], {}, {},
+            atom_trace=False, allow_ground_rules=False, t=0, chunk=c, num_chunks=4, body=body
+        )
+        chunks.extend(a[0] for a in apps_edge)
+    # Self loops are not inferred, the chunks together give every other pair once
+    assert chunks == [p for p in pairs if p[0] != p[1]]
+    assert group.call_count == 1
+
+
+def test_head_edge_groundings_are_looked_up_by_head_endpoint():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    groundings_edges = {
+        ("X", "Z"): [("a", "b"), ("a", "c"), ("d", "b")],
+        ("Z", "Y"): [("b", "e"), ("c", "f")],
+        ("Y", "X"): [("f", "a"), ("e", "a")],
+        ("Z", "W"): [("b", "q")],
+    }
+    by_head = interpretation._group_edge_groundings_by_head(groundings_edges, "X", "Y")
+
+    # Clauses that do not share a variable with the head are left alone
+    assert set(by_head) == {("X", "Z"), ("Z", "Y"), ("Y", "X")}
+
+    def lookup(c):
+        return list(interpretation._get_head_edge_groundings(by_head[c], c, "X", "Y", "a", "f"))
+
+    # Same edges, in the same order, as filtering the clause's groundings against the head grounding (a, f)
+    assert lookup(("X", "Z")) == [("a", "b"), ("a", "c")]
+    assert lookup(("Z", "Y")) == [("c", "f")]
+    assert lookup(("Y", "X")) == [("f", "a")]
+
+
+def test_split_head_connected_clauses_follows_dependency_graph():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    clauses = [
+        ("edge", "Friends", ["X", "Y"], None, ""),
+        ("edge", "owns", ["Y", "Z"], None, ""),
+        ("node", "cat", ["W"], None, ""),
+        ("edge", "likes", ["W", "V"], None, ""),
+    ]
+    thresholds = ["t0", "t1", "t2", "t3"]
+    neighbors = {"X": ["Y"], "Y": ["Z"], "W": ["V"]}
+    reverse_neighbors = {"Y": ["X"], "Z": ["Y"], "V": ["W"]}
+
+    head_clauses, head_thresholds, other_clauses, other_thresholds = interpretation._split_head_connected_clauses(
+        clauses, thresholds, ["X", "Y"], neighbors, reverse_neighbors
+    )
+    # Z is reached through Y, the W-V component is not connected to the head
+    assert head_clauses == clauses[:2] and head_thresholds == ["t0", "t1"]
+    assert other_clauses == clauses[2:] and other_thresholds == ["t2", "t3"]
+
+
 def test_ground_rule_edge_infer_adds_nodes_and_unlabeled_edge(monkeypatch):
     _shim_typed_list(monkeypatch)
 
@@ -1483,7 +1619,8 @@ def test_ground_rule_edge_clause_ground_atom_allow_ground_rules(monkeypatch):
     neighbors = {"A": ["B"]}
     reverse_neighbors = {"B": ["A"]}
     predicate_map_node, predicate_map_edge = {}, {}
-    interpretations_node, interpretations_edge = {}, {}
+    interpretations_node = {"A": Mock(world={}), "B": Mock(world={})}
+    interpretations_edge = {("A", "B"): Mock(world={})}
 
     apps_node, apps_edge = ground_rule(
         rule, interpretations_node, interpretations_edge,
@@ -1521,7 +1658,8 @@ def test_ground_rule_edge_head_vars_use_existing_nodes_when_allowed(monkeypatch)
     neighbors = {"A": ["B"]}
     reverse_neighbors = {"B": ["A"]}
     predicate_map_node, predicate_map_edge = {}, {}
-    interpretations_node, interpretations_edge = {}, {}
+    interpretations_node = {"A": Mock(world={}), "B": Mock(world={})}
+    interpretations_edge = {("A", "B"): Mock(world={})}
 
     apps_node, apps_edge = ground_rule(
         rule,
@@ -1673,7 +1811,7 @@ def test_ground_rule_edge_with_node_clauses_tracing(monkeypatch):
         "b1": DummyNW({"L2": "ANN_b1"}),
         "z1": DummyNW({"L3": "ANN_z1"}),
     }
-    interpretations_edge = {}
+    interpretations_edge = {("a1", "b1"): DummyNW({})}
 
     rule = DummyRule(
         rtype="edge",
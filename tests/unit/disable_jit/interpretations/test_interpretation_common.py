@@ -1,13 +1,16 @@
 import math
-from types import SimpleNamespace
+from types import MethodType, SimpleNamespace
 from unittest.mock import Mock, call
 
 import importlib
 import inspect
+import numpy as np
+import pandas as pd
 import pytest
 
 import pyreason.scripts.numba_wrapper.numba_types.label_type as label
 from pyreason.scripts.interpretation.interpretation_dict import InterpretationDict
+from pyreason.scripts.utils.output import Output
 
 
 def _py(func):
@@ -110,9 +113,10 @@ def get_interpretation_helpers(module_name: str = "interpretation_fp"):
     ns.annotate = _py(interpretation.annotate)
 
     # Initialization helpers
-    ns.init_reverse_neighbors = _py(
-        interpretation.Interpretation._init_reverse_neighbors
-    )
+    if hasattr(interpretation.Interpretation, "_init_neighbors"):
+        ns.init_neighbors = _py(
+            interpretation.Interpretation._init_neighbors
+        )
 
     _init_nodes_fn = _py(
         interpretation.Interpretation._init_interpretations_node
@@ -252,6 +256,40 @@ def get_interpretation_helpers(module_name: str = "interpretation_fp"):
             return f"FakeLabel({self.value!r})"
 
     ns.FakeLabel = FakeLabel
+
+    # The interpretation backend keeps the rule trace in interned columns and the atom trace as rows of grounding block ids,
+    # the fp backend keeps both as lists of rows. Tests read them back as (t, fp, component, label, lower, upper) rows and
+    # (qn, qe, prev_bnd, name) rows
+    fp_backend = module_name.endswith("_fp")
+
+    def new_rule_trace(component_type="node"):
+        if fp_backend:
+            return []
+        return interpretation._new_rule_trace_node() if component_type == "node" else interpretation._new_rule_trace_edge()
+
+    def new_rule_trace_atoms():
+        return [] if fp_backend else ([], interpretation._new_provenance())
+
+    def rule_trace_rows(rule_trace):
+        if fp_backend:
+            return [(t, fp, comp, l.get_value(), bnd.lower, bnd.upper) for t, fp, comp, l, bnd in rule_trace]
+        columns = interpretation._rule_trace_to_columns(rule_trace)
+        return list(zip(
+            columns['time'].tolist(),
+            columns['fp'].tolist(),
+            columns['components'][columns['component']].tolist(),
+            columns['labels'][columns['label']].tolist(),
+            columns['lower'].tolist(),
+            columns['upper'].tolist(),
+        ))
+
+    def rule_trace_atom_rows(rule_trace_atoms):
+        return list(rule_trace_atoms) if fp_backend else interpretation._resolve_rule_trace_atoms(rule_trace_atoms)
+
+    ns.new_rule_trace = new_rule_trace
+    ns.new_rule_trace_atoms = new_rule_trace_atoms
+    ns.rule_trace_rows = rule_trace_rows
+    ns.rule_trace_atom_rows = rule_trace_atom_rows
     return ns
 
 
@@ -339,6 +377,9 @@ class _Interval:
     def set_static(self, val):
         self.static = val
 
+    def is_static(self):
+        return self.static
+
 
 class _World:
     def __init__(self, mapping=None):
@@ -374,16 +415,17 @@ def test_resolve_inconsistency_updates_world_and_trace(monkeypatch, resolver_nam
     monkeypatch.setattr(interpretation.interval, "closed", lambda lo, up: _Interval(lo, up))
     calls = []
     monkeypatch.setattr(interpretation, "_update_rule_trace", lambda *a: calls.append(a))
-    world = _World({"p": _Interval(0, 0.5), "q": _Interval(0, 0.5), "r": _Interval(0, 0.5)})
+    p, q, r = DummyLabel("p"), DummyLabel("q"), DummyLabel("r")
+    world = _World({p: _Interval(0, 0.5), q: _Interval(0, 0.5), r: _Interval(0, 0.5)})
     interpretations = {comp_key: world}
-    ipl = [("p", "q"), ("r", "p")]
-    rule_trace = []
-    rule_trace_atoms = []
+    ipl = [(p, q), (r, p)]
+    rule_trace = new_rule_trace("node" if resolver_name.endswith("node") else "edge")
+    rule_trace_atoms = new_rule_trace_atoms()
     facts = ["fact"]
     resolver(
         interpretations,
         comp_key,
-        ("p", _Interval(0.9, 1.0)),
+        (p, _Interval(0.9, 1.0)),
         ipl,
         1,
         2,
@@ -396,10 +438,10 @@ def test_resolve_inconsistency_updates_world_and_trace(monkeypatch, resolver_nam
         True,
         "fact",
     )
-    assert world.world["p"].lower == 0 and world.world["p"].upper == 1 and world.world["p"].static
-    assert world.world["q"].lower == 0 and world.world["q"].upper == 1 and world.world["q"].static
-    assert world.world["r"].lower == 0 and world.world["r"].upper == 1 and world.world["r"].static
-    assert len(rule_trace) == 3
+    assert world.world[p].lower == 0 and world.world[p].upper == 1 and world.world[p].static
+    assert world.world[q].lower == 0 and world.world[q].upper == 1 and world.world[q].static
+    assert world.world[r].lower == 0 and world.world[r].upper == 1 and world.world[r].static
+    assert rule_trace_rows(rule_trace) == [(1, 2, comp_key, "p", 0, 1), (1, 2, comp_key, "q", 0, 1), (1, 2, comp_key, "r", 0, 1)]
     assert len(calls) == 3
 
 
@@ -530,25 +572,51 @@ def test_is_satisfied_comparison(monkeypatch, cmp_fn_name, interp_key):
 # ---- _update_rule_trace tests ----
 
 def test_update_rule_trace_makes_copy():
-    rt = []
+    rt = new_rule_trace_atoms()
     bnd = _Interval(0.1, 0.2)
     update_rule_trace(rt, [["n1"]], [[("a", "b")]], bnd, "name")
-    assert rt[0][0] == [["n1"]]
-    assert rt[0][1] == [[("a", "b")]]
-    assert rt[0][2] is not bnd and rt[0][2].lower == bnd.lower
-    assert rt[0][3] == "name"
+    rows = rule_trace_atom_rows(rt)
+    assert rows[0][0] == [["n1"]]
+    assert rows[0][1] == [[("a", "b")]]
+    assert rows[0][2] is not bnd and rows[0][2].lower == bnd.lower
+    assert rows[0][3] == "name"
+
+
+def test_update_rule_trace_shares_grounding_blocks():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+    rt = new_rule_trace_atoms()
+    provenance = rt[1]
+    bnd = _Interval(0.1, 0.2)
+    update_rule_trace(rt, [["n1"], ["n2", "n3"]], [[], []], bnd, "r")
+    update_rule_trace(rt, [["n4"], ["n2", "n3"]], [[], []], bnd, "r")
+    update_rule_trace(rt, [[], []], [[("a", "b")], [("a", "b")]], bnd, "r")
+
+    (node_blocks, _), (edge_blocks, _) = provenance
+    assert [list(b) for b in node_blocks] == [["n1"], ["n2", "n3"], ["n4"], []]
+    assert [list(b) for b in edge_blocks] == [[], [("a", "b")]]
+    assert list(rt[0][1][0]) == [2, 1] and list(rt[0][2][1]) == [1, 1]
+
+    rows = interpretation._resolve_rule_trace_atoms(rt)
+    assert rows[1][0] == [["n4"], ["n2", "n3"]]
+    assert rows[0][0][1] is rows[1][0][1]
+    assert rows[2][1] == [[("a", "b")], [("a", "b")]] and rows[2][3] == "r"
 
 
 # ---- annotate tests ----
 
 class AnnRule:
-    def __init__(self, fn, bnd):
+    def __init__(self, fn, bnd, fn_id=-1):
         self._fn = fn
         self._bnd = bnd
+        self._fn_id = fn_id
 
     def get_annotation_function(self):
         return self._fn
 
+    def get_annotation_function_id(self):
+        return self._fn_id
+
     def get_bnd(self):
         return self._bnd
 
@@ -562,7 +630,7 @@ def test_annotate_returns_bounds_when_no_function():
 
 def test_annotate_calls_named_function():
     bnd = _Interval(0, 1)
-    rule = AnnRule("foo", bnd)
+    rule = AnnRule("foo", bnd, 0)
 
     def foo(ann, wts):
         return (len(ann), len(wts))
@@ -594,6 +662,16 @@ class DummyLabel:
     def __init__(self, value):
         self._value = value
 
+    def get_value(self):
+        return self._value
+
+    # Labels are interned in the rule trace, equal like pyreason's Label
+    def __eq__(self, other):
+        return isinstance(other, DummyLabel) and self._value == other._value
+
+    def __hash__(self):
+        return hash(self._value)
+
 
 class DummyBound:
     def __init__(self, lower, upper):
@@ -617,7 +695,7 @@ class DummyBound:
 
 
 def build_dummy(persistent):
-    return SimpleNamespace(
+    interp = SimpleNamespace(
         time=1,
         nodes=["n1"],
         edges=[("n1", "n2")],
@@ -625,6 +703,22 @@ def build_dummy(persistent):
         rule_trace_edge=[(0, 0, ("n1", "n2"), DummyLabel("L2"), DummyBound(0.3, 0.4))],
         persistent=persistent,
     )
+    if not interpretation.__name__.endswith("_fp"):
+        # The rule trace is kept in columns
+        interp.rule_trace_node = interpretation._new_rule_trace_node()
+        interp.rule_trace_edge = interpretation._new_rule_trace_edge()
+        interpretation._append_rule_trace(interp.rule_trace_node, 0, 0, "n1", DummyLabel("L1"), DummyBound(0.1, 0.2), "")
+        interpretation._append_rule_trace(interp.rule_trace_edge, 0, 0, ("n1", "n2"), DummyLabel("L2"), DummyBound(0.3, 0.4), "")
+        interp.rule_trace_spill_folder = ""
+        interp.prev_reasoning_data = [2, 1]
+        interp.rule_trace_index = {}
+        interp.rule_trace_index_version = None
+        interp.get_rule_trace_columns = MethodType(interpretation.Interpretation.get_rule_trace_columns, interp)
+        interp.iter_rule_trace_columns = MethodType(interpretation.Interpretation.iter_rule_trace_columns, interp)
+        interp._get_rule_trace_index = MethodType(interpretation.Interpretation._get_rule_trace_index, interp)
+        interp.interpretations_node = {"n1": _World()}
+        interp.interpretations_edge = {("n1", "n2"): _World()}
+    return interp
 
 
 def build_ga_dummy():
@@ -692,8 +786,304 @@ def test_get_dict_persistent():
     assert result[1][("n1", "n2")]["L2"] == (0.3, 0.4)
 
 
+@pytest.mark.parametrize("persistent", [False, True])
+def test_get_dict_is_built_per_timestep_from_the_latest_changes(persistent):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_dummy(persistent)
+    interp.time = 3
+    l1, l3 = DummyLabel("L1"), DummyLabel("L3")
+    interpretation._append_rule_trace(interp.rule_trace_node, 0, 1, "n1", l1, DummyBound(0.5, 0.6), "")
+    interpretation._append_rule_trace(interp.rule_trace_node, 2, 2, "n1", l1, DummyBound(0.7, 0.8), "")
+    interpretation._append_rule_trace(interp.rule_trace_node, 1, 3, "n3", l3, DummyBound(1, 1), "")
+    result = interpretation.Interpretation.get_dict(interp)
+
+    assert list(result) == [0, 1, 2, 3] and len(result) == 4
+    assert 4 not in result
+    # Nothing is built until a timestep is accessed
+    assert result._timesteps == {}
+    # The latest change of a timestep wins
+    assert result[0]["n1"]["L1"] == (0.5, 0.6)
+    assert result[2]["n1"]["L1"] == (0.7, 0.8)
+    assert list(result._timesteps) == [0, 2]
+    # A component added while reasoning is still there
+    assert result[1]["n3"]["L3"] == (1, 1)
+    if persistent:
+        assert result[1]["n1"]["L1"] == (0.5, 0.6)
+        assert result[3]["n1"]["L1"] == (0.7, 0.8)
+        assert result.changed_components(3) == ["n1", "n3", ("n1", "n2")]
+    else:
+        assert "L1" not in result[1]["n1"] and len(result[3]["n1"]) == 0
+        assert result.changed_components(3) == []
+        assert result.changed_components(1) == ["n3"]
+
+
+def test_get_dict_timestep_looks_components_up_on_access():
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_dummy(False)
+    interp.time = 1
+    interpretation._append_rule_trace(interp.rule_trace_node, 1, 0, "n3", DummyLabel("L3"), DummyBound(1, 1), "")
+    result = interpretation.Interpretation.get_dict(interp)
+
+    timestep = result[1]
+    # The nodes and edges, then the components with a bound that are not in the graph
+    assert list(timestep) == ["n1", ("n1", "n2"), "n3"] and len(timestep) == 3
+    assert "n3" in timestep and "n3" not in result[0] and len(result[0]) == 2
+    with pytest.raises(KeyError):
+        result[0]["n3"]
+    # Nothing is built by iterating or printing
+    assert repr(timestep) == "{'n3': {'L3': (1.0, 1.0)}}"
+    assert repr(result) == "{0: {'n1': {'L1': (0.1, 0.2)}, ('n1', 'n2'): {'L2': (0.3, 0.4)}}, 1: {'n3': {'L3': (1.0, 1.0)}}}"
+    assert timestep._interpretations == {}
+    assert len(timestep["n1"]) == 0 and timestep["n3"]["L3"] == (1, 1)
+    assert list(timestep._interpretations) == ["n1", "n3"] and timestep["n3"] is timestep["n3"]
+
+
+def test_rule_trace_columns_grow_and_intern():
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    rule_trace = interpretation._new_rule_trace_node()
+    l1, l2 = DummyLabel("L1"), DummyLabel("L2")
+    n = interpretation.rule_trace_capacity + 10
+    for i in range(n):
+        interpretation._append_rule_trace(rule_trace, i, 0, f"n{i % 3}", l1 if i % 2 else l2, DummyBound(0.1, 0.2), "rule" if i % 2 else "")
+
+    columns = interpretation._rule_trace_to_columns(rule_trace)
+    assert interpretation._rule_trace_len(rule_trace) == n
+    assert list(columns["time"]) == list(range(n))
+    assert list(columns["components"]) == ["n0", "n1", "n2"]
+    assert list(columns["components"][columns["component"]][:4]) == ["n0", "n1", "n2", "n0"]
+    assert list(columns["labels"][columns["label"]][:2]) == ["L2", "L1"]
+    assert list(columns["origin"][:2]) == [-1, 0] and list(columns["origins"]) == ["rule"]
+    assert list(columns["lower"]) == [0.1] * n and list(columns["upper"]) == [0.2] * n
+
+
+def test_rule_trace_spill_reads_segments_back_in_order(tmp_path):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_dummy(False)
+    interp.rule_trace_spill_folder = str(tmp_path)
+    l1 = DummyLabel("L1")
+    for i in range(1, 3):
+        interpretation._append_rule_trace(interp.rule_trace_node, i, 0, f"n{i}", l1, DummyBound(0.5, 1), "")
+    interpretation._spill_rule_trace(interp.rule_trace_node[0], [], interp.rule_trace_spill_folder, "node")
+    assert interpretation._rule_trace_len(interp.rule_trace_node) == 0
+    interpretation._append_rule_trace(interp.rule_trace_node, 3, 1, "n1", l1, DummyBound(0, 1), "")
+
+    chunks = list(interp.iter_rule_trace_columns("node"))
+    assert [len(chunk["time"]) for chunk in chunks] == [3, 1]
+    columns = interp.get_rule_trace_columns("node")
+    assert list(columns["time"]) == [0, 1, 2, 3]
+    assert list(columns["components"][columns["component"]]) == ["n1", "n1", "n2", "n1"]
+    assert list(columns["lower"]) == [0.1, 0.5, 0.5, 0]
+    # Nothing was spilled for the edges
+    assert len(list(interp.iter_rule_trace_columns("edge"))) == 1
+
+    interp.atom_trace = False
+    Output("t").save_rule_trace(interp, str(tmp_path))
+    saved = pd.read_csv(tmp_path / "rule_trace_nodes_t.csv")
+    assert list(saved["Time"]) == [0, 1, 2, 3]
+    assert list(saved["New Bound"]) == ["[0.1,0.2]", "[0.5,1.0]", "[0.5,1.0]", "[0.0,1.0]"]
+
+
+def test_rule_trace_spill_writes_the_atom_trace_with_its_changes(tmp_path, monkeypatch):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    monkeypatch.setattr(interpretation.interval, "closed", lambda lower, upper: _Interval(lower, upper))
+    interp = build_dummy(False)
+    interp.rule_trace_spill_folder = str(tmp_path)
+    interp.rule_trace_node = interpretation._new_rule_trace_node()
+    interp.rule_trace_edge = interpretation._new_rule_trace_edge()
+    interp.rule_trace_node_atoms, interp.rule_trace_edge_atoms = new_rule_trace_atoms(), new_rule_trace_atoms()
+    interp.atom_trace = True
+    interp.iter_rule_trace_atoms = MethodType(interpretation.Interpretation.iter_rule_trace_atoms, interp)
+    interp.get_rule_trace_atoms = MethodType(interpretation.Interpretation.get_rule_trace_atoms, interp)
+    interp.get_rule_trace_num_clauses = MethodType(interpretation.Interpretation.get_rule_trace_num_clauses, interp)
+    l1 = DummyLabel("L1")
+    for i, (qn, name) in enumerate([([["n1"], ["n2", "n3"]], "r1"), ([["n2"]], "r2")]):
+        interpretation._append_rule_trace(interp.rule_trace_node, i, 0, f"n{i}", l1, DummyBound(0.5, 1), name)
+        update_rule_trace(interp.rule_trace_node_atoms, qn, [[] for _ in qn], _Interval(0, 0.5 * i), name)
+    interpretation._spill_rule_trace(interp.rule_trace_node[0], interp.rule_trace_node_atoms[0], interp.rule_trace_spill_folder, "node")
+    assert len(interp.rule_trace_node_atoms[0]) == 0
+    interpretation._append_rule_trace(interp.rule_trace_node, 2, 0, "n1", l1, DummyBound(1, 1), "r2")
+    update_rule_trace(interp.rule_trace_node_atoms, [["n2", "n3"]], [[]], _Interval(0.5, 1), "r2")
+
+    # The spilled rows come back with their groundings, old bounds and names, one chunk per chunk of the columns
+    chunks = list(interp.iter_rule_trace_atoms("node"))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    rows = interp.get_rule_trace_atoms("node")
+    assert [row[0] for row in rows] == [[["n1"], ["n2", "n3"]], [["n2"]], [["n2", "n3"]]]
+    assert [(row[2].lower, row[2].upper, row[3]) for row in rows] == [(0, 0, "r1"), (0, 0.5, "r2"), (0.5, 1, "r2")]
+    assert interp.get_rule_trace_num_clauses("node") == 2
+
+    Output("t").save_rule_trace(interp, str(tmp_path))
+    saved = pd.read_csv(tmp_path / "rule_trace_nodes_t.csv")
+    assert list(saved["Old Bound"]) == ["[0.0,0.0]", "[0.0,0.5]", "[0.5,1.0]"]
+    assert list(saved["Occurred Due To"]) == ["r1", "r2", "r2"]
+    assert list(saved["Clause-2"].fillna("-")) == ["['n2', 'n3']", "-", "-"]
+
+
 # ---- get_final_num_ground_atoms / query tests ----
 
+def build_temporal_query_dummy(persistent):
+    # n1 has L1 [0.1,0.2] at t=0 and [0.5,0.6] at t=2, the current state (t=3) is [0.9,1]
+    interp = build_dummy(persistent)
+    interp.time = 3
+    interpretation._append_rule_trace(interp.rule_trace_node, 2, 1, "n1", DummyLabel("L1"), DummyBound(0.5, 0.6), "")
+    ga = build_ga_dummy()
+    interp.interpretations_node = ga.interpretations_node
+    interp.interpretations_edge = ga.interpretations_edge
+    interp.interpretations_node["n1"].world = {DummyLabel("L1"): _Interval(0.9, 1)}
+    interp.store_interpretation_changes = True
+    return interp
+
+
+@pytest.mark.parametrize(
+    "persistent, t, expected",
+    [
+        (False, 0, (0.1, 0.2)),
+        (False, 1, (0, 1)),
+        (False, 2, (0.5, 0.6)),
+        (True, 1, (0.1, 0.2)),
+        (True, 2, (0.5, 0.6)),
+        (True, 3, (0.9, 1)),
+        (True, None, (0.9, 1)),
+    ],
+)
+def test_query_at_timestep(persistent, t, expected):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_temporal_query_dummy(persistent)
+    q = DummyQuery("node", "n1", DummyLabel("L1"), DummyBound(0, 1))
+    assert interpretation.Interpretation.query(interp, q, return_bool=False, t=t) == expected
+    assert interpretation.Interpretation.query(interp, q, t=t) is (expected != (0, 1))
+    # Bounds that are not satisfied
+    q._bnd = DummyBound(0.95, 1)
+    assert interpretation.Interpretation.query(interp, q, return_bool=False, t=t) == ((0, 0) if expected != (0, 1) else (0, 1))
+
+
+def test_query_at_timestep_checks_component_and_range():
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_temporal_query_dummy(True)
+    assert interpretation.Interpretation.query(interp, DummyQuery("node", "nX", DummyLabel("L1"), DummyBound(0, 1)), t=0) is False
+    assert interpretation.Interpretation.query(interp, DummyQuery("edge", ("n1", "n2"), DummyLabel("L2"), DummyBound(0, 1)), t=1) is True
+    assert interpretation.Interpretation.query(interp, DummyQuery("edge", ("n1", "n2"), DummyLabel("L2"), DummyBound(0, 1)), return_bool=False, t=2) == (0.3, 0.4)
+    with pytest.raises(ValueError):
+        interpretation.Interpretation.query(interp, DummyQuery("node", "n1", DummyLabel("L1"), DummyBound(0, 1)), t=4)
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_query_at_timestep_answers_static_atoms_missing_from_the_trace(persistent):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_temporal_query_dummy(persistent)
+    # A static graph attribute that was not saved to the rule trace, and a static atom set at t=1 that was
+    attribute, fact = _Interval(1, 1), _Interval(0.7, 0.8)
+    attribute.set_static(True)
+    fact.set_static(True)
+    interp.interpretations_node["n1"].world.update({DummyLabel("G"): attribute, DummyLabel("S"): fact})
+    interpretation._append_rule_trace(interp.rule_trace_node, 1, 0, "n1", DummyLabel("S"), DummyBound(0.7, 0.8), "")
+    g = DummyQuery("node", "n1", DummyLabel("G"), DummyBound(1, 1))
+    s = DummyQuery("node", "n1", DummyLabel("S"), DummyBound(0, 1))
+    for t in (0, 1, 2, None):
+        assert interpretation.Interpretation.query(interp, g, t=t) is True
+        assert interpretation.Interpretation.query(interp, g, return_bool=False, t=t) == (1, 1)
+    assert interpretation.Interpretation.query(interp, s, t=0) is False
+    assert [interpretation.Interpretation.query(interp, s, return_bool=False, t=t) for t in (1, 2)] == [(0.7, 0.8)] * 2
+    # The attribute is only answered by queries, get_dict lists the rule trace
+    assert "G" not in interpretation.Interpretation.get_dict(interp)[1]["n1"]
+
+
+def test_query_at_past_timestep_needs_the_stored_rule_trace():
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_temporal_query_dummy(True)
+    interp.store_interpretation_changes = False
+    q = DummyQuery("node", "n1", DummyLabel("L1"), DummyBound(0, 1))
+    with pytest.raises(ValueError):
+        interpretation.Interpretation.query(interp, q, t=0)
+    assert interpretation.Interpretation.query(interp, q, return_bool=False, t=3) == (0.9, 1)
+
+
+QUERY_MANY_ATOMS = [
+    ("node", "nX", "L1"),
+    ("node", "n1", "missing"),
+    ("node", "n1", "L1"),
+    ("edge", ("nX", "nY"), "L2"),
+    ("edge", ("n1", "n2"), "missing"),
+    ("edge", ("n1", "n2"), "L2"),
+]
+
+
+def _query_many_queries(label):
+    # Every atom with a bound that holds and one that does not, asked twice
+    queries = [DummyQuery(ct, comp, label(pred), bnd) for ct, comp, pred in QUERY_MANY_ATOMS for bnd in (DummyBound(0, 1), DummyBound(0.35, 0.95))]
+    return queries + queries[::-1]
+
+
+def _query_many_arrays(queries):
+    # The same queries as arrays of (component, predicate, lower, upper)
+    return (
+        interpretation._to_object_array([q.get_component() for q in queries]),
+        np.array([q.get_predicate().get_value() for q in queries]),
+        np.array([q.get_bounds().lower for q in queries]),
+        np.array([q.get_bounds().upper for q in queries]),
+    )
+
+
+def test_query_many_matches_query(monkeypatch):
+    monkeypatch.setattr(interpretation.interval, "closed", lambda lo, up: _Interval(lo, up))
+    interp = build_query_dummy()
+    interp.query = MethodType(interpretation.Interpretation.query, interp)
+    for interpretations in (interp.interpretations_node, interp.interpretations_edge):
+        for world in (interpretations[0] if interpretation.__name__.endswith("_fp") else interpretations).values():
+            world.world = {label.Label(name): bnd for name, bnd in world.world.items()}
+    queries = _query_many_queries(label.Label)
+    for return_bool in (True, False):
+        expected = [interpretation.Interpretation.query(interp, q, return_bool=return_bool) for q in queries]
+        result = interpretation.Interpretation.query_many(interp, queries, return_bool=return_bool)
+        assert result.tolist() == ([list(e) for e in expected] if not return_bool else expected)
+    assert interpretation.Interpretation.query_many(interp, [], return_bool=False).shape == (0, 2)
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_query_many_at_timestep_matches_query(persistent):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_temporal_query_dummy(persistent)
+    interp.interpretations_node["n1"].world = {label.Label("L1"): _Interval(0.9, 1)}
+    interp.interpretations_edge[("n1", "n2")].world = {label.Label("L2"): _Interval(0.3, 0.4)}
+    queries = _query_many_queries(label.Label)
+    for t in (0, 1, 2, 3, None):
+        for return_bool in (True, False):
+            expected = [interpretation.Interpretation.query(interp, q, return_bool=return_bool, t=t) for q in queries]
+            result = interpretation.Interpretation.query_many(interp, queries, t=t, return_bool=return_bool)
+            assert result.tolist() == ([list(e) for e in expected] if not return_bool else expected)
+            # The array form gives the same answers
+            result = interpretation.Interpretation.query_many(interp, _query_many_arrays(queries), t=t, return_bool=return_bool)
+            assert result.tolist() == ([list(e) for e in expected] if not return_bool else expected)
+    with pytest.raises(ValueError):
+        interpretation.Interpretation.query_many(interp, queries, t=4)
+
+
+def test_query_many_at_timestep_answers_static_atoms_and_needs_the_stored_rule_trace():
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    interp = build_temporal_query_dummy(False)
+    attribute = _Interval(1, 1)
+    attribute.set_static(True)
+    interp.interpretations_node["n1"].world = {label.Label("L1"): _Interval(0.9, 1), label.Label("G"): attribute}
+    arrays = (["n1", "n1", "nX"], ["G", "L1", "G"], [1, 0, 1], [1, 1, 1])
+    assert [interpretation.Interpretation.query_many(interp, arrays, t=t).tolist() for t in (0, 1, 3)] == [
+        [True, True, False], [True, False, False], [True, True, False]]
+    interp.store_interpretation_changes = False
+    with pytest.raises(ValueError):
+        interpretation.Interpretation.query_many(interp, arrays, t=0)
+    assert interpretation.Interpretation.query_many(interp, arrays).tolist() == [True, True, False]
+
+
 def test_get_final_num_ground_atoms():
     module = interpretation
     interp = build_ga_dummy()
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import networkx as nx
 from types import MethodType
 from tests.unit.disable_jit.interpretations.test_interpretation_common import get_interpretation_helpers
@@ -44,21 +45,25 @@ def shim_types(monkeypatch):
     monkeypatch.setattr(interpretation.interval, "closed", lambda lo, up: (lo, up))
 
 
-# ---- _init_reverse_neighbors tests ----
+# ---- _init_neighbors tests ----
 
-def test_init_reverse_neighbors_branches(shim_types):
-    neighbors = {
-        "n1": ["n2", "n2"],
-        "n2": ["n3"],
-        "n3": ["n2"],
-        "n4": [],
-    }
-    rev = init_reverse_neighbors(neighbors)
-    assert rev == {"n2": ["n1", "n3"], "n1": [], "n3": ["n2"], "n4": []}
+def test_init_neighbors_from_csr(shim_types):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    # n1 -> n2, n2 -> n3, n3 -> n2 and n1, n4 has no edges
+    nodes = ["n1", "n2", "n3", "n4"]
+    indptr = np.array([0, 1, 2, 4, 4])
+    indices = np.array([1, 2, 1, 0])
+    neighbors, rev = init_neighbors(nodes, indptr, indices)
+    assert neighbors == {"n1": ["n2"], "n2": ["n3"], "n3": ["n2", "n1"], "n4": []}
+    assert rev == {"n1": ["n3"], "n2": ["n1", "n3"], "n3": ["n2"], "n4": []}
 
 
-def test_init_reverse_neighbors_empty(shim_types):
-    assert init_reverse_neighbors({}) == {}
+def test_init_neighbors_empty(shim_types):
+    if interpretation.__name__.endswith("_fp"):
+        pytest.skip("interpretation backend only")
+    neighbors, rev = init_neighbors([], np.array([0]), np.array([], dtype=np.int64))
+    assert neighbors == {} and rev == {}
 
 
 # ---- Interpretation __init__ neighbor tests ----
@@ -85,6 +90,27 @@ def test_interpretation_init_neighbors(shim_types):
     assert set(interp.reverse_neighbors["n2"]) == {"n1"}
 
 
+def test_interpretation_init_neighbors_directed(shim_types):
+    g = nx.DiGraph()
+    g.add_edges_from([("a", "b"), ("a", "c"), ("c", "b"), ("d", "a")])
+    g.add_node("e")
+    interp = interpretation.Interpretation(
+        g,
+        {},
+        {},
+        {},
+        False,
+        False,
+        False,
+        False,
+        False,
+        0,
+        False,
+    )
+    assert interp.neighbors == {"a": ["b", "c"], "b": [], "c": ["b"], "d": ["a"], "e": []}
+    assert interp.reverse_neighbors == {"a": ["d"], "b": ["a", "c"], "c": ["a"], "d": [], "e": []}
+
+
 # ---- _init_interpretations_node tests ----
 
 def test_init_interpretations_node_populates(shim_types):
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from unittest.mock import Mock
 
 pytestmark = pytest.mark.usefixtures("helpers_fixture")
@@ -11,6 +12,7 @@ def test_reason_resets_non_persistent(monkeypatch, reason_env):
     class ResetInterval:
         def __init__(self):
             self.reset_called = False
+            self.lower, self.upper = 0.2, 0.8
 
         def copy(self):
             return ResetInterval()
@@ -94,6 +96,7 @@ def test_reason_resets_edge_non_persistent(monkeypatch, reason_env):
     class ResetInterval:
         def __init__(self):
             self.reset_called = False
+            self.lower, self.upper = 0.2, 0.8
 
         def copy(self):
             return ResetInterval()
@@ -116,6 +119,67 @@ def test_reason_resets_edge_non_persistent(monkeypatch, reason_env):
     assert bnd.reset_called
 
 
+def test_reason_reset_skips_unchanged_atoms(monkeypatch, reason_env):
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    class ResetInterval:
+        def __init__(self):
+            self.reset_cnt = 0
+            self.lower, self.upper = 0.2, 0.8
+
+        def is_static(self):
+            return False
+
+        def reset(self):
+            self.reset_cnt += 1
+
+    reason_env["facts_to_be_applied_node"].clear()
+    bnd = ResetInterval()
+    reason_env["interpretations_node"][0][reason_env["node"]].world[reason_env["label"]] = bnd
+
+    reason_env["run"](tmax=2)
+
+    assert bnd.reset_cnt == 0
+
+
+def test_reset_interpretations_resets_changed_atoms_until_settled():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    class Bound:
+        def __init__(self, lower, upper, static=False):
+            self.lower, self.upper = lower, upper
+            self.prev = None
+            self.static = static
+
+        def is_static(self):
+            return self.static
+
+        def reset(self):
+            self.prev = (self.lower, self.upper)
+            self.lower, self.upper = 0, 1
+
+    class W:
+        def __init__(self, world):
+            self.world = world
+
+    changed, unknown, static = Bound(0.5, 0.7), Bound(0, 1), Bound(1, 1, static=True)
+    interpretations = {"a": W({"L": changed}), "b": W({"L": unknown}), "c": W({"L": static})}
+    reset_interpretations = interpretation._reset_interpretations
+
+    dirty = reset_interpretations(interpretations, {"L": ["a", "b", "a", "c"]})
+
+    # Atoms are reset once even if they changed several times, static atoms are left alone
+    assert (changed.lower, changed.upper, changed.prev) == (0, 1, (0.5, 0.7))
+    assert unknown.prev == (0, 1)
+    assert static.prev is None
+    # Only atoms whose previous bound is not [0,1] yet need another reset
+    assert list(dirty) == ["L"] and list(dirty["L"]) == ["a"]
+    assert len(reset_interpretations(interpretations, dirty)) == 0
+    assert changed.prev == (0, 1)
+
+
 def test_reason_delta_bound_convergence(monkeypatch, reason_env):
     if interpretation.__name__.endswith("interpretation_fp"):
         pytest.skip("interpretation backend only")
@@ -213,7 +277,12 @@ def test_reason_applies_applicable_node_rule_with_trace_and_delta_zero(monkeypat
 
     monkeypatch.setattr(interpretation, "check_consistent_node", lambda *a, **k: True)
 
-    mock_update = Mock(return_value=(True, 0))
+    # Record the updated atom in the semi-naive delta like the real _update_node does
+    def update_node(interpretations, predicate_map, comp, na, *args, **kwargs):
+        kwargs["delta"][na[0]] = [comp]
+        return True, 0
+
+    mock_update = Mock(side_effect=update_node)
     monkeypatch.setattr(interpretation, "_update_node", mock_update)
 
     class Rule:
@@ -223,6 +292,9 @@ def test_reason_applies_applicable_node_rule_with_trace_and_delta_zero(monkeypat
         def get_target(self):
             return reason_env["label"]
 
+        def get_clauses(self):
+            return [("node", reason_env["label"], ["x"], reason_env["bnd"], "")]
+
         def is_static_rule(self):
             return False
 
@@ -254,6 +326,58 @@ def test_reason_applies_applicable_node_rule_with_trace_and_delta_zero(monkeypat
     assert mock_ground.call_args_list[0].args[9] is True
 
 
+def test_reason_semi_naive_skips_rule_with_unchanged_body(monkeypatch, reason_env):
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    monkeypatch.setattr(interpretation, "check_consistent_node", lambda *a, **k: True)
+
+    def update_node(interpretations, predicate_map, comp, na, *args, **kwargs):
+        kwargs["delta"][na[0]] = [comp]
+        return True, 0
+
+    monkeypatch.setattr(interpretation, "_update_node", Mock(side_effect=update_node))
+
+    class Rule:
+        def __init__(self, body_label):
+            self._body_label = body_label
+
+        def get_delta(self):
+            return 0
+
+        def get_target(self):
+            return reason_env["label"]
+
+        def get_clauses(self):
+            return [("node", self._body_label, ["x"], reason_env["bnd"], "")]
+
+        def is_static_rule(self):
+            return False
+
+        def get_name(self):
+            return "r"
+
+        def get_weights(self):
+            return ()
+
+    # The first rule derives L, the second one only depends on a label that never changes
+    other_label = type(reason_env["label"])("Other")
+    reason_env["rules"] = [Rule(reason_env["label"]), Rule(other_label)]
+
+    applicable_rule = (reason_env["node"], [], [], [], None)
+    mock_ground = Mock(side_effect=[([applicable_rule], []), ([], []), ([], [])])
+    monkeypatch.setattr(interpretation, "_ground_rule", mock_ground)
+    monkeypatch.setattr(interpretation, "annotate", Mock(return_value=(0.0, 1.0)))
+    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u, static=False: reason_env["bnd"].copy())
+
+    fp, _ = reason_env["run"](convergence_mode="delta_interpretation", convergence_delta=0)
+
+    # Both rules are grounded in the first pass, only the first one in the second pass
+    assert fp == 2
+    assert mock_ground.call_count == 3
+    assert [c.args[0] for c in mock_ground.call_args_list] == [reason_env["rules"][0], reason_env["rules"][1], reason_env["rules"][0]]
+
+
 
 def test_reason_skips_static_node_rule(monkeypatch, reason_env):
     if interpretation.__name__.endswith("interpretation_fp"):
@@ -456,3 +580,301 @@ def test_check_edge_grounding_threshold_satisfaction_branches(
     )
 
     assert result is expected
+
+
+def test_rule_dependency_index_selects_affected_rules(monkeypatch, reason_env):
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    class Rule:
+        def __init__(self, clauses):
+            self._clauses = clauses
+
+        def get_clauses(self):
+            return self._clauses
+
+    Label = type(reason_env["label"])
+    a, b, e = Label("a"), Label("b"), Label("e")
+    rules = [
+        Rule([("node", a, ["x"], None, ""), ("edge", e, ["x", "y"], None, ""), ("node", a, ["y"], None, "")]),
+        Rule([("node", b, ["x"], None, "")]),
+        Rule([("comparison", b, ["x"], None, ">")]),
+    ]
+    rules_by_label_node, rules_by_label_edge = {}, {}
+    interpretation._init_rule_dependency_index(rules, rules_by_label_node, rules_by_label_edge)
+
+    assert rules_by_label_node == {a: [0], b: [1]}
+    assert rules_by_label_edge == {e: [0]}
+
+    get_affected_rules = getattr(interpretation._get_affected_rules, "py_func", interpretation._get_affected_rules)
+    assert list(get_affected_rules(rules_by_label_node, rules_by_label_edge, {b: ["n"], a: ["n"]}, {})) == [0, 1]
+    assert list(get_affected_rules(rules_by_label_node, rules_by_label_edge, {}, {e: [("n", "m")]})) == [0]
+    assert list(get_affected_rules(rules_by_label_node, rules_by_label_edge, {Label("c"): ["n"]}, {})) == []
+
+
+def test_comparison_clauses_are_grounded_from_numeric_index(monkeypatch, reason_env):
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    Label = type(reason_env["label"])
+    assert interpretation._parse_numeric_label("age-35") == ("age", 35.0, True)
+    assert interpretation._parse_numeric_label("temp--2.5") == ("temp", -2.5, True)
+    assert interpretation._parse_numeric_label("a-b")[2] is False
+    assert interpretation._parse_comparison(">=30") == (">=", 30.0, True)
+    assert interpretation._parse_comparison(">")[2] is False
+
+    predicate_map = {Label("age-40"): ["c"], Label("age-25"): ["a"], Label("age-35"): ["b", "e"], Label("other"): ["a"]}
+    numeric_index, seen = {}, {}
+    interpretation._update_numeric_index(numeric_index, seen, predicate_map)
+    values, labels = numeric_index[Label("age")]
+    assert list(values) == [25.0, 35.0, 40.0]
+    assert labels == [Label("age-25"), Label("age-35"), Label("age-40")]
+
+    # New labels are merged into the sorted column
+    predicate_map[Label("age-30")] = ["d"]
+    interpretation._update_numeric_index(numeric_index, seen, predicate_map)
+    assert list(numeric_index[Label("age")][0]) == [25.0, 30.0, 35.0, 40.0]
+
+    # Atoms whose label does not satisfy the clause bound are in the grounding but do not qualify
+    monkeypatch.setattr(interpretation, "is_satisfied_node", lambda interpretations, n, na: n != "e")
+    def ground(op, groundings):
+        grounding, qualified = interpretation.get_qualified_node_comparison_groundings({}, predicate_map, numeric_index, groundings, "x", Label("age"), None, op)
+        return list(grounding), list(qualified)
+
+    assert ground(">30", {}) == (["b", "e", "c"], ["b", "c"])
+    assert ground("<=30", {}) == (["a", "d"], ["a", "d"])
+    assert ground("!=35", {}) == (["a", "d", "c"], ["a", "d", "c"])
+    # A variable that is already grounded keeps its order
+    assert ground(">=30", {"x": ["c", "a", "d"]}) == (["c", "d"], ["c", "d"])
+
+    # Rules with a comparison on an attribute are affected by its numeric labels
+    class Rule:
+        def __init__(self, clauses):
+            self._clauses = clauses
+
+        def get_clauses(self):
+            return self._clauses
+
+    rules_by_label_node, rules_by_label_edge = {}, {}
+    interpretation._init_rule_dependency_index([Rule([("comparison", Label("age"), ["x"], None, ">30")])], rules_by_label_node, rules_by_label_edge)
+    get_affected_rules = getattr(interpretation._get_affected_rules, "py_func", interpretation._get_affected_rules)
+    assert list(get_affected_rules(rules_by_label_node, rules_by_label_edge, {Label("age-50"): ["n"]}, {})) == [0]
+    assert list(get_affected_rules(rules_by_label_node, rules_by_label_edge, {Label("height-50"): ["n"]}, {})) == []
+
+
+def test_fact_schedule_keeps_insertion_order_with_standing_facts():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    facts = [
+        (0, "a", "L", "b0", True, False),
+        (1, "b", "L", "b1", False, False),
+        (3, "c", "L", "b2", False, False),
+        (1, "d", "L", "b3", False, False),
+    ]
+    facts_by_t = {}
+    interpretation._schedule_by_time(facts, facts_by_t, 0, 1)
+
+    # Facts before the starting timestep are never applied
+    assert sorted(facts_by_t) == [1, 3]
+    assert list(interpretation._get_due_facts(facts_by_t, [0], 1)) == [0, 1, 3]
+    assert list(interpretation._get_due_facts(facts_by_t, [0], 2)) == [0]
+    assert list(interpretation._get_due_facts(facts_by_t, [], 3)) == [2]
+    assert len(facts_by_t) == 0
+
+
+def test_remove_applied_facts_keeps_static_and_future_facts():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    facts = [
+        (0, "a", "L", "b0", True, False),
+        (1, "b", "L", "b1", False, False),
+        (3, "c", "L", "b2", False, False),
+    ]
+    trace = ["fa", "fb", "fc"]
+
+    interpretation._remove_applied_facts(facts, trace, 0, 2, True)
+
+    assert facts == [(2, "a", "L", "b0", True, False), (3, "c", "L", "b2", False, False)]
+    assert trace == ["fa", "fc"]
+
+
+def test_rule_queue_is_scheduled_and_compacted_in_place():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    rules = [
+        (1, "a", "L", "b0", False),
+        (2, "b", "L", "b1", False),
+        (1, "c", "L", "b2", False),
+    ]
+    trace = ["ra", "rb", "rc"]
+    edges_to_add = [("sa",), ("sb",), ("sc",)]
+    rules_by_t = {}
+    interpretation._schedule_by_time(rules, rules_by_t, 0, 1)
+    assert rules_by_t == {1: [0, 2], 2: [1]}
+
+    # Newly appended rules are added to the schedule from their position onwards
+    rules.append((2, "d", "L", "b3", False))
+    trace.append("rd")
+    edges_to_add.append(("sd",))
+    interpretation._schedule_by_time(rules, rules_by_t, 3, 1)
+    assert rules_by_t == {1: [0, 2], 2: [1, 3]}
+
+    interpretation._remove_applied_rules(rules, trace, edges_to_add, rules_by_t, 1, 2, True)
+
+    assert rules == [(2, "b", "L", "b1", False), (2, "d", "L", "b3", False)]
+    assert trace == ["rb", "rd"]
+    assert edges_to_add == [("sb",), ("sd",)]
+    assert rules_by_t == {2: [0, 1]}
+
+
+def test_plan_grounding_work_splits_heavy_rules_into_chunks():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    rule_costs = np.array([10, 5000, 0, 300])
+
+    # A single thread grounds every rule whole
+    work, split_rules = interpretation._plan_grounding_work([0, 1, 3], rule_costs, 1)
+    assert list(work) == [(0, 0, 1, -1), (1, 0, 1, -1), (3, 0, 1, -1)]
+    assert list(split_rules) == []
+    # With more threads only the rule that is heavier than a thread's share is split, in order. Its chunks share one body
+    work, split_rules = interpretation._plan_grounding_work([0, 1, 3], rule_costs, 4)
+    assert list(work) == [(0, 0, 1, -1), (1, 0, 4, 0), (1, 1, 4, 0), (1, 2, 4, 0), (1, 3, 4, 0), (3, 0, 1, -1)]
+    assert list(split_rules) == [1]
+    # Rules that are too small are never split
+    work, split_rules = interpretation._plan_grounding_work([0, 2], rule_costs, 4)
+    assert list(work) == [(0, 0, 1, -1), (2, 0, 1, -1)]
+
+    # The chunks cover the head groundings exactly once
+    bounds = [interpretation._get_chunk_bounds(10, c, 4) for c in range(4)]
+    assert bounds == [(0, 2), (2, 5), (5, 7), (7, 10)]
+
+
+def test_estimate_head_groundings_from_label_cardinalities():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    class EstimateRule:
+        def __init__(self, rtype, head_vars, clauses, edges=("", "", "h")):
+            self.rtype, self.head_vars, self.clauses, self.edges = rtype, head_vars, clauses, edges
+        def get_type(self): return self.rtype
+        def get_head_variables(self): return self.head_vars
+        def get_clauses(self): return self.clauses
+        def get_edges(self): return self.edges
+
+    predicate_map_node = {"hub": ["h"] * 3, "person": ["p"] * 1000}
+    predicate_map_edge = {"Friends": [("p", "q")] * 5000}
+
+    # A node rule is bounded by the most selective clause on its head variable, even if it emits few heads
+    rule = EstimateRule("node", ["x"], [("node", "person", ["x"], None, ""), ("edge", "Friends", ["x", "y"], None, ""), ("node", "hub", ["y"], None, "")])
+    assert interpretation._estimate_head_groundings(rule, predicate_map_node, predicate_map_edge, 1000, 5000) == 1000
+    # Edge rules without inferred edges are bounded by the edges of the graph, with inferred edges every pair counts
+    rule = EstimateRule("edge", ["x", "y"], [("node", "person", ["x"], None, ""), ("node", "person", ["y"], None, "")])
+    assert interpretation._estimate_head_groundings(rule, predicate_map_node, predicate_map_edge, 1000, 5000) == 5000
+    rule.edges = ("x", "y", "h")
+    assert interpretation._estimate_head_groundings(rule, predicate_map_node, predicate_map_edge, 1000, 5000) == 1000000
+    # Unbound head variables are ground atoms and comparison clauses are left out
+    rule = EstimateRule("node", ["a"], [("comparison", "age", ["a"], None, ">30")])
+    assert interpretation._estimate_head_groundings(rule, predicate_map_node, predicate_map_edge, 1000, 5000) == 1
+
+
+def test_plan_clause_order_starts_from_most_selective_clause():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    default = ("greater_equal", ("number", "total"), 1.0)
+    clauses = [
+        ("node", "popular", ["y"], None, ""),
+        ("edge", "Friends", ["x", "y"], None, ""),
+        ("node", "rare", ["x"], None, ""),
+    ]
+    predicate_map_node = {"popular": list(range(50)), "rare": [1]}
+    predicate_map_edge = {"Friends": [(i, i + 1) for i in range(200)]}
+
+    # The rare label comes first, then the edge from the bound variable, and the popular clause last
+    order = interpretation._plan_clause_order(clauses, [default] * 3, predicate_map_node, predicate_map_edge, 100, 200)
+    assert list(order) == [2, 1, 0]
+
+    # Plans follow the cardinalities as they change
+    predicate_map_node["popular"] = [0]
+    order = interpretation._plan_clause_order(clauses, [default] * 3, predicate_map_node, predicate_map_edge, 100, 200)
+    assert list(order) == [0, 2, 1]
+
+    # Custom thresholds depend on the clause order, so those rules are not reordered
+    custom = [default, ("greater_equal", ("percent", "total"), 100.0), default]
+    order = interpretation._plan_clause_order(clauses, custom, predicate_map_node, predicate_map_edge, 100, 200)
+    assert list(order) == [0, 1, 2]
+
+
+def test_parallel_apply_groups_by_component_and_merges_in_order():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    rules = [
+        (0, "a", "L", "b0", False),
+        (0, "b", "L", "b1", False),
+        (0, "a", "M", "b2", False),
+        (0, "c", "L", "b3", False),
+    ]
+    order, ranges, range_of = interpretation._group_updates_by_component(rules, [3, 0, 1, 2], 2)
+
+    # The updates of a component stay together and in order, and a component is never split between two ranges
+    assert list(order) == [0, 1, 3, 2]
+    assert list(ranges) == [0, 3, 4]
+    assert list(range_of) == [0, 0, 1, 0]
+    # There are never more ranges than components
+    order, more_ranges, _ = interpretation._group_updates_by_component(rules, [3, 0, 1, 2], 8)
+    assert list(more_ranges) == [0, 1, 3, 4]
+
+    # The entries made in each range are put back in the order of the updates
+    class Bnd:
+        def __init__(self, lower, upper):
+            self.lower, self.upper = lower, upper
+
+        def copy(self):
+            return Bnd(self.lower, self.upper)
+
+    # Each range traces into its own stores, with its own tables and grounding blocks
+    updates = [[("c", "n1", "x")], [("a1", "n2", "y"), ("a2", "n1", "x")], [("b", "n2", "y")], [("a3", "n3", "z")]]
+    l = label.Label("L")
+    traces = [interpretation._new_rule_trace_node() for _ in range(2)]
+    atoms = [([], interpretation._new_provenance()) for _ in range(2)]
+    start, cnt = np.zeros(4, dtype=np.int64), np.zeros(4, dtype=np.int64)
+    for k in [0, 1, 3, 2]:
+        r = range_of[k]
+        start[k] = interpretation._rule_trace_len(traces[r])
+        for name, comp, grounding in updates[k]:
+            interpretation._append_rule_trace(traces[r], 0, interpretation._rule_trace_len(traces[r]), comp, l, Bnd(0.5, 1), name)
+            interpretation._update_rule_trace(atoms[r], [[grounding]], [[]], Bnd(0, 1), name)
+        cnt[k] = interpretation._rule_trace_len(traces[r]) - start[k]
+
+    trace, trace_atoms = interpretation._new_rule_trace_node(), ([], interpretation._new_provenance())
+    interpretation._merge_rule_trace_buffers(trace, traces, start, cnt, range_of)
+    interpretation._merge_rule_trace_atoms_buffers(trace_atoms, atoms, start, cnt, range_of)
+
+    columns = interpretation._rule_trace_to_columns(trace)
+    assert list(columns['origins'][columns['origin']]) == ["c", "a1", "a2", "b", "a3"]
+    assert list(columns['components'][columns['component']]) == ["n1", "n2", "n1", "n2", "n3"]
+    assert list(columns['fp']) == [0, 1, 2, 0, 3]
+    rows = interpretation._resolve_rule_trace_atoms(trace_atoms)
+    assert [row[3] for row in rows] == ["c", "a1", "a2", "b", "a3"]
+    assert [row[0] for row in rows] == [[["x"]], [["y"]], [["x"]], [["y"]], [["z"]]]
+    # Groundings of different ranges are interned again in the shared blocks
+    assert rows[0][0][0] is rows[2][0][0] and rows[1][0][0] is rows[3][0][0]
+
+
+def test_adds_edges_detects_edge_inference():
+    if interpretation.__name__.endswith("interpretation_fp"):
+        pytest.skip("interpretation backend only")
+
+    class L:
+        def __init__(self, value):
+            self.value = value
+
+    edges_to_add = [([], [], L("")), (["x"], ["y"], L("")), ([], [], L("E"))]
+    assert not interpretation._adds_edges(edges_to_add, [0])
+    assert interpretation._adds_edges(edges_to_add, [0, 1])
+    assert interpretation._adds_edges(edges_to_add, [2])
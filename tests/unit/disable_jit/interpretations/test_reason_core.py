@@ -298,7 +298,7 @@ def test_reason_logs_static_fact(monkeypatch, reason_env):
     reason_env["interpretations_node"][0][node].world[label_] = static_bnd
     new_bnd = reason_env["bnd"].__class__(0.5, False)
     facts = [(0, node, label_, new_bnd, False, False)]
-    rule_trace = []
+    rule_trace = new_rule_trace()
 
     monkeypatch.setattr(interpretation, "check_consistent_node", lambda *a, **k: True)
 
@@ -309,7 +309,7 @@ def test_reason_logs_static_fact(monkeypatch, reason_env):
         prev_reasoning_data=[0, 1],
     )
 
-    assert rule_trace == [(0, 1, node, label_, new_bnd)]
+    assert rule_trace_rows(rule_trace) == [(0, 1, node, "L", 0.5, 0.5)]
     assert reason_env["interpretations_node"][0][node].world[label_] is static_bnd
 
 
@@ -323,9 +323,9 @@ def test_reason_static_fact_traces_and_requeues(reason_env):
     reason_env["interpretations_node"][0][node].world[other] = other_bnd
     new_bnd = reason_env["bnd"].__class__(0.2, False)
     facts = [(0, node, lbl, new_bnd, True, False)]
-    trace = [["x"]]
-    rule_trace = []
-    rule_trace_atoms = []
+    trace = ["x"]
+    rule_trace = new_rule_trace()
+    rule_trace_atoms = new_rule_trace_atoms()
     ipl = [(lbl, other)]
 
     reason_env["run"](
@@ -340,9 +340,9 @@ def test_reason_static_fact_traces_and_requeues(reason_env):
     )
 
     assert facts == [(1, node, lbl, new_bnd, True, False)]
-    assert trace == [["x"]]
-    assert rule_trace == [(0, 1, node, lbl, new_bnd), (0, 1, node, other, other_bnd)]
-    assert len(rule_trace_atoms) == 2
+    assert trace == ["x"]
+    assert rule_trace_rows(rule_trace) == [(0, 1, node, "L", new_bnd.lower, new_bnd.upper), (0, 1, node, "other", other_bnd.lower, other_bnd.upper)]
+    assert [row[3] for row in rule_trace_atom_rows(rule_trace_atoms)] == ["x", "x"]
     assert reason_env["interpretations_node"][0][node].world[lbl] is static_bnd
 
 
@@ -356,9 +356,9 @@ def test_reason_static_fact_traces_complement_second(reason_env):
     reason_env["interpretations_node"][0][node].world[other] = other_bnd
     new_bnd = reason_env["bnd"].__class__(0.4, False)
     facts = [(0, node, lbl, new_bnd, True, False)]
-    trace = [["z"]]
-    rule_trace = []
-    rule_trace_atoms = []
+    trace = ["z"]
+    rule_trace = new_rule_trace()
+    rule_trace_atoms = new_rule_trace_atoms()
     ipl = [(other, lbl)]
 
     reason_env["run"](
@@ -373,9 +373,9 @@ def test_reason_static_fact_traces_complement_second(reason_env):
     )
 
     assert facts == [(1, node, lbl, new_bnd, True, False)]
-    assert trace == [["z"]]
-    assert rule_trace == [(0, 1, node, lbl, new_bnd), (0, 1, node, other, other_bnd)]
-    assert len(rule_trace_atoms) == 2
+    assert trace == ["z"]
+    assert rule_trace_rows(rule_trace) == [(0, 1, node, "L", new_bnd.lower, new_bnd.upper), (0, 1, node, "other", other_bnd.lower, other_bnd.upper)]
+    assert [row[3] for row in rule_trace_atom_rows(rule_trace_atoms)] == ["z", "z"]
     assert reason_env["interpretations_node"][0][node].world[lbl] is static_bnd
 
 
@@ -595,7 +595,7 @@ def test_reason_static_edge_rule_trace_branches(
     interpretations_edge = {0: {edge: world}}
     edges = [edge]
     facts = [(0, edge, lbl, reason_env["bnd"], True, graph_attr)]
-    rule_trace = []
+    rule_trace = new_rule_trace("edge")
 
     reason_env["run"](
         edges=edges,
@@ -612,12 +612,12 @@ def test_reason_static_edge_rule_trace_branches(
     )
 
     if expect_trace:
-        assert rule_trace == [
-            (0, 1, edge, lbl, static_bnd),
-            (0, 1, edge, other, other_bnd),
+        assert rule_trace_rows(rule_trace) == [
+            (0, 1, edge, "L", 1.0, 1.0),
+            (0, 1, edge, "other", 0.5, 0.5),
         ]
     else:
-        assert rule_trace == []
+        assert rule_trace_rows(rule_trace) == []
     assert facts == [(1, edge, lbl, reason_env["bnd"], True, graph_attr)]
 
 
@@ -636,8 +636,8 @@ def test_reason_static_edge_atom_trace_complements(monkeypatch, reason_env):
     edges = [edge]
     facts = [(0, edge, lbl, reason_env["bnd"], True, False)]
     facts_trace = ["t"]
-    rule_trace = []
-    rule_trace_atoms = []
+    rule_trace = new_rule_trace("edge")
+    rule_trace_atoms = new_rule_trace_atoms()
     mock_update = Mock()
     monkeypatch.setattr(interpretation, "_update_rule_trace", mock_update)
 
@@ -657,10 +657,10 @@ def test_reason_static_edge_atom_trace_complements(monkeypatch, reason_env):
         prev_reasoning_data=[0, 1],
     )
 
-    assert rule_trace == [
-        (0, 1, edge, lbl, static_bnd),
-        (0, 1, edge, other1, o1_bnd),
-        (0, 1, edge, other2, o2_bnd),
+    assert rule_trace_rows(rule_trace) == [
+        (0, 1, edge, "L", 1.0, 1.0),
+        (0, 1, edge, "o1", 0.5, 0.5),
+        (0, 1, edge, "o2", 0.6, 0.6),
     ]
     assert facts == [(1, edge, lbl, reason_env["bnd"], True, False)]
     assert facts_trace == ["t"]
@@ -26,8 +26,8 @@ def test_is_satisfied_edge_comparison_missing_bounds():
 
 def test_resolve_inconsistency_node_rule_trace(monkeypatch):
     class SimpleInterval:
-        def __init__(self):
-            self.lower = self.upper = None
+        def __init__(self, lower=None, upper=None):
+            self.lower, self.upper = lower, upper
             self.static = False
 
         def set_lower_upper(self, l, u):
@@ -47,7 +47,7 @@ def test_resolve_inconsistency_node_rule_trace(monkeypatch):
         def empty_list(self, *args, **kwargs):
             return []
 
-    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval())
+    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval(l, u))
     monkeypatch.setattr(interpretation.numba.typed, "List", _ListShim())
     monkeypatch.setattr(interpretation.numba.types, "uint16", lambda x: x)
 
@@ -55,8 +55,8 @@ def test_resolve_inconsistency_node_rule_trace(monkeypatch):
     world = SimpleWorld()
     world.world[l] = SimpleInterval()
     interpretations = {"n1": world}
-    rule_trace = []
-    rule_trace_atoms = []
+    rule_trace = new_rule_trace()
+    rule_trace_atoms = new_rule_trace_atoms()
     rules_to_be_applied_trace = [([], [], "r")]
     facts_to_be_applied_trace = ["f"]
 
@@ -81,13 +81,13 @@ def test_resolve_inconsistency_node_rule_trace(monkeypatch):
     )
 
     assert mock_update.call_args[0][-1].endswith("r")
-    assert len(rule_trace) == 1
+    assert rule_trace_rows(rule_trace) == [(0, 0, "n1", "L", 0, 1)]
 
 
 def test_resolve_inconsistency_node_rule_trace_no_atom_trace(monkeypatch):
     class SimpleInterval:
-        def __init__(self):
-            self.lower = self.upper = None
+        def __init__(self, lower=None, upper=None):
+            self.lower, self.upper = lower, upper
             self.static = False
 
         def set_lower_upper(self, l, u):
@@ -107,7 +107,7 @@ def test_resolve_inconsistency_node_rule_trace_no_atom_trace(monkeypatch):
         def empty_list(self, *args, **kwargs):
             return []
 
-    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval())
+    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval(l, u))
     monkeypatch.setattr(interpretation.numba.typed, "List", _ListShim())
     monkeypatch.setattr(interpretation.numba.types, "uint16", lambda x: x)
 
@@ -115,7 +115,7 @@ def test_resolve_inconsistency_node_rule_trace_no_atom_trace(monkeypatch):
     world = SimpleWorld()
     world.world[l] = SimpleInterval()
     interpretations = {"n1": world}
-    rule_trace = []
+    rule_trace = new_rule_trace()
     rules_to_be_applied_trace = [([], [], "r")]
 
     mock_update = Mock()
@@ -131,7 +131,7 @@ def test_resolve_inconsistency_node_rule_trace_no_atom_trace(monkeypatch):
         0,
         False,
         rule_trace,
-        [],
+        new_rule_trace_atoms(),
         rules_to_be_applied_trace,
         ["f"],
         True,
@@ -139,13 +139,13 @@ def test_resolve_inconsistency_node_rule_trace_no_atom_trace(monkeypatch):
     )
 
     mock_update.assert_not_called()
-    assert len(rule_trace) == 1
+    assert rule_trace_rows(rule_trace) == [(0, 0, "n1", "L", 0, 1)]
 
 
 def test_resolve_inconsistency_edge_rule_trace(monkeypatch):
     class SimpleInterval:
-        def __init__(self):
-            self.lower = self.upper = None
+        def __init__(self, lower=None, upper=None):
+            self.lower, self.upper = lower, upper
             self.static = False
 
         def set_lower_upper(self, l, u):
@@ -165,7 +165,7 @@ def test_resolve_inconsistency_edge_rule_trace(monkeypatch):
         def empty_list(self, *args, **kwargs):
             return []
 
-    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval())
+    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval(l, u))
     monkeypatch.setattr(interpretation.numba.typed, "List", _ListShim())
     monkeypatch.setattr(interpretation.numba.types, "uint16", lambda x: x)
 
@@ -173,8 +173,8 @@ def test_resolve_inconsistency_edge_rule_trace(monkeypatch):
     world = SimpleWorld()
     world.world[l] = SimpleInterval()
     interpretations = {("a", "b"): world}
-    rule_trace = []
-    rule_trace_atoms = []
+    rule_trace = new_rule_trace("edge")
+    rule_trace_atoms = new_rule_trace_atoms()
     rules_to_be_applied_trace = [([], [], "r")]
     facts_to_be_applied_trace = ["f"]
 
@@ -199,13 +199,13 @@ def test_resolve_inconsistency_edge_rule_trace(monkeypatch):
     )
 
     assert mock_update.call_args[0][-1].endswith("r")
-    assert len(rule_trace) == 1
+    assert rule_trace_rows(rule_trace) == [(0, 0, ("a", "b"), "L", 0, 1)]
 
 
 def test_resolve_inconsistency_edge_rule_trace_no_atom_trace(monkeypatch):
     class SimpleInterval:
-        def __init__(self):
-            self.lower = self.upper = None
+        def __init__(self, lower=None, upper=None):
+            self.lower, self.upper = lower, upper
             self.static = False
 
         def set_lower_upper(self, l, u):
@@ -225,7 +225,7 @@ def test_resolve_inconsistency_edge_rule_trace_no_atom_trace(monkeypatch):
         def empty_list(self, *args, **kwargs):
             return []
 
-    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval())
+    monkeypatch.setattr(interpretation.interval, "closed", lambda l, u: SimpleInterval(l, u))
     monkeypatch.setattr(interpretation.numba.typed, "List", _ListShim())
     monkeypatch.setattr(interpretation.numba.types, "uint16", lambda x: x)
 
@@ -233,7 +233,7 @@ def test_resolve_inconsistency_edge_rule_trace_no_atom_trace(monkeypatch):
     world = SimpleWorld()
     world.world[l] = SimpleInterval()
     interpretations = {("a", "b"): world}
-    rule_trace = []
+    rule_trace = new_rule_trace("edge")
     rules_to_be_applied_trace = [([], [], "r")]
 
     mock_update = Mock()
@@ -249,7 +249,7 @@ def test_resolve_inconsistency_edge_rule_trace_no_atom_trace(monkeypatch):
         0,
         False,
         rule_trace,
-        [],
+        new_rule_trace_atoms(),
         rules_to_be_applied_trace,
         ["f"],
         True,
@@ -257,4 +257,4 @@ def test_resolve_inconsistency_edge_rule_trace_no_atom_trace(monkeypatch):
     )
 
     mock_update.assert_not_called()
-    assert len(rule_trace) == 1
+    assert rule_trace_rows(rule_trace) == [(0, 0, ("a", "b"), "L", 0, 1)]
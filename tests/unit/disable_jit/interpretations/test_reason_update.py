@@ -69,7 +69,7 @@ def test_update_node_tracks_changes(monkeypatch):
             comp="n1",
             na=(l, interpretation.interval.closed(lower, upper)),
             ipl=[],
-            rule_trace=[],
+            rule_trace=new_rule_trace(),
             fp_cnt=0,
             t_cnt=0,
             static=False,
@@ -79,7 +79,7 @@ def test_update_node_tracks_changes(monkeypatch):
             rules_to_be_applied_trace=[],
             idx=0,
             facts_to_be_applied_trace=[],
-            rule_trace_atoms=[],
+            rule_trace_atoms=new_rule_trace_atoms(),
             store_interpretation_changes=False,
             mode="fact",
             override=False,
@@ -163,7 +163,7 @@ def test_update_edge_tracks_changes(monkeypatch):
             comp="e1",
             na=(l, interpretation.interval.closed(lower, upper)),
             ipl=[],
-            rule_trace=[],
+            rule_trace=new_rule_trace("edge"),
             fp_cnt=0,
             t_cnt=0,
             static=True,
@@ -173,7 +173,7 @@ def test_update_edge_tracks_changes(monkeypatch):
             rules_to_be_applied_trace=[],
             idx=0,
             facts_to_be_applied_trace=[],
-            rule_trace_atoms=[],
+            rule_trace_atoms=new_rule_trace_atoms(),
             store_interpretation_changes=False,
             mode="rule",
             override=False,
@@ -242,8 +242,8 @@ def test_update_node_override_sets_bounds(monkeypatch):
     world.world[l] = SimpleInterval()
     interpretations = {"n1": world}
     predicate_map = {}
-    rule_trace = []
-    rule_trace_atoms = []
+    rule_trace = new_rule_trace()
+    rule_trace_atoms = new_rule_trace_atoms()
     update_node = getattr(interpretation._update_node, "py_func", interpretation._update_node)
     sig = inspect.signature(update_node)
     kwargs = dict(
@@ -329,8 +329,8 @@ def test_update_node_skips_graph_attr_trace(monkeypatch):
     l = label.Label("L")
     interpretations = {"n1": SimpleWorld()}
     predicate_map = {}
-    rule_trace = []
-    rule_trace_atoms = []
+    rule_trace = new_rule_trace()
+    rule_trace_atoms = new_rule_trace_atoms()
     update_node = getattr(interpretation._update_node, "py_func", interpretation._update_node)
     sig = inspect.signature(update_node)
     kwargs = dict(
@@ -358,8 +358,8 @@ def test_update_node_skips_graph_attr_trace(monkeypatch):
         kwargs["num_ga"] = [0]
 
     update_node(**kwargs)
-    assert rule_trace == []
-    assert rule_trace_atoms == []
+    assert rule_trace_rows(rule_trace) == []
+    assert rule_trace_atom_rows(rule_trace_atoms) == []
 
 
 @pytest.mark.parametrize(
@@ -424,8 +424,8 @@ def test_update_node_records_rule_trace(monkeypatch, mode, save_attr, trace_key,
     l = label.Label("L")
     interpretations = {"n1": SimpleWorld()}
     predicate_map = {}
-    rule_trace = []
-    rule_trace_atoms = []
+    rule_trace = new_rule_trace()
+    rule_trace_atoms = new_rule_trace_atoms()
     kwargs_trace = {trace_key: trace_val}
     calls = []
 
@@ -462,7 +462,7 @@ def test_update_node_records_rule_trace(monkeypatch, mode, save_attr, trace_key,
         kwargs["num_ga"] = [0]
 
     update_node(**kwargs)
-    assert len(rule_trace) == 1
+    assert len(rule_trace_rows(rule_trace)) == 1
     assert calls and calls[0][2] == expected_name
 
 
@@ -532,7 +532,7 @@ def test_update_node_handles_ipl_and_predicate_map(monkeypatch):
         comp="n1",
         na=(l, interpretation.interval.closed(0.2, 0.4)),
         ipl=ipl,
-        rule_trace=[],
+        rule_trace=new_rule_trace(),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -542,7 +542,7 @@ def test_update_node_handles_ipl_and_predicate_map(monkeypatch):
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=False,
@@ -627,7 +627,7 @@ def test_update_node_complement_records_traces(monkeypatch, helpers_fixture):
         comp="n1",
         na=(l, interpretation.interval.closed(0.1, 0.2)),
         ipl=ipl,
-        rule_trace=[],
+        rule_trace=new_rule_trace(),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -637,7 +637,7 @@ def test_update_node_complement_records_traces(monkeypatch, helpers_fixture):
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=["f"],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=True,
         mode="fact",
         override=False,
@@ -649,7 +649,7 @@ def test_update_node_complement_records_traces(monkeypatch, helpers_fixture):
     assert updated is True
     world = interpretations["n1"].world
     assert p2 in world and p3 in world
-    assert {entry[3] for entry in kwargs["rule_trace"]} == {l, p2, p3}
+    assert {row[3] for row in rule_trace_rows(kwargs["rule_trace"])} == {"L", "L2", "L3"}
     assert len(calls) == 3
 
 
@@ -721,7 +721,7 @@ def test_update_node_complement_existing_predicate(monkeypatch, helpers_fixture)
         comp="n1",
         na=(l, interpretation.interval.closed(0.3, 0.6)),
         ipl=[(p3, l)],
-        rule_trace=[],
+        rule_trace=new_rule_trace(),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -731,7 +731,7 @@ def test_update_node_complement_existing_predicate(monkeypatch, helpers_fixture)
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=False,
@@ -741,7 +741,7 @@ def test_update_node_complement_existing_predicate(monkeypatch, helpers_fixture)
 
     updated, _ = update_node(**kwargs)
     assert updated is True
-    assert kwargs["rule_trace"] == []
+    assert rule_trace_rows(kwargs["rule_trace"]) == []
     assert not calls
 
 
@@ -809,7 +809,7 @@ def test_update_node_predicate_map_appends_and_delta(monkeypatch, helpers_fixtur
         comp="n1",
         na=(l, interpretation.interval.closed(0.1, 0.2)),
         ipl=[(p3, l)],
-        rule_trace=[],
+        rule_trace=new_rule_trace(),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -819,7 +819,7 @@ def test_update_node_predicate_map_appends_and_delta(monkeypatch, helpers_fixtur
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=False,
@@ -901,7 +901,7 @@ def test_update_edge_handles_ipl_and_predicate_map(monkeypatch, helpers_fixture)
         comp="e1",
         na=(l, interpretation.interval.closed(0.2, 0.4)),
         ipl=ipl,
-        rule_trace=[],
+        rule_trace=new_rule_trace("edge"),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -911,7 +911,7 @@ def test_update_edge_handles_ipl_and_predicate_map(monkeypatch, helpers_fixture)
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=["f"],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=True,
         mode="fact",
         override=False,
@@ -926,7 +926,7 @@ def test_update_edge_handles_ipl_and_predicate_map(monkeypatch, helpers_fixture)
     assert predicate_map[p3] == ["x", "e1"]
     world = interpretations["e1"].world
     assert p2 in world and p3 in world
-    assert {entry[3] for entry in kwargs["rule_trace"]} == {l, p2, p3}
+    assert {row[3] for row in rule_trace_rows(kwargs["rule_trace"])} == {"L", "L2", "L3"}
     assert len(calls) == 3
     if "num_ga" in sig.parameters:
         assert kwargs["num_ga"][0] == 1
@@ -991,7 +991,7 @@ def test_update_edge_predicate_map_append_override(monkeypatch, helpers_fixture)
         comp="e1",
         na=(l, interpretation.interval.closed(0.2, 0.4)),
         ipl=[],
-        rule_trace=[],
+        rule_trace=new_rule_trace("edge"),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -1001,7 +1001,7 @@ def test_update_edge_predicate_map_append_override(monkeypatch, helpers_fixture)
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=True,
@@ -1081,7 +1081,7 @@ def test_update_edge_rule_atom_trace(monkeypatch, helpers_fixture):
         comp="e1",
         na=(l, interpretation.interval.closed(0.3, 0.5)),
         ipl=[],
-        rule_trace=[],
+        rule_trace=new_rule_trace("edge"),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -1091,7 +1091,7 @@ def test_update_edge_rule_atom_trace(monkeypatch, helpers_fixture):
         rules_to_be_applied_trace=rules_to_be_applied_trace,
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=True,
         mode="rule",
         override=False,
@@ -1120,7 +1120,7 @@ def test_update_node_missing_world(monkeypatch, helpers_fixture):
         comp="n1",
         na=(l, None),
         ipl=[],
-        rule_trace=[],
+        rule_trace=new_rule_trace(),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -1130,7 +1130,7 @@ def test_update_node_missing_world(monkeypatch, helpers_fixture):
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=False,
@@ -1213,7 +1213,7 @@ def test_update_edge_complement_delta_bound(monkeypatch, helpers_fixture):
         comp="e1",
         na=(l, interpretation.interval.closed(0.2, 0.4)),
         ipl=ipl,
-        rule_trace=[],
+        rule_trace=new_rule_trace("edge"),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -1223,7 +1223,7 @@ def test_update_edge_complement_delta_bound(monkeypatch, helpers_fixture):
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=False,
@@ -1237,7 +1237,7 @@ def test_update_edge_complement_delta_bound(monkeypatch, helpers_fixture):
     assert predicate_map[p3] == ["e1"]
     world = interpretations["e1"].world
     assert p2 in world and p3 in world
-    assert kwargs["rule_trace"] == []
+    assert rule_trace_rows(kwargs["rule_trace"]) == []
     assert calls == []
     assert change == pytest.approx(0.6)
 
@@ -1310,7 +1310,7 @@ def test_update_edge_complement_records_traces(monkeypatch, helpers_fixture):
         comp="e1",
         na=(l, interpretation.interval.closed(0.1, 0.2)),
         ipl=ipl,
-        rule_trace=[],
+        rule_trace=new_rule_trace("edge"),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -1320,7 +1320,7 @@ def test_update_edge_complement_records_traces(monkeypatch, helpers_fixture):
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=["f"],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=True,
         mode="fact",
         override=False,
@@ -1335,7 +1335,7 @@ def test_update_edge_complement_records_traces(monkeypatch, helpers_fixture):
     assert predicate_map[p3] == ["e1"]
     world = interpretations["e1"].world
     assert p2 in world and p3 in world
-    assert {entry[3] for entry in kwargs["rule_trace"]} == {l, p2, p3}
+    assert {row[3] for row in rule_trace_rows(kwargs["rule_trace"])} == {"L", "L2", "L3"}
     assert len(calls) == 3
     if "num_ga" in sig.parameters:
         assert kwargs["num_ga"][0] == 1
@@ -1402,7 +1402,7 @@ def test_update_edge_complement_existing_predicate(monkeypatch, helpers_fixture)
         comp="e1",
         na=(l, interpretation.interval.closed(0.4, 0.6)),
         ipl=ipl,
-        rule_trace=[],
+        rule_trace=new_rule_trace("edge"),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -1412,7 +1412,7 @@ def test_update_edge_complement_existing_predicate(monkeypatch, helpers_fixture)
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=False,
@@ -1471,7 +1471,7 @@ def test_update_edge_missing_world(monkeypatch, helpers_fixture):
         comp="missing",
         na=(label.Label("L"), interpretation.interval.closed(0, 1)),
         ipl=[],
-        rule_trace=[],
+        rule_trace=new_rule_trace("edge"),
         fp_cnt=0,
         t_cnt=0,
         static=False,
@@ -1481,7 +1481,7 @@ def test_update_edge_missing_world(monkeypatch, helpers_fixture):
         rules_to_be_applied_trace=[],
         idx=0,
         facts_to_be_applied_trace=[],
-        rule_trace_atoms=[],
+        rule_trace_atoms=new_rule_trace_atoms(),
         store_interpretation_changes=False,
         mode="fact",
         override=False,
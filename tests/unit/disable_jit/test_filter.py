@@ -0,0 +1,84 @@
+import numpy as np
+
+from pyreason.scripts.utils.filter import Filter
+
+
+class Bnd:
+    def __init__(self, lower, upper):
+        self.lower = lower
+        self.upper = upper
+
+
+def _object_array(values):
+    array = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        array[i] = v
+    return array
+
+
+class DummyInterpretation:
+    def __init__(self, rows, components):
+        # rows: (t, component id, label id, lower, upper)
+        self.time = 1
+        self.prev_reasoning_data = [2, 3]
+        self.rows = rows
+        self.components = components
+
+    def get_rule_trace_columns(self, component_type='node'):
+        t, comp, l, lower, upper = zip(*self.rows) if self.rows else ((),) * 5
+        return {
+            'time': np.array(t, dtype=np.uint16),
+            'fp': np.zeros(len(t), dtype=np.uint16),
+            'component': np.array(comp, dtype=np.int32),
+            'label': np.array(l, dtype=np.int32),
+            'origin': np.full(len(t), -1, dtype=np.int32),
+            'lower': np.array(lower, dtype=np.float64),
+            'upper': np.array(upper, dtype=np.float64),
+            'components': _object_array(self.components),
+            'labels': _object_array(['a', 'b']),
+            'origins': _object_array([]),
+        }
+
+
+def _node_interpretation():
+    return DummyInterpretation([
+        (0, 0, 0, 0.2, 1.0),
+        (0, 1, 0, 0.9, 1.0),
+        (0, 0, 0, 0.5, 1.0),  # latest bound of (0, n0, a)
+        (0, 2, 1, 0.5, 1.0),
+        (0, 2, 0, 0.5, 1.0),
+        (1, 1, 1, 0.3, 0.4),
+    ], ['n0', 'n1', 'n2'])
+
+
+def test_filter_and_sort_nodes_keeps_latest_bounds_and_sorts():
+    frames = Filter(1).filter_and_sort_nodes(_node_interpretation(), ['a', 'b'], Bnd(0, 1))
+    assert len(frames) == 2
+    assert list(frames[0].columns) == ['component', 'a', 'b']
+    # n1 first, then n0 and n2 (tied at 0.5) in the order they appeared
+    assert frames[0].values.tolist() == [['n1', [0.9, 1.0], [0, 1]], ['n0', [0.5, 1.0], [0, 1]], ['n2', [0.5, 1.0], [0.5, 1.0]]]
+    assert frames[1].values.tolist() == [['n1', [0, 1], [0.3, 0.4]]]
+
+    frames = Filter(1).filter_and_sort_nodes(_node_interpretation(), ['a'], Bnd(0, 1), sort_by='lower', descending=False)
+    assert list(frames[0]['component']) == ['n0', 'n2', 'n1']
+    assert frames[1].empty and list(frames[1].columns) == ['component', 'a']
+
+
+def test_filter_and_sort_long_form_applies_label_and_bound_masks():
+    df = Filter(1).filter_and_sort(_node_interpretation(), 'node', ['a', 'b'], Bnd(0.4, 1), sort_by='upper')
+    assert list(df.columns) == ['time', 'component', 'label', 'lower', 'upper']
+    # All upper bounds are tied, the order of the trace is kept
+    assert df.values.tolist() == [[0, 'n0', 'a', 0.5, 1.0], [0, 'n1', 'a', 0.9, 1.0], [0, 'n2', 'b', 0.5, 1.0], [0, 'n2', 'a', 0.5, 1.0]]
+
+
+def test_filter_and_sort_edges_and_index_rebuilt_after_reasoning():
+    interp = DummyInterpretation([(0, 0, 1, 0.1, 0.2), (1, 1, 1, 0.7, 0.8)], [('x', 'y'), ('y', 'z')])
+    frames = Filter(1).filter_and_sort_edges(interp, ['b'], Bnd(0, 1))
+    assert frames[0].values.tolist() == [[('x', 'y'), [0.1, 0.2]]]
+    assert frames[1].values.tolist() == [[('y', 'z'), [0.7, 0.8]]]
+
+    # The index is cached until the interpretation reasons again
+    interp.rows = []
+    assert len(Filter(1).filter_and_sort(interp, 'edge', ['b'], Bnd(0, 1))) == 2
+    interp.prev_reasoning_data = [3, 5]
+    assert Filter(1).filter_and_sort(interp, 'edge', ['b'], Bnd(0, 1)).empty
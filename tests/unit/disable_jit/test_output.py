@@ -0,0 +1,63 @@
+import numpy as np
+
+from pyreason.scripts.utils.output import Output
+
+
+class Bnd:
+    def __init__(self, lower, upper):
+        self.lower = lower
+        self.upper = upper
+
+
+def _object_array(values):
+    array = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        array[i] = v
+    return array
+
+
+def _columns():
+    # Three changes, two made by "r" (clauses were moved around) and one by a fact
+    return {
+        'time': np.array([0, 1, 1], dtype=np.uint16),
+        'fp': np.array([0, 0, 1], dtype=np.uint16),
+        'component': np.array([0, 1, 0], dtype=np.int32),
+        'label': np.array([0, 0, 0], dtype=np.int32),
+        'origin': np.array([1, 0, 0], dtype=np.int32),
+        'lower': np.array([1.0, 0.5, 0.5]),
+        'upper': np.array([1.0, 1.0, 1.0]),
+        'components': _object_array(['a', 'b']),
+        'labels': _object_array(['L']),
+        'origins': _object_array(['r', 'fact']),
+    }
+
+
+HEADER = ['Time', 'Fixed-Point-Operation', 'Node', 'Label', 'Old Bound', 'New Bound', 'Occurred Due To']
+
+
+def test_build_rule_trace_frame_without_atom_trace():
+    df = Output._build_rule_trace_frame(_columns(), [], False, HEADER)
+    assert list(df.columns) == HEADER
+    assert list(df['Node']) == ['a', 'b', 'a']
+    assert list(df['New Bound']) == ['[1.0,1.0]', '[0.5,1.0]', '[0.5,1.0]']
+    assert list(df['Old Bound']) == ['-'] * 3
+    assert list(df['Occurred Due To']) == ['-'] * 3
+
+
+def test_build_rule_trace_frame_reorders_clauses_per_rule():
+    atoms = [
+        ([[]], [[('a', 'b')]], Bnd(0.0, 1.0), 'fact'),
+        ([['a'], []], [[], [('a', 'b')]], Bnd(0.0, 1.0), 'r'),
+        ([['b'], []], [[], [('b', 'a')]], Bnd(0.5, 1.0), 'r'),
+    ]
+    clause_map = {'r': {0: 1, 1: 0}, 'fact': {0: 0}}
+    df = Output._build_rule_trace_frame(_columns(), atoms, True, HEADER, clause_map=clause_map)
+
+    assert list(df['Old Bound']) == ['[0.0,1.0]', '[0.0,1.0]', '[0.5,1.0]']
+    assert list(df['Occurred Due To']) == ['fact', 'r', 'r']
+    assert list(df['Clause-1']) == [[('a', 'b')], [('a', 'b')], [('b', 'a')]]
+    assert list(df['Clause-2']) == [None, ['a'], ['b']]
+
+    # The clause columns can be left out
+    df = Output._build_rule_trace_frame(_columns(), atoms, True, HEADER, num_clauses=0)
+    assert list(df.columns) == HEADER
@@ -0,0 +1,37 @@
+import pytest
+
+import pyreason.scripts.utils.rule_parser as rule_parser
+from pyreason.scripts.interpretation import interpretation
+
+
+@pytest.mark.parametrize("constant, value", [("-1.5", -1.5), ("1.", 1.0), (".5", 0.5), ("1e3", 1000.0), ("-2.5e-1", -0.25)])
+def test_parse_rule_keeps_numeric_comparison_constants(monkeypatch, constant, value):
+    monkeypatch.setattr(rule_parser.interval, "closed", lambda lower, upper: (lower, upper))
+    r = rule_parser.parse_rule(f"h(x) <- age(x) > {constant}", "r", None)
+    clause_type, _, _, _, op = r.get_clauses()[0]
+    assert (clause_type, op) == ("comparison", ">" + constant)
+    assert interpretation._parse_comparison(op) == (">", pytest.approx(value), True)
+
+
+@pytest.mark.parametrize("constant", ["", ".", "1.2.3", "e3", "1e", "x"])
+def test_parse_rule_drops_non_numeric_comparison_constants(monkeypatch, constant):
+    monkeypatch.setattr(rule_parser.interval, "closed", lambda lower, upper: (lower, upper))
+    r = rule_parser.parse_rule(f"h(x) <- age(x) > {constant}", "r", None)
+    assert r.get_clauses()[0][4] == ">"
+
+
+@pytest.mark.parametrize("body, bounds", [
+    ("age(x) > 30", [(1, 1)]),
+    ("age(x) > 30 : [0.5, 1]", [(0.5, 1)]),
+    ("age(x) > 30, p(x)", [(1, 1), (1, 1)]),
+    ("p(x) : [0.2, 1], age(x) > 30 : [0.5, 1]", [(0.2, 1), (0.5, 1)]),
+    ("age(x) > 1e3 : [0.5, 1], ~p(x)", [(0.5, 1), (0, 0)]),
+])
+def test_parse_rule_comparison_clause_bounds(monkeypatch, body, bounds):
+    monkeypatch.setattr(rule_parser.interval, "closed", lambda lower, upper: (lower, upper))
+    r = rule_parser.parse_rule(f"h(x) <- {body}", "r", None)
+    clauses = r.get_clauses()
+    assert [c[3] for c in clauses] == bounds
+    comparison = [c for c in clauses if c[0] == "comparison"][0]
+    assert comparison[1].get_value() == "age" and list(comparison[2]) == ["x"]
+    assert comparison[4] == (">1e3" if "1e3" in body else ">30")